@@ -0,0 +1,73 @@
+import time
+from collections.abc import Callable
+
+from app.__core__.application.concurrency_limiter import ConcurrencyLimiter
+from app.__core__.application.metrics import metrics
+
+
+class AdaptiveConcurrencyLimiter(ConcurrencyLimiter):
+    """ConcurrencyLimiter cujo limite se ajusta sozinho (AIMD).
+
+    Cada resposta dentro do `latency_target` soma `1 / limite` à estimativa,
+    ou seja, o limite cresce em 1 a cada janela inteira de sucessos. Timeouts,
+    429 e respostas acima do alvo de latência multiplicam o limite por
+    `backoff_ratio`. Como uma rajada de falhas costuma vir do mesmo problema,
+    os cortes respeitam um intervalo mínimo de `latency_target` entre si.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        min_concurrency: int,
+        max_concurrency: int,
+        initial_concurrency: int,
+        max_queue_size: int,
+        queue_timeout: float,
+        latency_target: float,
+        backoff_ratio: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        super().__init__(
+            name,
+            max_concurrency=initial_concurrency,
+            max_queue_size=max_queue_size,
+            queue_timeout=queue_timeout,
+        )
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.backoff_ratio = backoff_ratio
+
+        self._clock = clock
+        self._estimate = float(initial_concurrency)
+        self._last_decrease_at = float("-inf")
+        self._apply_estimate()
+
+    def on_success(self, latency: float) -> None:
+        if latency > self.latency_target:
+            self.on_overload()
+            return
+
+        self._estimate = min(
+            float(self.max_concurrency), self._estimate + 1 / self._estimate
+        )
+        self._apply_estimate()
+
+    def on_overload(self) -> None:
+        now = self._clock()
+        if now - self._last_decrease_at < self.latency_target:
+            return
+
+        self._last_decrease_at = now
+        self._estimate = max(
+            float(self.min_concurrency), self._estimate * self.backoff_ratio
+        )
+        self._apply_estimate()
+        metrics.increment(f"{self.name}_limiter_decreases")
+
+    def _apply_estimate(self) -> None:
+        self.limit = int(self._estimate)
+        # com o limite maior, quem está na fila já pode ser liberado
+        self._wake_waiters()
+        metrics.set_gauge(f"{self.name}_limiter_limit", self.limit)
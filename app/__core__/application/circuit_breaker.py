@@ -0,0 +1,158 @@
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from enum import Enum
+from typing import Deque, Tuple, TypeVar
+
+from app.__core__.application.logger import logger
+from app.__core__.application.metrics import metrics
+from app.__core__.domain.exception.exception import CircuitOpenError
+
+T = TypeVar("T")
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+CIRCUIT_STATE_GAUGE = {
+    CircuitState.CLOSED: 0,
+    CircuitState.OPEN: 1,
+    CircuitState.HALF_OPEN: 2,
+}
+
+
+class CircuitBreaker:
+    """Circuit breaker com janela deslizante de chamadas.
+
+    - closed: as chamadas passam e o resultado de cada uma (erro e/ou lenta)
+      entra na janela; se a taxa de erros ou de chamadas lentas passar do
+      limite, o circuito abre.
+    - open: as chamadas falham na hora com `CircuitOpenError`, sem tocar no
+      serviço externo, até o fim do cool-down.
+    - half_open: uma única chamada de teste passa; se der certo o circuito
+      fecha, se falhar volta a abrir por mais um cool-down.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        window_size: int,
+        min_calls: int,
+        error_rate_threshold: float,
+        slow_call_threshold: float,
+        slow_call_rate_threshold: float,
+        cooldown: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.min_calls = min_calls
+        self.error_rate_threshold = error_rate_threshold
+        self.slow_call_threshold = slow_call_threshold
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.cooldown = cooldown
+
+        self._clock = clock
+        # cada item é (falhou, foi_lenta)
+        self._outcomes: Deque[Tuple[bool, bool]] = deque(maxlen=window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.cooldown
+        ):
+            self._transition(CircuitState.HALF_OPEN)
+        return self._state
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        is_probe = self._before_call()
+        started_at = self._clock()
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # cancelada por quem chamou (ex.: a cópia do hedge que perdeu), o
+            # que não diz nada sobre a saúde do serviço
+            if is_probe:
+                self._probe_in_flight = False
+            raise
+        except BaseException:
+            self._after_call(True, self._clock() - started_at, is_probe)
+            raise
+
+        self._after_call(False, self._clock() - started_at, is_probe)
+        return result
+
+    def _before_call(self) -> bool:
+        state = self.state
+
+        if state == CircuitState.CLOSED:
+            return False
+
+        if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+
+        metrics.increment(f"{self.name}_circuit_rejected")
+        raise CircuitOpenError(f"{self.name}_circuit_open")
+
+    def _after_call(self, failed: bool, latency: float, is_probe: bool) -> None:
+        slow = latency >= self.slow_call_threshold
+
+        if is_probe:
+            self._probe_in_flight = False
+            if failed:
+                self._open()
+            else:
+                self._outcomes.clear()
+                self._transition(CircuitState.CLOSED)
+            return
+
+        # chamadas que começaram antes do circuito abrir não contam mais
+        if self._state != CircuitState.CLOSED:
+            return
+
+        self._outcomes.append((failed, slow))
+        if len(self._outcomes) < self.min_calls:
+            return
+
+        total = len(self._outcomes)
+        error_rate = sum(1 for failed, _ in self._outcomes if failed) / total
+        slow_call_rate = sum(1 for _, slow in self._outcomes if slow) / total
+
+        if (
+            error_rate >= self.error_rate_threshold
+            or slow_call_rate >= self.slow_call_rate_threshold
+        ):
+            logger.warning(
+                "circuit_breaker_tripped",
+                circuit_name=self.name,
+                error_rate=error_rate,
+                slow_call_rate=slow_call_rate,
+            )
+            self._open()
+
+    def _open(self) -> None:
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+        self._transition(CircuitState.OPEN)
+        metrics.increment(f"{self.name}_circuit_opened")
+
+    def _transition(self, state: CircuitState) -> None:
+        if state != self._state:
+            logger.info(
+                "circuit_breaker_state_changed",
+                circuit_name=self.name,
+                from_state=self._state.value,
+                to_state=state.value,
+            )
+        self._state = state
+        metrics.set_gauge(f"{self.name}_circuit_state", CIRCUIT_STATE_GAUGE[state])
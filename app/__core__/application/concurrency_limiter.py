@@ -0,0 +1,100 @@
+import asyncio
+from collections import deque
+from typing import Deque
+
+from app.__core__.application.metrics import metrics
+from app.__core__.domain.exception.exception import ConcurrencyLimitError
+
+
+class ConcurrencyLimiter:
+    """Limita a quantidade de operações simultâneas com uma fila de espera limitada.
+
+    Diferente de um `asyncio.Semaphore`, quem não consegue um slot espera em
+    uma fila com tamanho e tempo máximos; estourado qualquer um dos dois, a
+    chamada é rejeitada com `ConcurrencyLimitError` em vez de ficar presa.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue_size: int,
+        queue_timeout: float,
+    ) -> None:
+        self.name = name
+        self.limit = max_concurrency
+        self.max_queue_size = max_queue_size
+        self.queue_timeout = queue_timeout
+
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    async def __aenter__(self) -> "ConcurrencyLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        self.release()
+
+    async def acquire(self) -> None:
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            self._publish_gauges()
+            return
+
+        if len(self._waiters) >= self.max_queue_size:
+            self._reject("queue_full")
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        self._publish_gauges()
+
+        try:
+            async with asyncio.timeout(self.queue_timeout):
+                await future
+        except (TimeoutError, asyncio.CancelledError) as exc:
+            if future.done() and not future.cancelled():
+                # o slot chegou junto com o timeout/cancelamento, então o
+                # repassamos para o próximo da fila
+                self.release()
+            else:
+                future.cancel()
+                self._remove_waiter(future)
+            if isinstance(exc, TimeoutError):
+                self._reject("queue_timeout")
+            raise
+
+    def release(self) -> None:
+        self._in_flight -= 1
+        self._wake_waiters()
+        self._publish_gauges()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            future = self._waiters.popleft()
+            if not future.done():
+                self._in_flight += 1
+                future.set_result(None)
+
+    def _remove_waiter(self, future: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(future)
+        except ValueError:
+            pass
+        self._publish_gauges()
+
+    def _reject(self, reason: str) -> None:
+        metrics.increment(f"{self.name}_limiter_rejected_{reason}")
+        raise ConcurrencyLimitError(f"{self.name}_{reason}")
+
+    def _publish_gauges(self) -> None:
+        metrics.set_gauge(f"{self.name}_limiter_in_flight", self._in_flight)
+        metrics.set_gauge(f"{self.name}_limiter_queue_depth", len(self._waiters))
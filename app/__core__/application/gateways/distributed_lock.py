@@ -0,0 +1,9 @@
+from abc import ABC, abstractmethod
+
+
+class IDistributedLock(ABC):
+    @abstractmethod
+    async def try_acquire(self) -> bool: ...
+
+    @abstractmethod
+    async def release(self) -> None: ...
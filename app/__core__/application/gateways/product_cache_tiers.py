@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+from app.__core__.domain.entity.product import Product
+
+
+class IProductCacheTiers(ABC):
+    """Camadas de cache na frente do products_cache (L1 do worker e L2).
+
+    Para quem já leu o products_cache junto com outra query: consulta só as
+    camadas da frente e as alimenta com as linhas lidas, sem voltar ao
+    Postgres.
+    """
+
+    @abstractmethod
+    async def get_many(self, ids: List[int]) -> List[Product]: ...
+
+    @abstractmethod
+    async def put_many(self, products: List[Product]) -> None: ...
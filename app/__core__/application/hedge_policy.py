@@ -0,0 +1,95 @@
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Deque, Set, TypeVar
+
+from app.__core__.application.metrics import metrics
+from app.__core__.application.retry_policy import RetryBudget
+
+T = TypeVar("T")
+
+
+class HedgePolicy:
+    """Dispara uma segunda tentativa quando a primeira demora demais.
+
+    Se a primeira tentativa não responder dentro do percentil `percentile` das
+    últimas `window_size` latências observadas, uma cópia é enviada e vale a
+    que responder primeiro (a outra é cancelada). As cópias saem do mesmo tipo
+    de orçamento dos retries, de forma que a carga extra fique limitada a uma
+    fração das chamadas. Enquanto não houver `min_samples` latências, ou sem
+    orçamento, a chamada segue sem hedge.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        percentile: float,
+        min_delay: float,
+        window_size: int,
+        min_samples: int,
+        budget: RetryBudget,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.budget = budget
+
+        self._clock = clock
+        self._latencies: Deque[float] = deque(maxlen=window_size)
+
+    @property
+    def delay(self) -> float | None:
+        if not self._latencies or len(self._latencies) < self.min_samples:
+            return None
+        ordered = sorted(self._latencies)
+        idx = min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)
+        return max(self.min_delay, ordered[idx])
+
+    async def execute(self, fn: Callable[[], Awaitable[T]]) -> T:
+        self.budget.deposit()
+        delay = self.delay
+
+        primary = asyncio.ensure_future(self._timed(fn))
+        pending: Set[asyncio.Future] = {primary}
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done and self.budget.try_withdraw():
+                    metrics.increment(f"{self.name}_hedge_sent")
+                    pending.add(asyncio.ensure_future(self._timed(fn)))
+
+            # vale a primeira tentativa que der certo; se uma falhar, ainda
+            # esperamos a outra antes de desistir
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next((task for task in done if task.exception() is None), None)
+                if winner is not None:
+                    if winner is not primary:
+                        metrics.increment(f"{self.name}_hedge_won")
+                    return winner.result()
+                if not pending:
+                    raise next(iter(done)).exception()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _timed(self, fn: Callable[[], Awaitable[T]]) -> T:
+        # cada tentativa registra a própria latência, medida do seu início. A
+        # que perdeu e foi cancelada entra com o tempo que já tinha passado
+        # (um piso da latência real); registrar só a vencedora puxaria o
+        # percentil para baixo a cada hedge
+        started_at = self._clock()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self._latencies.append(self._clock() - started_at)
+            raise
+        self._latencies.append(self._clock() - started_at)
+        return result
@@ -0,0 +1,60 @@
+import hashlib
+from collections.abc import Hashable
+from typing import Dict, List
+
+
+class HotKeyTracker:
+    """Estima a frequência de acesso das chaves com memória limitada.
+
+    As contagens ficam em um count-min sketch (`depth` linhas de `width`
+    contadores), que pode superestimar mas nunca subestimar uma chave, e só
+    as `capacity` chaves mais frequentes são guardadas de fato. O `decay`
+    multiplica todas as contagens por um fator, para que produtos que foram
+    populares no passado percam posição com o tempo.
+    """
+
+    def __init__(self, capacity: int, width: int = 2048, depth: int = 4) -> None:
+        self.capacity = capacity
+        self.width = width
+        self.depth = depth
+
+        self._rows: List[List[float]] = [[0.0] * width for _ in range(depth)]
+        self._top: Dict[Hashable, float] = {}
+
+    def record(self, key: Hashable) -> None:
+        estimate = float("inf")
+        for row, idx in zip(self._rows, self._indexes(key)):
+            row[idx] += 1
+            estimate = min(estimate, row[idx])
+
+        if key in self._top or len(self._top) < self.capacity:
+            self._top[key] = estimate
+            return
+
+        coldest = min(self._top, key=self._top.__getitem__)
+        if estimate > self._top[coldest]:
+            del self._top[coldest]
+            self._top[key] = estimate
+
+    def estimate(self, key: Hashable) -> float:
+        return min(row[idx] for row, idx in zip(self._rows, self._indexes(key)))
+
+    def top(self, n: int) -> List[Hashable]:
+        return sorted(self._top, key=self._top.__getitem__, reverse=True)[:n]
+
+    def decay(self, factor: float) -> None:
+        for row in self._rows:
+            for idx, count in enumerate(row):
+                if count:
+                    row[idx] = count * factor
+        self._top = {key: count * factor for key, count in self._top.items()}
+
+    def _indexes(self, key: Hashable) -> List[int]:
+        # um único hash de 8 * depth bytes, fatiado em um índice por linha
+        digest = hashlib.blake2b(
+            repr(key).encode(), digest_size=8 * self.depth
+        ).digest()
+        return [
+            int.from_bytes(digest[row * 8 : (row + 1) * 8], "little") % self.width
+            for row in range(self.depth)
+        ]
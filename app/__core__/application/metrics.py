@@ -0,0 +1,27 @@
+from collections import defaultdict
+from typing import Dict
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self._counters: Dict[str, int] = defaultdict(int)
+        self._gauges: Dict[str, float] = {}
+
+    def increment(self, name: str, value: int = 1) -> None:
+        self._counters[name] += value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        self._gauges[name] = value
+
+    def get_counter(self, name: str) -> int:
+        return self._counters.get(name, 0)
+
+    def get_gauge(self, name: str) -> float:
+        return self._gauges.get(name, 0)
+
+    def snapshot(self) -> dict:
+        return {"counters": dict(self._counters), "gauges": dict(self._gauges)}
+
+
+# Cada worker do uvicorn é um processo, então as métricas são por processo
+metrics = Metrics()
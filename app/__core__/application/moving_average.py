@@ -0,0 +1,20 @@
+from typing import Optional
+
+
+class ExponentialMovingAverage:
+    """Média móvel exponencial: cada amostra pesa `alpha` e o histórico `1 - alpha`."""
+
+    def __init__(self, alpha: float) -> None:
+        self.alpha = alpha
+        self._value: Optional[float] = None
+
+    @property
+    def value(self) -> float:
+        return self._value or 0.0
+
+    def update(self, sample: float) -> float:
+        if self._value is None:
+            self._value = sample
+        else:
+            self._value = self.alpha * sample + (1 - self.alpha) * self._value
+        return self._value
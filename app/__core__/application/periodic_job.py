@@ -0,0 +1,69 @@
+import asyncio
+import random
+from collections.abc import Awaitable, Callable
+from typing import Optional
+
+from app.__core__.application.gateways.distributed_lock import IDistributedLock
+from app.__core__.application.logger import logger
+from app.__core__.application.task_manager import TaskManager
+
+
+class PeriodicJob:
+    """Executa `job` a cada `period` segundos (+/- `jitter`) em background.
+
+    Quando um `lock` é informado, só executa quem conseguir adquiri-lo. Como
+    cada worker do uvicorn é um processo, o lock distribuído garante que só um
+    deles rode o job por vez; os demais continuam tentando a cada ciclo e
+    assumem caso o atual deixe de segurar o lock.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        job: Callable[[], Awaitable[None]],
+        *,
+        period: float,
+        jitter: float = 0.0,
+        lock: Optional[IDistributedLock] = None,
+    ) -> None:
+        self.name = name
+        self.job = job
+        self.period = period
+        self.jitter = jitter
+        self.lock = lock
+
+    def start(self, task_manager: TaskManager) -> None:
+        task_manager.create(self.run_forever(), name=self.name)
+
+    async def run_forever(self) -> None:
+        # espalha a primeira execução dos workers, que sobem todos juntos
+        await asyncio.sleep(random.uniform(0, self.jitter))  # nosec B311
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self._next_delay())
+
+    async def run_once(self) -> bool:
+        try:
+            if self.lock is not None and not await self.lock.try_acquire():
+                logger.debug("periodic_job_skipped", job_name=self.name)
+                return False
+        except Exception:
+            # banco fora do ar, por exemplo: pula o ciclo e tenta de novo no
+            # próximo, em vez de derrubar o loop do job de vez
+            logger.exception("periodic_job_lock_failed", job_name=self.name)
+            return False
+
+        try:
+            await self.job()
+        except Exception:
+            logger.exception("periodic_job_failed", job_name=self.name)
+        return True
+
+    async def stop(self) -> None:
+        if self.lock is not None:
+            await self.lock.release()
+
+    def _next_delay(self) -> float:
+        return max(
+            0.0, self.period + random.uniform(-self.jitter, self.jitter)  # nosec B311
+        )
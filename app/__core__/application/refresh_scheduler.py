@@ -0,0 +1,130 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Awaitable, Callable, Hashable
+from enum import IntEnum
+from typing import Dict, List, Set, Tuple
+
+from app.__core__.application.logger import logger
+from app.__core__.application.metrics import metrics
+from app.__core__.application.task_manager import TaskManager
+
+
+class RefreshPriority(IntEnum):
+    # quanto menor o valor, mais cedo o refresh é executado
+    HARD_STALE = 0
+    SOFT_STALE = 1
+    SPECULATIVE = 2
+
+
+class RefreshScheduler:
+    """Fila de refreshes com prioridade, sem duplicatas e com tamanho limitado.
+
+    Cada chave aparece no máximo uma vez na fila: agendar uma chave que já
+    está esperando só pode aumentar a prioridade dela, e chaves que já estão
+    sendo atualizadas são ignoradas. Um número fixo de workers consome a fila,
+    e com ela cheia os novos agendamentos são descartados, já que o dado
+    continua sendo servido do cache.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        refresh: Callable[[Hashable], Awaitable[None]],
+        *,
+        workers: int,
+        max_queue_size: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+
+        self._refresh = refresh
+        self._clock = clock
+        self._heap: List[Tuple[int, int, Hashable]] = []
+        # chave -> (prioridade, momento do agendamento); entradas do heap que
+        # não batem com este dicionário são descartadas ao sair da fila
+        self._queued: Dict[Hashable, Tuple[RefreshPriority, float]] = {}
+        self._in_flight: Set[Hashable] = set()
+        self._sequence = itertools.count()
+        self._wakeup = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._accepting = True
+
+    def __len__(self) -> int:
+        return len(self._queued)
+
+    def schedule(self, key: Hashable, priority: RefreshPriority) -> bool:
+        if not self._accepting or key in self._in_flight:
+            return False
+
+        queued = self._queued.get(key)
+        if queued is not None:
+            metrics.increment(f"{self.name}_refresh_merged")
+            if priority >= queued[0]:
+                return False
+            enqueued_at = queued[1]
+        else:
+            if len(self._queued) >= self.max_queue_size:
+                metrics.increment(f"{self.name}_refresh_dropped")
+                return False
+            enqueued_at = self._clock()
+
+        self._queued[key] = (priority, enqueued_at)
+        heapq.heappush(self._heap, (priority, next(self._sequence), key))
+        self._idle.clear()
+        self._wakeup.set()
+        self._publish_queue_depth()
+        return True
+
+    def start(self, task_manager: TaskManager) -> None:
+        for idx in range(self.workers):
+            task_manager.create(self._run_worker(), name=f"{self.name}_worker_{idx}")
+        task_manager.add_drain_hook(self.drain)
+
+    async def drain(self) -> None:
+        # para de aceitar novos agendamentos e espera a fila esvaziar
+        self._accepting = False
+        self._wakeup.set()
+        await self._idle.wait()
+
+    async def _run_worker(self) -> None:
+        while True:
+            item = self._pop()
+            if item is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            key, enqueued_at = item
+            metrics.set_gauge(
+                f"{self.name}_refresh_wait_seconds", self._clock() - enqueued_at
+            )
+            self._in_flight.add(key)
+            try:
+                await self._refresh(key)
+                metrics.increment(f"{self.name}_refresh_completed")
+            except Exception:
+                logger.exception("refresh_failed", scheduler=self.name, key=key)
+            finally:
+                self._in_flight.discard(key)
+                if not self._queued and not self._in_flight:
+                    self._idle.set()
+
+    def _pop(self) -> Tuple[Hashable, float] | None:
+        while self._heap:
+            priority, _, key = heapq.heappop(self._heap)
+            queued = self._queued.get(key)
+            if queued is None or queued[0] != priority:
+                continue
+
+            del self._queued[key]
+            self._publish_queue_depth()
+            return key, queued[1]
+        return None
+
+    def _publish_queue_depth(self) -> None:
+        metrics.set_gauge(f"{self.name}_refresh_queue_depth", len(self._queued))
@@ -0,0 +1,132 @@
+import asyncio
+import random
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from app.__core__.application.logger import logger
+from app.__core__.application.metrics import metrics
+from app.__core__.domain.exception.exception import RetryableError, RetryError
+
+T = TypeVar("T")
+
+
+class RetryBudget:
+    """Token bucket que limita os retries a uma fração das chamadas.
+
+    Cada primeira tentativa deposita `ratio` tokens e cada retry gasta um, de
+    forma que, com `ratio=0.1`, no máximo ~10% do tráfego seja de retries. Além
+    disso o balde recebe `min_per_second` tokens por segundo, para que um
+    processo com pouco tráfego ainda consiga fazer algum retry. Quando a API
+    externa está fora, os retries acabam rápido em vez de multiplicarem a carga.
+    """
+
+    def __init__(
+        self,
+        ratio: float,
+        min_per_second: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        # o balde guarda no máximo o equivalente a 10s de retries mínimos
+        self.capacity = max(1.0, min_per_second * 10)
+
+        self._clock = clock
+        self._tokens = self.capacity
+        self._refilled_at = clock()
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def deposit(self) -> None:
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.min_per_second)
+
+
+class RetryPolicy:
+    """Executa uma chamada com retries para falhas transitórias.
+
+    Só `RetryableError` é repetida; qualquer outra exceção sobe na hora. O
+    intervalo entre tentativas é sorteado entre 0 e o backoff exponencial
+    (full jitter), para que clientes que falharam juntos não tentem de novo
+    juntos, e respeita o `retry_after` informado pelo servidor.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        max_attempts: int,
+        base_delay: float,
+        max_delay: float,
+        budget: RetryBudget,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        self.name = name
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+
+        self._sleep = sleep
+
+    async def execute(self, fn: Callable[[], Awaitable[T]]) -> T:
+        self.budget.deposit()
+        attempt = 1
+
+        while True:
+            try:
+                return await fn()
+            except RetryableError as exc:
+                delay = self._next_delay(attempt, exc)
+                reason = self._give_up_reason(attempt, delay)
+                if reason is not None:
+                    metrics.increment(f"{self.name}_retry_gave_up_{reason}")
+                    raise RetryError(exc) from exc
+
+                logger.warning(
+                    "retrying_call",
+                    policy_name=self.name,
+                    attempt=attempt,
+                    delay=round(delay, 3),
+                    reason=str(exc),
+                )
+                metrics.increment(f"{self.name}_retry_attempts")
+                metrics.set_gauge(
+                    f"{self.name}_retry_budget_tokens", round(self.budget.tokens, 2)
+                )
+                await self._sleep(delay)
+                attempt += 1
+
+    def _next_delay(self, attempt: int, exc: RetryableError) -> float:
+        if exc.retry_after is not None:
+            return exc.retry_after
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return random.uniform(0, backoff)  # nosec B311
+
+    def _give_up_reason(self, attempt: int, delay: float) -> str | None:
+        if attempt >= self.max_attempts:
+            return "max_attempts"
+        # um Retry-After maior que o nosso teto não vale a espera
+        if delay > self.max_delay:
+            return "retry_after_too_long"
+        if not self.budget.try_withdraw():
+            return "budget_exhausted"
+        return None
@@ -28,6 +28,25 @@ class Settings(BaseSettings):
         default=200,
         description="The maximum number of items per page (global limit)",
     )
+    FAVORITES_BATCH_MAX_SIZE: int = Field(
+        default=50,
+        description="The maximum number of product ids per batch favorite/unfavorite request",
+    )
+    PRODUCT_CATALOG_BACKEND: Literal["fakestore", "snapshot"] = Field(
+        default="fakestore",
+        description=(
+            "Where products are fetched from: the fakestore API or a local snapshot file "
+            "(see the `dump-catalog-snapshot` command)"
+        ),
+    )
+    PRODUCT_CATALOG_SNAPSHOT_PATH: str = Field(
+        default="./product_catalog.snapshot",
+        description="The path of the product catalog snapshot file",
+    )
+    PRODUCT_CATALOG_SNAPSHOT_RELOAD_SECONDS: float = Field(
+        default=5.0,
+        description="How often (in seconds) the product catalog snapshot file is checked for changes",
+    )
     PRODUCT_CATALOG_API_BASE_URL: str = Field(
         default="https://fakestoreapi.com",
         description="The base URL of the product catalog API",
@@ -36,13 +55,169 @@ class Settings(BaseSettings):
         default=5.0,
         description="The timeout limit for requests to the product catalog API",
     )
+    PRODUCT_CATALOG_API_CONNECT_TIMEOUT: float = Field(
+        default=2.0,
+        description="The timeout (in seconds) to open a connection to the product catalog API",
+    )
+    PRODUCT_CATALOG_API_READ_TIMEOUT: float = Field(
+        default=5.0,
+        description="The timeout (in seconds) to read a response from the product catalog API",
+    )
+    PRODUCT_CATALOG_API_MAX_CONNECTIONS: int = Field(
+        default=100,
+        description="The maximum number of open connections to the product catalog API per process",
+    )
+    PRODUCT_CATALOG_API_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=20,
+        description="The maximum number of idle connections kept open to the product catalog API",
+    )
+    PRODUCT_CATALOG_API_KEEPALIVE_EXPIRY: float = Field(
+        default=30.0,
+        description="How long (in seconds) an idle connection to the product catalog API is kept open",
+    )
+    PRODUCT_CATALOG_API_HTTP2: bool = Field(
+        default=False,
+        description=(
+            "Whether to use HTTP/2 with the product catalog API. "
+            "Requires the optional `h2` package (httpx[http2]), otherwise HTTP/1.1 is used"
+        ),
+    )
+    PRODUCT_CATALOG_API_WARM_CONNECTIONS: int = Field(
+        default=4,
+        description="How many connections to the product catalog API are opened on startup",
+    )
     PRODUCT_CATALOG_API_MAX_RETRIES: int = Field(
         default=3,
-        description="The maximum number of retries for requests to the product catalog API",
+        description="The maximum number of attempts (the first one included) for requests to the product catalog API",
+    )
+    PRODUCT_CATALOG_API_RETRY_BASE_DELAY: float = Field(
+        default=0.2,
+        description="The base delay (in seconds) of the exponential backoff between product catalog API retries",
+    )
+    PRODUCT_CATALOG_API_RETRY_MAX_DELAY: float = Field(
+        default=4.0,
+        description=(
+            "The maximum delay (in seconds) between product catalog API retries. "
+            "A Retry-After longer than this makes the call give up instead of waiting"
+        ),
+    )
+    PRODUCT_CATALOG_API_RETRY_BUDGET_RATIO: float = Field(
+        default=0.1,
+        description="The fraction (0 to 1) of product catalog API calls that can be retries, per process",
+    )
+    PRODUCT_CATALOG_API_RETRY_BUDGET_MIN_PER_SECOND: float = Field(
+        default=1.0,
+        description="How many product catalog API retries per second are always allowed, regardless of traffic",
+    )
+    PRODUCT_CATALOG_API_HEDGE_ENABLED: bool = Field(
+        default=False,
+        description=(
+            "Whether a second request is sent when a product catalog API request takes "
+            "longer than the hedge percentile of the observed latencies"
+        ),
+    )
+    PRODUCT_CATALOG_API_HEDGE_PERCENTILE: float = Field(
+        default=0.95,
+        description="The percentile (0 to 1) of the observed latencies after which a hedged request is sent",
+    )
+    PRODUCT_CATALOG_API_HEDGE_MIN_DELAY: float = Field(
+        default=0.05,
+        description="The minimum delay (in seconds) before a hedged request is sent",
+    )
+    PRODUCT_CATALOG_API_HEDGE_WINDOW_SIZE: int = Field(
+        default=200,
+        description="How many recent product catalog API latencies are used to compute the hedge percentile",
+    )
+    PRODUCT_CATALOG_API_HEDGE_MIN_SAMPLES: int = Field(
+        default=20,
+        description="How many latencies must be observed before requests start being hedged",
+    )
+    PRODUCT_CATALOG_API_HEDGE_BUDGET_RATIO: float = Field(
+        default=0.05,
+        description="The fraction (0 to 1) of product catalog API calls that can be hedged, per process",
+    )
+    PRODUCT_CATALOG_API_HEDGE_BUDGET_MIN_PER_SECOND: float = Field(
+        default=1.0,
+        description="How many hedged product catalog API requests per second are always allowed, regardless of traffic",
     )
     PRODUCT_CATALOG_API_MAX_CONCURRENCY: int = Field(
+        default=50,
+        description=(
+            "The maximum number of concurrent requests to the product catalog API. "
+            "The limit is shared by every request and background refresh of the process "
+            "and adapts between the min and max values according to the API health"
+        ),
+    )
+    PRODUCT_CATALOG_API_MIN_CONCURRENCY: int = Field(
+        default=2,
+        description="The lowest the adaptive product catalog API concurrency limit can go",
+    )
+    PRODUCT_CATALOG_API_INITIAL_CONCURRENCY: int = Field(
         default=10,
-        description="The maximum number of concurrent requests to the product catalog API",
+        description="The product catalog API concurrency limit the process starts with",
+    )
+    PRODUCT_CATALOG_API_LATENCY_TARGET: float = Field(
+        default=1.0,
+        description=(
+            "The product catalog API response time (in seconds) above which "
+            "the concurrency limit is cut instead of raised"
+        ),
+    )
+    PRODUCT_CATALOG_API_BACKOFF_RATIO: float = Field(
+        default=0.5,
+        description=(
+            "The factor the concurrency limit is multiplied by on timeouts, "
+            "429 responses or latency spikes"
+        ),
+    )
+    PRODUCT_CATALOG_API_BULK_FETCH_THRESHOLD: int = Field(
+        default=5,
+        description=(
+            "From how many missing products a batched fetch downloads the whole "
+            "product catalog listing in a single call instead of fetching each product "
+            "in parallel"
+        ),
+    )
+    PRODUCT_CATALOG_API_MAX_QUEUE_SIZE: int = Field(
+        default=100,
+        description=(
+            "The maximum number of calls waiting for a free slot of the product catalog API "
+            "concurrency limit. Calls beyond this are rejected right away"
+        ),
+    )
+    PRODUCT_CATALOG_API_QUEUE_TIMEOUT: float = Field(
+        default=2.0,
+        description=(
+            "The maximum time (in seconds) a call waits in the queue for a free slot "
+            "of the product catalog API concurrency limit before being rejected"
+        ),
+    )
+    PRODUCT_CATALOG_CIRCUIT_BREAKER_WINDOW_SIZE: int = Field(
+        default=20,
+        description="The number of most recent product catalog calls the circuit breaker looks at",
+    )
+    PRODUCT_CATALOG_CIRCUIT_BREAKER_MIN_CALLS: int = Field(
+        default=10,
+        description="The minimum number of calls in the window before the circuit breaker can open",
+    )
+    PRODUCT_CATALOG_CIRCUIT_BREAKER_ERROR_RATE: float = Field(
+        default=0.5,
+        description="The rate (0 to 1) of failed calls in the window that opens the circuit breaker",
+    )
+    PRODUCT_CATALOG_CIRCUIT_BREAKER_SLOW_CALL_SECONDS: float = Field(
+        default=3.0,
+        description="From how many seconds a product catalog call is considered slow by the circuit breaker",
+    )
+    PRODUCT_CATALOG_CIRCUIT_BREAKER_SLOW_CALL_RATE: float = Field(
+        default=0.8,
+        description="The rate (0 to 1) of slow calls in the window that opens the circuit breaker",
+    )
+    PRODUCT_CATALOG_CIRCUIT_BREAKER_COOLDOWN_SECONDS: float = Field(
+        default=30.0,
+        description=(
+            "How long (in seconds) the circuit breaker stays open before letting a test call through. "
+            "While it is open, products past the hard TTL are served from the cache marked as stale"
+        ),
     )
     PRODUCT_CACHE_SOFT_TTL_MINUTES: int = Field(
         default=5,
@@ -62,6 +237,177 @@ class Settings(BaseSettings):
             "from the external source (product catalog) before responding.",
         ),
     )
+    PRODUCT_CACHE_TTL_JITTER_RATIO: float = Field(
+        default=0.1,
+        description=(
+            "Up to which fraction (0 to 1) the soft TTL of each product is shortened. "
+            "The jitter is fixed per product, so the configured soft TTL stays the maximum"
+        ),
+    )
+    PRODUCT_CACHE_EARLY_REFRESH_BETA: float = Field(
+        default=1.0,
+        description=(
+            "How eagerly products are refreshed before the soft TTL, weighted by the "
+            "observed product catalog fetch time (XFetch). Use 0 to disable"
+        ),
+    )
+    PRODUCT_NEGATIVE_CACHE_TTL_MINUTES: int = Field(
+        default=2,
+        description=(
+            "TTL (in minutes) of the negative cache, which remembers the product ids "
+            "the product catalog does not know. While an id is in it, "
+            "the API answers product_not_found without calling the product catalog"
+        ),
+    )
+    PRODUCT_NEGATIVE_CACHE_MAX_ENTRIES: int = Field(
+        default=10000,
+        description="The maximum number of product ids kept in the negative cache (oldest are removed first)",
+    )
+    PRODUCT_L1_CACHE_MAX_ENTRIES: int = Field(
+        default=1000,
+        description=(
+            "The maximum number of products kept in the in-process (L1) cache "
+            "that sits in front of the products_cache table. "
+            "The least recently used products are evicted first"
+        ),
+    )
+    PRODUCT_L1_CACHE_MAX_BYTES: int = Field(
+        default=8 * 1024 * 1024,
+        description="The approximate memory cap (in bytes) of the in-process (L1) product cache",
+    )
+    PRODUCT_L2_CACHE_BACKEND: Literal["none", "memory", "redis"] = Field(
+        default="none",
+        description=(
+            "The shared (L2) product cache between the in-process (L1) cache and the products_cache table. "
+            "`redis` is shared by every worker, `memory` keeps it inside each process (tests and single-worker runs)"
+        ),
+    )
+    PRODUCT_L2_CACHE_REDIS_URL: str = Field(
+        default="redis://localhost:6379/0",
+        description="The URL of the Redis (or Redis protocol compatible) server used by the L2 product cache",
+    )
+    PRODUCT_L2_CACHE_KEY_PREFIX: str = Field(
+        default="product:",
+        description="The prefix of the L2 product cache keys",
+    )
+    PRODUCT_L2_CACHE_TIMEOUT: float = Field(
+        default=0.2,
+        description=(
+            "The timeout (in seconds) of each L2 product cache call, including the wait for a free connection. "
+            "Failed or slow calls are treated as misses"
+        ),
+    )
+    PRODUCT_L2_CACHE_POOL_SIZE: int = Field(
+        default=4,
+        description="The maximum number of connections each worker opens to the L2 product cache",
+    )
+    PRODUCT_REFRESH_WORKERS: int = Field(
+        default=4,
+        description="The number of workers that refresh stale products in the background, per process",
+    )
+    PRODUCT_REFRESH_QUEUE_MAX_SIZE: int = Field(
+        default=1000,
+        description=(
+            "The maximum number of products waiting for a background refresh. "
+            "When the queue is full new refreshes are dropped, since the product is still served from the cache"
+        ),
+    )
+    CACHE_INVALIDATION_ENABLED: bool = Field(
+        default=True,
+        description=(
+            "Whether writes to products and customers notify the other processes over Postgres LISTEN/NOTIFY, "
+            "so their in-process caches evict the changed entries"
+        ),
+    )
+    CACHE_INVALIDATION_RECONNECT_SECONDS: float = Field(
+        default=1.0,
+        description="How long (in seconds) the cache invalidation listener waits before reconnecting",
+    )
+    SHUTDOWN_DRAIN_TIMEOUT_SECONDS: float = Field(
+        default=5.0,
+        description="How long (in seconds) the shutdown waits for queued background work before cancelling it",
+    )
+    PRODUCT_HOT_REFRESH_ENABLED: bool = Field(
+        default=True,
+        description="Whether the most requested products are refreshed in the background before the soft TTL",
+    )
+    PRODUCT_HOT_REFRESH_TOP_N: int = Field(
+        default=50,
+        description="How many of the most requested products are kept fresh proactively, per process",
+    )
+    PRODUCT_HOT_REFRESH_PERIOD_SECONDS: float = Field(
+        default=30.0,
+        description="How often (in seconds) the hot products are checked for a proactive refresh",
+    )
+    PRODUCT_HOT_REFRESH_LEAD_SECONDS: float = Field(
+        default=60.0,
+        description="How long (in seconds) before the soft TTL a hot product is refreshed",
+    )
+    PRODUCT_POPULARITY_DECAY: float = Field(
+        default=0.8,
+        description=(
+            "The factor (0 to 1) the product access counts are multiplied by on every "
+            "hot refresh check, so that old popularity fades away"
+        ),
+    )
+    PRODUCT_CACHE_WARMER_ENABLED: bool = Field(
+        default=True,
+        description=(
+            "Whether the API keeps the products_cache table warm by periodically downloading "
+            "the whole product catalog in background. Only one uvicorn worker runs the job at a time "
+            "(coordinated through a PostgreSQL advisory lock). "
+            "It can also be run on demand with `python -m app warm-product-cache`"
+        ),
+    )
+    PRODUCT_CACHE_WARMER_PERIOD_SECONDS: float = Field(
+        default=240.0,
+        description=(
+            "The period (in seconds) between two downloads of the whole product catalog. "
+            "Keep it below the soft TTL so customers are almost always served from the cache"
+        ),
+    )
+    PRODUCT_CACHE_WARMER_JITTER_SECONDS: float = Field(
+        default=30.0,
+        description="The maximum random variation (in seconds) added to or removed from the warmer period",
+    )
+    PRODUCT_CACHE_GC_ENABLED: bool = Field(
+        default=True,
+        description="Whether products nobody has favorited are periodically removed from products_cache",
+    )
+    PRODUCT_CACHE_GC_RETENTION_HOURS: int = Field(
+        default=24,
+        description=(
+            "How long (in hours) after the last refresh a product nobody has favorited is kept "
+            "in products_cache. It is never shorter than the hard TTL"
+        ),
+    )
+    PRODUCT_CACHE_GC_PERIOD_SECONDS: float = Field(
+        default=3600.0,
+        description="How often (in seconds) products_cache is swept",
+    )
+    PRODUCT_CACHE_GC_BATCH_SIZE: int = Field(
+        default=500,
+        description="How many products_cache rows are deleted per transaction by the sweeper",
+    )
+    PRODUCT_CACHE_GC_MAX_BATCHES: int = Field(
+        default=100,
+        description="The maximum number of batches deleted per sweep, the rest is left for the next one",
+    )
+    PRODUCT_CACHE_WRITE_BEHIND_ENABLED: bool = Field(
+        default=True,
+        description=(
+            "Whether product cache refreshes are buffered in memory and written to the "
+            "products_cache table in batches (write-behind) instead of one statement per product"
+        ),
+    )
+    PRODUCT_CACHE_WRITE_BEHIND_MAX_BATCH_SIZE: int = Field(
+        default=100,
+        description="The number of buffered product cache refreshes that triggers a flush",
+    )
+    PRODUCT_CACHE_WRITE_BEHIND_FLUSH_INTERVAL_SECONDS: float = Field(
+        default=1.0,
+        description="The maximum time (in seconds) a product cache refresh stays buffered before being flushed",
+    )
 
     # Security
     API_KEY: str = Field(
@@ -101,6 +447,13 @@ class Settings(BaseSettings):
     DATABASE_POOL_SIZE: int = Field(
         default=5, description="The size of the database pool"
     )
+    DATABASE_CACHE_POOL_SIZE: int = Field(
+        default=5,
+        description=(
+            "The size of the separate database pool used by the product cache "
+            "fetches shared between requests (single flight)"
+        ),
+    )
 
     @computed_field
     @property
@@ -0,0 +1,92 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Dict, List, Optional, TypeVar
+
+from app.__core__.application.metrics import metrics
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Agrupa chamadas concorrentes com a mesma chave em uma única execução.
+
+    A primeira chamada para uma chave dispara a execução em uma task própria,
+    as demais apenas aguardam o mesmo resultado (ou a mesma exceção). Como a
+    task é protegida com `asyncio.shield`, o cancelamento de quem chamou
+    primeiro não cancela o trabalho de quem ainda está esperando.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.coalesced = 0
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            self.coalesced += 1
+            metrics.increment(f"{self.name}_single_flight_coalesced")
+
+        return await asyncio.shield(task)
+
+    async def do_many(
+        self,
+        keys: List[Hashable],
+        fn: Callable[[List[Hashable]], Awaitable[Dict[Hashable, T]]],
+    ) -> Dict[Hashable, Optional[T] | BaseException]:
+        """Versão em lote do `do`.
+
+        As chaves que já estão em andamento apenas aguardam a execução
+        existente; as restantes são resolvidas por uma única chamada de `fn`
+        com a lista das chaves faltantes. Chaves que não vierem no resultado
+        de `fn` resolvem como `None`, e exceções são devolvidas no próprio
+        dicionário, por chave, em vez de propagadas.
+        """
+        tasks: Dict[Hashable, asyncio.Task] = {}
+        missing_keys: List[Hashable] = []
+
+        for key in dict.fromkeys(keys):
+            task = self._calls.get(key)
+            if task is None:
+                missing_keys.append(key)
+            else:
+                tasks[key] = task
+                self.coalesced += 1
+                metrics.increment(f"{self.name}_single_flight_coalesced")
+
+        if missing_keys:
+            batch = asyncio.ensure_future(fn(missing_keys))
+            for key in missing_keys:
+                task = asyncio.ensure_future(self._pick(batch, key))
+                self._calls[key] = task
+                task.add_done_callback(
+                    lambda done, key=key: self._forget(key, done)
+                )
+                tasks[key] = task
+
+        results = await asyncio.gather(
+            *[asyncio.shield(task) for task in tasks.values()],
+            return_exceptions=True,
+        )
+        return dict(zip(tasks.keys(), results))
+
+    @staticmethod
+    async def _pick(batch: asyncio.Future, key: Hashable):
+        results = await batch
+        return results.get(key)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # evita o warning de "exception was never retrieved" quando todos
+        # os interessados foram cancelados antes da task terminar
+        if not task.cancelled():
+            task.exception()
@@ -1,6 +1,6 @@
 import asyncio
-from collections.abc import Awaitable
-from typing import Optional, Set
+from collections.abc import Awaitable, Callable
+from typing import List, Optional, Set
 
 from app.__core__.application.logger import logger
 
@@ -8,6 +8,10 @@ from app.__core__.application.logger import logger
 class TaskManager:
     def __init__(self) -> None:
         self._tasks: Set[asyncio.Task] = set()
+        self._drain_hooks: List[Callable[[], Awaitable[None]]] = []
+
+    def add_drain_hook(self, hook: Callable[[], Awaitable[None]]) -> None:
+        self._drain_hooks.append(hook)
 
     def create(self, coroutine: Awaitable, *, name: Optional[str] = None) -> None:
         task = asyncio.create_task(coroutine, name=name)
@@ -25,7 +29,16 @@ class TaskManager:
 
         task.add_done_callback(_done_callback)
 
-    async def shutdown(self) -> None:
+    async def shutdown(self, deadline: float = 0.0) -> None:
+        # antes de cancelar, dá até `deadline` segundos para quem tem trabalho
+        # pendente (ex.: filas de refresh) terminar o que já aceitou
+        if self._drain_hooks and deadline > 0:
+            try:
+                async with asyncio.timeout(deadline):
+                    await asyncio.gather(*[hook() for hook in self._drain_hooks])
+            except TimeoutError:
+                logger.warning("task_manager_drain_timeout", deadline=deadline)
+
         pending = [task for task in self._tasks if not task.done()]
         for task in pending:
             task.cancel()
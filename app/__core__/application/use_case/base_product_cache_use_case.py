@@ -1,58 +1,212 @@
-import asyncio
+import math
+import random
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta, timezone
+from typing import AsyncContextManager, Dict, List, Optional, Tuple
 
 from app.__core__.application.gateways.product_catalog import IProductCatalog
 from app.__core__.application.logger import logger
+from app.__core__.application.metrics import metrics
+from app.__core__.application.moving_average import ExponentialMovingAverage
 from app.__core__.application.settings import get_settings
+from app.__core__.application.single_flight import SingleFlight
 from app.__core__.domain.entity.product import Product
-from app.__core__.domain.exception.exception import ValidationError
-from app.__core__.domain.repository.repository import IProductCacheRepository
+from app.__core__.domain.exception.exception import (CircuitOpenError,
+                                                     ValidationError)
+from app.__core__.domain.repository.repository import (
+    IProductCacheRepository, IProductNegativeCacheRepository)
 
 settings = get_settings()
 
+# custo (em segundos) de buscar um produto no catálogo, compartilhado pelo
+# processo e usado para antecipar os refreshes (XFetch)
+catalog_fetch_cost = ExponentialMovingAverage(alpha=0.2)
+
+ProductCacheRepositories = Tuple[
+    IProductCacheRepository, IProductNegativeCacheRepository
+]
+# abre os repositórios de cache em uma sessão própria (ver `_open_repositories`)
+ProductCacheSession = Callable[[], AsyncContextManager[ProductCacheRepositories]]
+
 
 class BaseProductCacheUseCase:
     def __init__(
         self,
         product_cache_repository: IProductCacheRepository,
+        product_negative_cache_repository: IProductNegativeCacheRepository,
         product_catalog: IProductCatalog,
+        single_flight: SingleFlight,
+        product_cache_session: Optional[ProductCacheSession] = None,
     ):
         self.product_cache_repository = product_cache_repository
+        self.product_negative_cache_repository = product_negative_cache_repository
         self.product_catalog = product_catalog
+        self.single_flight = single_flight
+        self.product_cache_session = product_cache_session
 
         self.soft_ttl = timedelta(minutes=settings.PRODUCT_CACHE_SOFT_TTL_MINUTES)
         self.hard_ttl = timedelta(minutes=settings.PRODUCT_CACHE_HARD_TTL_MINUTES)
-
-        self._catalog_semaphore = asyncio.Semaphore(
-            settings.PRODUCT_CATALOG_API_MAX_CONCURRENCY
-        )
+        self.ttl_jitter_ratio = settings.PRODUCT_CACHE_TTL_JITTER_RATIO
+        self.early_refresh_beta = settings.PRODUCT_CACHE_EARLY_REFRESH_BETA
 
     async def _fetch_and_insert(self, product_id: int) -> Product:
-        async with self._catalog_semaphore:
-            product = await self.product_catalog.fetch_one(product_id)
-
+        # requisições concorrentes pelo mesmo produto compartilham uma única
+        # chamada ao catálogo e uma única escrita no cache
+        product = await self.single_flight.do(
+            product_id, lambda: self._do_fetch_and_insert(product_id)
+        )
         if product is None:
             raise ValidationError("product_not_found")
+        return product
 
-        await self.product_cache_repository.insert_one(product)
+    async def _fetch_and_refresh(self, product_id: int) -> Product:
+        product = await self.single_flight.do(
+            product_id, lambda: self._do_fetch_and_refresh(product_id)
+        )
+        if product is None:
+            raise ValidationError("product_not_found")
         return product
 
-    async def _refresh_cache(self, product_id: int) -> None:
-        try:
-            async with self._catalog_semaphore:
-                product = await self.product_catalog.fetch_one(product_id)
+    async def _fetch_and_store_many(self, product_ids: List[int]) -> Dict[int, Product]:
+        results = await self.single_flight.do_many(
+            product_ids, self._do_fetch_and_store_many
+        )
 
-            if product is None:
+        products: Dict[int, Product] = {}
+        for product_id, result in results.items():
+            if isinstance(result, BaseException):
+                raise result
+            if result is None:
                 raise ValidationError("product_not_found")
+            products[product_id] = result
+        return products
 
-            await self.product_cache_repository.refresh(product)
+    async def _refresh_cache(self, product_id: int) -> None:
+        try:
+            await self._fetch_and_refresh(product_id)
+        except CircuitOpenError:
+            # o produto continua no cache e será renovado quando o circuito fechar
+            logger.warning("refresh_cache_skipped_circuit_open", product_id=product_id)
         except Exception:
             logger.exception("refresh_cache_error")
 
+    @asynccontextmanager
+    async def _open_repositories(self) -> AsyncIterator[ProductCacheRepositories]:
+        # o trabalho do single flight é compartilhado entre requisições e
+        # continua mesmo se quem o disparou for cancelado, então não pode usar
+        # a sessão da requisição, que é fechada quando ela termina
+        if self.product_cache_session is None:
+            yield self.product_cache_repository, self.product_negative_cache_repository
+            return
+        async with self.product_cache_session() as repositories:
+            yield repositories
+
+    async def _do_fetch_and_insert(self, product_id: int) -> Optional[Product]:
+        async with self._open_repositories() as (
+            product_cache_repository,
+            product_negative_cache_repository,
+        ):
+            product = await self._fetch_one_from_catalog(
+                product_negative_cache_repository, product_id
+            )
+            if product is not None:
+                await product_cache_repository.insert_one(product)
+            return product
+
+    async def _do_fetch_and_refresh(self, product_id: int) -> Optional[Product]:
+        async with self._open_repositories() as (
+            product_cache_repository,
+            product_negative_cache_repository,
+        ):
+            product = await self._fetch_one_from_catalog(
+                product_negative_cache_repository, product_id
+            )
+            if product is not None:
+                await product_cache_repository.refresh(product)
+            return product
+
+    async def _do_fetch_and_store_many(
+        self, product_ids: List[int]
+    ) -> Dict[int, Product]:
+        async with self._open_repositories() as (
+            product_cache_repository,
+            product_negative_cache_repository,
+        ):
+            products = await self._fetch_many_from_catalog(
+                product_negative_cache_repository, product_ids
+            )
+
+            # produtos frios e vencidos vão juntos em um único upsert
+            await product_cache_repository.upsert_many(products)
+            return {product.id: product for product in products}
+
+    async def _fetch_one_from_catalog(
+        self,
+        product_negative_cache_repository: IProductNegativeCacheRepository,
+        product_id: int,
+    ) -> Optional[Product]:
+        # ids que o catálogo já disse não conhecer nem chegam a ele
+        if await product_negative_cache_repository.contains(product_id):
+            metrics.increment("product_negative_cache_avoided_calls")
+            return None
+
+        started_at = time.monotonic()
+        product = await self.product_catalog.fetch_one(product_id)
+        catalog_fetch_cost.update(time.monotonic() - started_at)
+
+        if product is None:
+            await product_negative_cache_repository.insert_many([product_id])
+        return product
+
+    async def _fetch_many_from_catalog(
+        self,
+        product_negative_cache_repository: IProductNegativeCacheRepository,
+        product_ids: List[int],
+    ) -> List[Product]:
+        unknown_ids = set(
+            await product_negative_cache_repository.fetch_many(product_ids)
+        )
+        if unknown_ids:
+            metrics.increment("product_negative_cache_avoided_calls", len(unknown_ids))
+
+        ids_to_fetch = [id for id in product_ids if id not in unknown_ids]
+        if not ids_to_fetch:
+            return []
+
+        started_at = time.monotonic()
+        products = await self.product_catalog.fetch_many(ids_to_fetch)
+        catalog_fetch_cost.update(time.monotonic() - started_at)
+
+        found_ids = {product.id for product in products}
+        not_found_ids = [id for id in ids_to_fetch if id not in found_ids]
+        if not_found_ids:
+            await product_negative_cache_repository.insert_many(not_found_ids)
+        return products
+
     def _get_cache_age(self, cached_product: Product) -> timedelta:
         return datetime.now(timezone.utc) - cached_product.fetched_at.replace(
             tzinfo=timezone.utc
         )
 
-    def _is_cache_fresh(self, age: timedelta) -> bool:
-        return age <= self.soft_ttl
+    def _is_cache_fresh(self, product_id: int, age: timedelta) -> bool:
+        # XFetch: quanto mais perto do soft TTL e mais caro o fetch, maior a
+        # chance de o produto ser considerado vencido antes da hora, o que
+        # espalha os refreshes em vez de vencer tudo no mesmo instante
+        early_by = 0.0
+        if self.early_refresh_beta > 0:
+            early_by = (
+                -catalog_fetch_cost.value
+                * self.early_refresh_beta
+                * math.log(1.0 - random.random())  # nosec B311
+            )
+        soft_ttl = self._get_soft_ttl(product_id).total_seconds()
+        return age.total_seconds() + early_by <= soft_ttl
+
+    def _get_soft_ttl(self, product_id: int) -> timedelta:
+        # jitter determinístico por produto, sempre para menos, para que o soft
+        # TTL configurado continue sendo o máximo; produtos cacheados na mesma
+        # rajada passam a vencer em momentos diferentes
+        spread = (product_id * 2654435761 % 2**32) / 2**32
+        return self.soft_ttl * (1 - self.ttl_jitter_ratio * spread)
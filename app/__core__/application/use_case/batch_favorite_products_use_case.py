@@ -0,0 +1,141 @@
+from abc import ABC, abstractmethod
+from typing import List, Literal, Optional, Set
+
+from app.__core__.application.gateways.product_catalog import IProductCatalog
+from app.__core__.application.logger import logger
+from app.__core__.application.single_flight import SingleFlight
+from app.__core__.application.use_case.base_product_cache_use_case import (
+    BaseProductCacheUseCase, ProductCacheSession)
+from app.__core__.domain.repository.repository import (
+    ICustomerFavoriteProductRepository, IProductCacheRepository,
+    IProductNegativeCacheRepository)
+from app.__core__.domain.strict_record import strict_record
+from app.__core__.domain.value_object.customer_favorite_product import (
+    CreateCustomerFavoriteProductProps, CustomerFavoriteProduct)
+
+BatchFavoriteProductStatus = Literal[
+    "favorited", "product_already_in_favorites", "product_not_found"
+]
+
+
+@strict_record
+class BatchFavoriteProductsInput:
+    customer_id: str
+    product_ids: List[int]
+
+
+@strict_record
+class BatchFavoriteProductResult:
+    product_id: int
+    status: BatchFavoriteProductStatus
+
+
+@strict_record
+class BatchFavoriteProductsOutput:
+    # um resultado por product_id, na ordem em que vieram (sem repetições)
+    results: List[BatchFavoriteProductResult]
+
+
+class IBatchFavoriteProductsUseCase(ABC):
+    @abstractmethod
+    async def execute(
+        self, input_dto: BatchFavoriteProductsInput
+    ) -> BatchFavoriteProductsOutput: ...
+
+
+class BatchFavoriteProductsUseCase(
+    BaseProductCacheUseCase, IBatchFavoriteProductsUseCase
+):
+    def __init__(
+        self,
+        customer_favorite_product_repository: ICustomerFavoriteProductRepository,
+        product_cache_repository: IProductCacheRepository,
+        product_negative_cache_repository: IProductNegativeCacheRepository,
+        product_catalog: IProductCatalog,
+        single_flight: SingleFlight,
+        product_cache_session: Optional[ProductCacheSession] = None,
+    ):
+        super().__init__(
+            product_cache_repository,
+            product_negative_cache_repository,
+            product_catalog,
+            single_flight,
+            product_cache_session,
+        )
+        self.customer_favorite_product_repository = customer_favorite_product_repository
+
+    async def execute(
+        self, input_dto: BatchFavoriteProductsInput
+    ) -> BatchFavoriteProductsOutput:
+        product_ids = list(dict.fromkeys(input_dto.product_ids))
+
+        found_ids = await self._hydrate_products(product_ids)
+        customer_favorite_products = [
+            CustomerFavoriteProduct.create(
+                CreateCustomerFavoriteProductProps(
+                    customer_id=input_dto.customer_id, product_id=product_id
+                )
+            )
+            for product_id in product_ids
+            if product_id in found_ids
+        ]
+        inserted_ids = set(
+            await self.customer_favorite_product_repository.insert_many(
+                customer_favorite_products
+            )
+        )
+
+        return BatchFavoriteProductsOutput(
+            results=[
+                BatchFavoriteProductResult(
+                    product_id=product_id,
+                    status=self._get_status(product_id, found_ids, inserted_ids),
+                )
+                for product_id in product_ids
+            ]
+        )
+
+    async def _hydrate_products(self, product_ids: List[int]) -> Set[int]:
+        # uma única leitura do cache para o lote inteiro; os produtos frios e
+        # vencidos vão juntos em uma única busca no catálogo
+        cached_products = await self.product_cache_repository.fetch_many(product_ids)
+        cached_ids = {product.id for product in cached_products}
+        stale_ids = [
+            product.id
+            for product in cached_products
+            if not self._is_cache_fresh(product.id, self._get_cache_age(product))
+        ]
+        missing_ids = [id for id in product_ids if id not in cached_ids]
+
+        if not stale_ids and not missing_ids:
+            return cached_ids
+
+        results = await self.single_flight.do_many(
+            missing_ids + stale_ids, self._do_fetch_and_store_many
+        )
+
+        found_ids = set(cached_ids)
+        for product_id in missing_ids:
+            result = results[product_id]
+            if isinstance(result, BaseException):
+                raise result
+            if result is not None:
+                found_ids.add(product_id)
+
+        # como no favorito unitário, falhar a renovação de um produto que já
+        # está no cache não impede de favoritá-lo
+        for product_id in stale_ids:
+            if isinstance(results[product_id], BaseException):
+                logger.warning("refresh_cache_error", product_id=product_id)
+
+        return found_ids
+
+    @staticmethod
+    def _get_status(
+        product_id: int, found_ids: Set[int], inserted_ids: Set[int]
+    ) -> BatchFavoriteProductStatus:
+        if product_id not in found_ids:
+            return "product_not_found"
+        if product_id not in inserted_ids:
+            return "product_already_in_favorites"
+        return "favorited"
@@ -0,0 +1,67 @@
+from abc import ABC, abstractmethod
+from typing import List, Literal
+
+from app.__core__.domain.repository.repository import \
+    ICustomerFavoriteProductRepository
+from app.__core__.domain.strict_record import strict_record
+
+BatchUnfavoriteProductStatus = Literal["unfavorited", "product_not_in_favorites"]
+
+
+@strict_record
+class BatchUnfavoriteProductsInput:
+    customer_id: str
+    product_ids: List[int]
+
+
+@strict_record
+class BatchUnfavoriteProductResult:
+    product_id: int
+    status: BatchUnfavoriteProductStatus
+
+
+@strict_record
+class BatchUnfavoriteProductsOutput:
+    # um resultado por product_id, na ordem em que vieram (sem repetições)
+    results: List[BatchUnfavoriteProductResult]
+
+
+class IBatchUnfavoriteProductsUseCase(ABC):
+    @abstractmethod
+    async def execute(
+        self, input_dto: BatchUnfavoriteProductsInput
+    ) -> BatchUnfavoriteProductsOutput: ...
+
+
+class BatchUnfavoriteProductsUseCase(IBatchUnfavoriteProductsUseCase):
+    def __init__(
+        self,
+        customer_favorite_product_repository: ICustomerFavoriteProductRepository,
+    ):
+        self.customer_favorite_product_repository = customer_favorite_product_repository
+
+    async def execute(
+        self, input_dto: BatchUnfavoriteProductsInput
+    ) -> BatchUnfavoriteProductsOutput:
+        product_ids = list(dict.fromkeys(input_dto.product_ids))
+
+        # um único DELETE para o lote; o RETURNING diz quais eram favoritos
+        deleted_ids = set(
+            await self.customer_favorite_product_repository.delete_many(
+                input_dto.customer_id, product_ids
+            )
+        )
+
+        return BatchUnfavoriteProductsOutput(
+            results=[
+                BatchUnfavoriteProductResult(
+                    product_id=product_id,
+                    status=(
+                        "unfavorited"
+                        if product_id in deleted_ids
+                        else "product_not_in_favorites"
+                    ),
+                )
+                for product_id in product_ids
+            ]
+        )
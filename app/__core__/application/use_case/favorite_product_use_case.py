@@ -1,11 +1,14 @@
 from abc import ABC, abstractmethod
+from typing import Optional
 
 from app.__core__.application.gateways.product_catalog import IProductCatalog
-from app.__core__.application.use_case.base_product_cache_use_case import \
-    BaseProductCacheUseCase
+from app.__core__.application.single_flight import SingleFlight
+from app.__core__.application.use_case.base_product_cache_use_case import (
+    BaseProductCacheUseCase, ProductCacheSession)
 from app.__core__.domain.exception.exception import ValidationError
 from app.__core__.domain.repository.repository import (
-    ICustomerFavoriteProductRepository, IProductCacheRepository)
+    ICustomerFavoriteProductRepository, IProductCacheRepository,
+    IProductNegativeCacheRepository)
 from app.__core__.domain.strict_record import strict_record
 from app.__core__.domain.value_object.customer_favorite_product import \
     CustomerFavoriteProduct
@@ -27,26 +30,39 @@ class FavoriteProductUseCase(BaseProductCacheUseCase, IFavoriteProductUseCase):
         self,
         customer_favorite_product_repository: ICustomerFavoriteProductRepository,
         product_cache_repository: IProductCacheRepository,
+        product_negative_cache_repository: IProductNegativeCacheRepository,
         product_catalog: IProductCatalog,
+        single_flight: SingleFlight,
+        product_cache_session: Optional[ProductCacheSession] = None,
     ):
-        super().__init__(product_cache_repository, product_catalog)
+        super().__init__(
+            product_cache_repository,
+            product_negative_cache_repository,
+            product_catalog,
+            single_flight,
+            product_cache_session,
+        )
         self.customer_favorite_product_repository = customer_favorite_product_repository
 
     async def execute(self, input_dto: FavoriteProductInput) -> None:
-        existing_customer_favorite_product = (
-            await self.customer_favorite_product_repository.fetch_one(
+        try:
+            await self._hydrate_product(input_dto.product_id)
+        except Exception:
+            # o favorito já existente continua sendo um 409, mesmo que o
+            # produto não possa ser validado agora (catálogo fora, produto
+            # removido); a checagem extra só acontece nesse caminho de erro
+            if await self.customer_favorite_product_repository.fetch_one(
                 input_dto.customer_id, input_dto.product_id
-            )
-        )
-        if existing_customer_favorite_product:
-            raise ValidationError("product_already_in_favorites")
-
-        await self._hydrate_product(input_dto.product_id)
+            ):
+                raise ValidationError("product_already_in_favorites") from None
+            raise
 
         customer_favorite_product = CustomerFavoriteProduct.create(input_dto)
-        await self.customer_favorite_product_repository.insert_one(
+        inserted = await self.customer_favorite_product_repository.insert_if_absent(
             customer_favorite_product
         )
+        if not inserted:
+            raise ValidationError("product_already_in_favorites")
 
     async def _hydrate_product(self, product_id: int) -> None:
         cached = await self.product_cache_repository.fetch_one(product_id)
@@ -54,7 +70,7 @@ class FavoriteProductUseCase(BaseProductCacheUseCase, IFavoriteProductUseCase):
         if cached:
             age = self._get_cache_age(cached)
 
-            if not self._is_cache_fresh(age):
+            if not self._is_cache_fresh(product_id, age):
                 await self._refresh_cache(product_id)
 
         else:
@@ -1,19 +1,26 @@
-import asyncio
 from abc import ABC, abstractmethod
 from datetime import timedelta
 from math import ceil
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
 
+from app.__core__.application.gateways.product_cache_tiers import \
+    IProductCacheTiers
 from app.__core__.application.gateways.product_catalog import IProductCatalog
-from app.__core__.application.task_manager import TaskManager
-from app.__core__.application.use_case.base_product_cache_use_case import \
-    BaseProductCacheUseCase
+from app.__core__.application.hot_key_tracker import HotKeyTracker
+from app.__core__.application.logger import logger
+from app.__core__.application.metrics import metrics
+from app.__core__.application.refresh_scheduler import (RefreshPriority,
+                                                        RefreshScheduler)
+from app.__core__.application.single_flight import SingleFlight
+from app.__core__.application.use_case.base_product_cache_use_case import (
+    BaseProductCacheUseCase, ProductCacheSession)
 from app.__core__.domain.entity.product import Product, Review
-from app.__core__.domain.exception.exception import ValidationError
-from app.__core__.domain.repository.pagination import (PaginationInput,
+from app.__core__.domain.exception.exception import CircuitOpenError
+from app.__core__.domain.repository.pagination import (Cursor, PaginationInput,
                                                        PaginationOutput)
 from app.__core__.domain.repository.repository import (
-    ICustomerFavoriteProductRepository, IProductCacheRepository)
+    ICustomerFavoriteProductRepository, IProductCacheRepository,
+    IProductNegativeCacheRepository)
 from app.__core__.domain.strict_record import strict_record
 from app.__core__.domain.value_object.customer_favorite_product import \
     CustomerFavoriteProduct
@@ -24,6 +31,8 @@ class ListCustomerFavoriteProductsInput:
     customer_id: str
     page: int
     per_page: int
+    # cursor opaco devolvido em `next_cursor`; quando vem, `page` é ignorado
+    cursor: Optional[str] = None
 
 
 @strict_record
@@ -33,6 +42,9 @@ class ProductOutput:
     image_url: str
     price: float
     review: Optional[Review]
+    # True quando o produto passou do hard TTL e foi servido do cache porque
+    # o catálogo estava indisponível (circuit breaker aberto)
+    stale: bool = False
 
 
 @strict_record
@@ -55,116 +67,170 @@ class ListCustomerFavoriteProductsUseCase(
         self,
         customer_favorite_product_repository: ICustomerFavoriteProductRepository,
         product_cache_repository: IProductCacheRepository,
+        product_negative_cache_repository: IProductNegativeCacheRepository,
         product_catalog: IProductCatalog,
-        task_manager: TaskManager,
+        single_flight: SingleFlight,
+        refresh_scheduler: RefreshScheduler,
+        product_popularity: HotKeyTracker,
+        product_cache_tiers: IProductCacheTiers,
+        product_cache_session: Optional[ProductCacheSession] = None,
     ):
-        super().__init__(product_cache_repository, product_catalog)
+        super().__init__(
+            product_cache_repository,
+            product_negative_cache_repository,
+            product_catalog,
+            single_flight,
+            product_cache_session,
+        )
         self.customer_favorite_product_repository = customer_favorite_product_repository
-        self.task_manager = task_manager
+        self.refresh_scheduler = refresh_scheduler
+        self.product_popularity = product_popularity
+        self.product_cache_tiers = product_cache_tiers
 
     async def execute(
         self, input_dto: ListCustomerFavoriteProductsInput
     ) -> ListCustomerFavoriteProductsOutput:
-        pagination = PaginationInput(page=input_dto.page, per_page=input_dto.per_page)
-
-        async with asyncio.TaskGroup() as tg:
-            list_customer_favorite_products_task = tg.create_task(
-                self.customer_favorite_product_repository.fetch_many(
-                    input_dto.customer_id, pagination
-                )
-            )
-            total_items_task = tg.create_task(
-                self.customer_favorite_product_repository.count_all(
-                    input_dto.customer_id
-                )
-            )
-
-        customer_favorite_products = list_customer_favorite_products_task.result()
-        total_items = total_items_task.result()
-
-        data = await self._hydrate_products(customer_favorite_products)
-        pagination = self._map_pagination_to_output(pagination, total_items)
+        pagination = PaginationInput(
+            page=input_dto.page,
+            per_page=input_dto.per_page,
+            cursor=Cursor.decode(input_dto.cursor) if input_dto.cursor else None,
+        )
+
+        # favoritos, produtos em cache no Postgres e total vêm de uma única
+        # query
+        page = await self.customer_favorite_product_repository.fetch_page(
+            input_dto.customer_id, pagination
+        )
+        customer_favorite_products = [cfp for cfp, _ in page.items]
+        cached_products = await self._fetch_cached_products(page.items)
+
+        data = await self._hydrate_products(customer_favorite_products, cached_products)
+        pagination = self._map_pagination_to_output(
+            pagination, page.total_items, customer_favorite_products
+        )
 
         return ListCustomerFavoriteProductsOutput(data=data, pagination=pagination)
 
-    async def _hydrate_products(
-        self, customer_favorite_products: List[CustomerFavoriteProduct]
+    async def _fetch_cached_products(
+        self, items: List[Tuple[CustomerFavoriteProduct, Optional[Product]]]
     ) -> List[Product]:
-        product_ids = [cfp.product_id for cfp in customer_favorite_products]
-        cached_products = await self.product_cache_repository.fetch_many(product_ids)
+        # O L1/L2 pode ter uma versão mais nova do que a do Postgres (ex.:
+        # refresh ainda no write-behind), então é consultado primeiro; as
+        # linhas do JOIN só cobrem os misses e alimentam as duas camadas
+        tier_products = await self.product_cache_tiers.get_many(
+            [cfp.product_id for cfp, _ in items]
+        )
+        found_ids = {product.id for product in tier_products}
+        joined_products = [
+            product
+            for _, product in items
+            if product is not None and product.id not in found_ids
+        ]
+        await self.product_cache_tiers.put_many(joined_products)
+        return tier_products + joined_products
+
+    async def _hydrate_products(
+        self,
+        customer_favorite_products: List[CustomerFavoriteProduct],
+        cached_products: List[Product],
+    ) -> List[ProductOutput]:
         cached_by_id = {p.id: p for p in cached_products}
 
         output_data: List[Optional[Product]] = [None] * len(customer_favorite_products)
-        tasks: List[asyncio.Task] = []
+        product_ids_to_fetch: List[int] = []
+        hard_stale_by_id: Dict[int, Product] = {}
+        stale_ids: Set[int] = set()
 
         # o índice é importante para manter a ordem dos produtos no output_data,
         # ou seja, cada produto favoritad tem um tratamento diferente
         for idx, cfp in enumerate(customer_favorite_products):
             product_id = cfp.product_id
             cached = cached_by_id.get(product_id)
+            self.product_popularity.record(product_id)
 
             if cached:
                 age = self._get_cache_age(cached)
 
-                if self._is_cache_fresh(age):
+                if self._is_cache_fresh(product_id, age):
                     output_data[idx] = cached
 
                 elif not self._is_cache_stale(age):
                     output_data[idx] = cached
-                    self.task_manager.create(  # disparo em background do refresh
-                        self._refresh_cache(product_id),
-                        name=f"refresh_cache_for_product_{product_id}",
+                    # refresh em background, pelos workers do scheduler
+                    self.refresh_scheduler.schedule(
+                        product_id, RefreshPriority.SOFT_STALE
                     )
 
                 else:
-                    tasks.append(
-                        asyncio.create_task(
-                            self._fetch_and_refresh_with_index(
-                                product_id, idx, output_data
-                            )
-                        )
-                    )
+                    hard_stale_by_id[product_id] = cached
+                    product_ids_to_fetch.append(product_id)
 
             else:
-                tasks.append(
-                    asyncio.create_task(
-                        self._fetch_and_insert_with_index(product_id, idx, output_data)
+                product_ids_to_fetch.append(product_id)
+
+        # todos os produtos frios ou vencidos (hard TTL) da página são
+        # buscados de uma vez só no catálogo
+        if product_ids_to_fetch:
+            try:
+                fetched_by_id = await self._fetch_and_store_many(product_ids_to_fetch)
+            except CircuitOpenError:
+                # stale-if-error: com o circuito aberto, os produtos vencidos
+                # são servidos do cache marcados como desatualizados; só falha
+                # se algum produto da página não tiver nada no cache
+                if len(hard_stale_by_id) < len(product_ids_to_fetch):
+                    raise
+                logger.warning("serving_stale_products", count=len(hard_stale_by_id))
+                metrics.increment("product_cache_stale_served", len(hard_stale_by_id))
+                fetched_by_id = hard_stale_by_id
+                stale_ids = set(hard_stale_by_id)
+                for product_id in stale_ids:
+                    self.refresh_scheduler.schedule(
+                        product_id, RefreshPriority.HARD_STALE
                     )
-                )
 
-        if len(tasks) > 0:
-            await asyncio.gather(*tasks)
+            for idx, cfp in enumerate(customer_favorite_products):
+                if output_data[idx] is None:
+                    output_data[idx] = fetched_by_id[cfp.product_id]
 
-        return [value for value in output_data if value is not None]
+        return [
+            self._map_product_to_output(product, stale=product.id in stale_ids)
+            for product in output_data
+            if product is not None
+        ]
 
     def _is_cache_stale(self, age: timedelta) -> bool:
         return age > self.hard_ttl
 
-    async def _fetch_and_insert_with_index(
-        self, product_id: int, idx: int, output_data: List[Optional[Product]]
-    ):
-        product = await self._fetch_and_insert(product_id)
-        output_data[idx] = product
-
-    async def _fetch_and_refresh_with_index(
-        self, product_id: int, idx: int, output_data: List[Optional[Product]]
-    ):
-        async with self._catalog_semaphore:
-            product = await self.product_catalog.fetch_one(product_id)
-
-        if product is None:
-            raise ValidationError("product_not_found")
-
-        await self.product_cache_repository.refresh(product)
-        output_data[idx] = product
+    def _map_product_to_output(self, product: Product, stale: bool) -> ProductOutput:
+        return ProductOutput(
+            id=product.id,
+            title=product.title,
+            image_url=product.image_url,
+            price=product.price,
+            review=product.review,
+            stale=stale,
+        )
 
     def _map_pagination_to_output(
-        self, pagination: PaginationInput, total_items: int
+        self,
+        pagination: PaginationInput,
+        total_items: int,
+        customer_favorite_products: List[CustomerFavoriteProduct],
     ) -> PaginationOutput:
         total_pages = ceil(total_items / pagination.per_page) if total_items > 0 else 0
+
+        # página cheia: pode haver mais itens depois do último desta página
+        next_cursor = None
+        if len(customer_favorite_products) == pagination.per_page:
+            last = customer_favorite_products[-1]
+            next_cursor = Cursor(
+                favorited_at=last.favorited_at, product_id=last.product_id
+            ).encode()
+
         return PaginationOutput(
             page=pagination.page,
             per_page=pagination.per_page,
             total_pages=total_pages,
             total_items=total_items,
+            next_cursor=next_cursor,
         )
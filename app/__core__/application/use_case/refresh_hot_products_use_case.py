@@ -0,0 +1,61 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+
+from app.__core__.application.hot_key_tracker import HotKeyTracker
+from app.__core__.application.refresh_scheduler import (RefreshPriority,
+                                                        RefreshScheduler)
+from app.__core__.application.settings import get_settings
+from app.__core__.domain.repository.repository import IProductCacheRepository
+from app.__core__.domain.strict_record import strict_record
+
+settings = get_settings()
+
+
+@strict_record
+class RefreshHotProductsOutput:
+    scheduled_products: int
+
+
+class IRefreshHotProductsUseCase(ABC):
+    @abstractmethod
+    async def execute(self) -> RefreshHotProductsOutput: ...
+
+
+class RefreshHotProductsUseCase(IRefreshHotProductsUseCase):
+    def __init__(
+        self,
+        product_cache_repository: IProductCacheRepository,
+        product_popularity: HotKeyTracker,
+        refresh_scheduler: RefreshScheduler,
+    ):
+        self.product_cache_repository = product_cache_repository
+        self.product_popularity = product_popularity
+        self.refresh_scheduler = refresh_scheduler
+
+        self.top_n = settings.PRODUCT_HOT_REFRESH_TOP_N
+        self.decay = settings.PRODUCT_POPULARITY_DECAY
+        # produtos quentes são renovados um pouco antes do menor soft TTL
+        # possível (com o jitter), para nunca caírem no caminho de stale
+        soft_ttl = timedelta(minutes=settings.PRODUCT_CACHE_SOFT_TTL_MINUTES)
+        shortest_soft_ttl = soft_ttl * (1 - settings.PRODUCT_CACHE_TTL_JITTER_RATIO)
+        lead = timedelta(seconds=settings.PRODUCT_HOT_REFRESH_LEAD_SECONDS)
+        self.refresh_after = shortest_soft_ttl - lead
+
+    async def execute(self) -> RefreshHotProductsOutput:
+        product_ids = self.product_popularity.top(self.top_n)
+        self.product_popularity.decay(self.decay)
+        if not product_ids:
+            return RefreshHotProductsOutput(scheduled_products=0)
+
+        cached_products = await self.product_cache_repository.fetch_many(product_ids)
+        now = datetime.now(timezone.utc)
+
+        scheduled = 0
+        for product in cached_products:
+            age = now - product.fetched_at.replace(tzinfo=timezone.utc)
+            if age >= self.refresh_after and self.refresh_scheduler.schedule(
+                product.id, RefreshPriority.SPECULATIVE
+            ):
+                scheduled += 1
+
+        return RefreshHotProductsOutput(scheduled_products=scheduled)
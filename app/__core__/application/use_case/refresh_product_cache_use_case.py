@@ -0,0 +1,22 @@
+from abc import ABC, abstractmethod
+
+from app.__core__.application.use_case.base_product_cache_use_case import \
+    BaseProductCacheUseCase
+from app.__core__.domain.strict_record import strict_record
+
+
+@strict_record
+class RefreshProductCacheInput:
+    product_id: int
+
+
+class IRefreshProductCacheUseCase(ABC):
+    @abstractmethod
+    async def execute(self, input_dto: RefreshProductCacheInput) -> None: ...
+
+
+class RefreshProductCacheUseCase(BaseProductCacheUseCase, IRefreshProductCacheUseCase):
+    async def execute(self, input_dto: RefreshProductCacheInput) -> None:
+        # executado pelos workers do RefreshScheduler, cada um com a sua sessão,
+        # e não mais na sessão da requisição que agendou o refresh
+        await self._refresh_cache(input_dto.product_id)
@@ -0,0 +1,62 @@
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+
+from app.__core__.application.logger import logger
+from app.__core__.application.metrics import metrics
+from app.__core__.application.settings import get_settings
+from app.__core__.domain.repository.repository import IProductCacheRepository
+from app.__core__.domain.strict_record import strict_record
+
+settings = get_settings()
+
+
+@strict_record
+class SweepProductCacheOutput:
+    deleted_rows: int
+    reclaimed_bytes: int
+
+
+class ISweepProductCacheUseCase(ABC):
+    @abstractmethod
+    async def execute(self) -> SweepProductCacheOutput: ...
+
+
+class SweepProductCacheUseCase(ISweepProductCacheUseCase):
+    def __init__(self, product_cache_repository: IProductCacheRepository):
+        self.product_cache_repository = product_cache_repository
+
+        # a retenção nunca é menor que o hard TTL, senão apagaríamos produtos
+        # que ainda podem ser servidos do cache
+        self.retention = max(
+            timedelta(hours=settings.PRODUCT_CACHE_GC_RETENTION_HOURS),
+            timedelta(minutes=settings.PRODUCT_CACHE_HARD_TTL_MINUTES),
+        )
+        self.batch_size = settings.PRODUCT_CACHE_GC_BATCH_SIZE
+        self.max_batches = settings.PRODUCT_CACHE_GC_MAX_BATCHES
+
+    async def execute(self) -> SweepProductCacheOutput:
+        fetched_before = datetime.now(timezone.utc) - self.retention
+        deleted_rows = 0
+        reclaimed_bytes = 0
+
+        # lotes pequenos, cada um na sua transação, para não segurar locks
+        # nem gerar um DELETE gigante de uma vez
+        for _ in range(self.max_batches):
+            ids, size = await self.product_cache_repository.delete_unreferenced(
+                fetched_before, self.batch_size
+            )
+            deleted_rows += len(ids)
+            reclaimed_bytes += size
+            if len(ids) < self.batch_size:
+                break
+
+        metrics.increment("product_cache_gc_deleted_rows", deleted_rows)
+        metrics.increment("product_cache_gc_reclaimed_bytes", reclaimed_bytes)
+        logger.info(
+            "product_cache_swept",
+            deleted_rows=deleted_rows,
+            reclaimed_bytes=reclaimed_bytes,
+        )
+        return SweepProductCacheOutput(
+            deleted_rows=deleted_rows, reclaimed_bytes=reclaimed_bytes
+        )
@@ -25,14 +25,8 @@ class UnfavoriteProductUseCase(IUnfavoriteProductUseCase):
         self.customer_favorite_product_repository = customer_favorite_product_repository
 
     async def execute(self, input_dto: UnfavoriteProductInput) -> None:
-        customer_favorite_product = (
-            await self.customer_favorite_product_repository.fetch_one(
-                input_dto.customer_id, input_dto.product_id
-            )
-        )
-        if not customer_favorite_product:
-            raise ValidationError("product_not_in_favorites")
-
-        await self.customer_favorite_product_repository.delete_one(
+        deleted = await self.customer_favorite_product_repository.delete_if_present(
             input_dto.customer_id, input_dto.product_id
         )
+        if not deleted:
+            raise ValidationError("product_not_in_favorites")
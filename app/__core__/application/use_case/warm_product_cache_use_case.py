@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+
+from app.__core__.application.gateways.product_catalog import IProductCatalog
+from app.__core__.application.logger import logger
+from app.__core__.domain.repository.repository import IProductCacheRepository
+from app.__core__.domain.strict_record import strict_record
+
+
+@strict_record
+class WarmProductCacheOutput:
+    warmed_products: int
+
+
+class IWarmProductCacheUseCase(ABC):
+    @abstractmethod
+    async def execute(self) -> WarmProductCacheOutput: ...
+
+
+class WarmProductCacheUseCase(IWarmProductCacheUseCase):
+    def __init__(
+        self,
+        product_cache_repository: IProductCacheRepository,
+        product_catalog: IProductCatalog,
+    ):
+        self.product_cache_repository = product_cache_repository
+        self.product_catalog = product_catalog
+
+    async def execute(self) -> WarmProductCacheOutput:
+        # O catálogo é pequeno e muda pouco, então baixá-lo inteiro de tempos
+        # em tempos mantém o products_cache fresco sem depender das requisições
+        products = await self.product_catalog.fetch_all()
+        await self.product_cache_repository.upsert_many(products)
+
+        logger.info("product_cache_warmed", warmed_products=len(products))
+        return WarmProductCacheOutput(warmed_products=len(products))
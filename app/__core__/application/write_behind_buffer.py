@@ -0,0 +1,81 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Dict, Generic, List, TypeVar
+
+from app.__core__.application.logger import logger
+from app.__core__.application.metrics import metrics
+from app.__core__.application.task_manager import TaskManager
+
+T = TypeVar("T")
+
+
+class WriteBehindBuffer(Generic[T]):
+    """Acumula escritas em memória e as persiste em lotes.
+
+    O lote é descarregado quando atinge `max_batch_size` itens ou a cada
+    `flush_interval` segundos, o que vier primeiro. Itens com a mesma chave
+    são mesclados, ficando só a versão mais recente.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush: Callable[[List[T]], Awaitable[None]],
+        key: Callable[[T], Hashable],
+        *,
+        max_batch_size: int,
+        flush_interval: float,
+    ) -> None:
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+
+        self._flush = flush
+        self._key = key
+        self._pending: Dict[Hashable, T] = {}
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def submit(self, item: T) -> None:
+        self._pending[self._key(item)] = item
+        metrics.set_gauge(f"{self.name}_write_buffer_pending", len(self._pending))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._wakeup.set()
+
+    def start(self, task_manager: TaskManager) -> None:
+        task_manager.create(self.run_forever(), name=f"{self.name}_write_buffer")
+
+    async def run_forever(self) -> None:
+        while True:
+            try:
+                async with asyncio.timeout(self.flush_interval):
+                    await self._wakeup.wait()
+            except TimeoutError:
+                pass
+
+            self._wakeup.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            if not self._pending:
+                return
+
+            batch = list(self._pending.values())
+            self._pending = {}
+            metrics.set_gauge(f"{self.name}_write_buffer_pending", 0)
+
+            try:
+                await self._flush(batch)
+                metrics.increment(f"{self.name}_write_buffer_flushes")
+                metrics.increment(f"{self.name}_write_buffer_items", len(batch))
+            except Exception:
+                # o buffer guarda apenas dados de cache, então perder um lote
+                # custa no máximo uma nova busca no catálogo
+                logger.exception(
+                    "write_buffer_flush_failed", buffer_name=self.name, items=len(batch)
+                )
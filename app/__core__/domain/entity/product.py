@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
@@ -41,6 +42,20 @@ class Product:
         if self.review is not None and not isinstance(self.review, Review):
             raise ValidationError("invalid_review_data_type")
 
+    def content_hash(self) -> str:
+        # Impressão digital só dos dados do catálogo (sem o fetched_at), com o
+        # preço e a nota na mesma precisão das colunas DECIMAL(10, 2)
+        content = "\x1f".join(
+            (
+                self.title,
+                self.image_url,
+                f"{self.price:.2f}",
+                f"{self.review.rate:.2f}" if self.review else "",
+                str(self.review.count) if self.review else "",
+            )
+        )
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
     @classmethod
     def to_domain(cls, raw_product: ProductCacheORM) -> Product:
         return cls(
@@ -67,6 +82,7 @@ class Product:
             price=self.price,
             review_rate=self.review.rate if self.review else None,
             review_count=self.review.count if self.review else None,
+            content_hash=self.content_hash(),
             fetched_at=self.fetched_at,
         )
 
@@ -5,3 +5,15 @@ class AuthenticationError(Exception): ...
 
 
 class RetryError(Exception): ...
+
+
+class RetryableError(Exception):
+    def __init__(self, message: str, retry_after: float | None = None) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimitError(Exception): ...
+
+
+class CircuitOpenError(Exception): ...
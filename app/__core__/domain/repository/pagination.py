@@ -1,10 +1,44 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+from typing import Optional
+
+from app.__core__.domain.exception.exception import ValidationError
 from app.__core__.domain.strict_record import strict_record
 
 
+@strict_record
+class Cursor:
+    # posição do último item de uma página; a próxima começa logo depois dele
+    favorited_at: datetime
+    product_id: int
+
+    def encode(self) -> str:
+        raw = f"{self.favorited_at.isoformat()}|{self.product_id}".encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    @classmethod
+    def decode(cls, value: str) -> Cursor:
+        try:
+            padded = value + "=" * (-len(value) % 4)
+            favorited_at, product_id = (
+                base64.urlsafe_b64decode(padded).decode().split("|")
+            )
+            return cls(
+                favorited_at=datetime.fromisoformat(favorited_at),
+                product_id=int(product_id),
+            )
+        except ValueError as exc:
+            raise ValidationError("invalid_cursor") from exc
+
+
 @strict_record
 class PaginationInput:
     page: int
     per_page: int
+    # com cursor, a página é buscada a partir dele e `page` é ignorado
+    cursor: Optional[Cursor] = None
 
 
 @strict_record
@@ -13,3 +47,4 @@ class PaginationOutput:
     per_page: int
     total_pages: int
     total_items: int
+    next_cursor: Optional[str] = None
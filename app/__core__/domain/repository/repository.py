@@ -1,15 +1,24 @@
 from abc import ABC, abstractmethod
-from typing import Generic, List, Optional, TypeVar
+from datetime import datetime
+from typing import Generic, List, Optional, Tuple, TypeVar
 
 from app.__core__.domain.entity.customer import Customer
 from app.__core__.domain.entity.product import Product
 from app.__core__.domain.repository.pagination import PaginationInput
+from app.__core__.domain.strict_record import strict_record
 from app.__core__.domain.value_object.customer_favorite_product import \
     CustomerFavoriteProduct
 
 T = TypeVar("T")
 
 
+@strict_record
+class CustomerFavoriteProductsPage:
+    # cada favorito da página com o produto do cache (None se não estiver lá)
+    items: List[Tuple[CustomerFavoriteProduct, Optional[Product]]]
+    total_items: int
+
+
 class IBaseRepository(Generic[T], ABC):
     @abstractmethod
     async def insert_one(self, entity: T) -> None: ...
@@ -42,8 +51,37 @@ class IProductCacheRepository(IBaseRepository[Product]):
     @abstractmethod
     async def refresh(self, entity: Product) -> None: ...
 
+    @abstractmethod
+    async def upsert_many(self, entities: List[Product]) -> None: ...
+
+    @abstractmethod
+    async def delete_unreferenced(
+        self, fetched_before: datetime, limit: int
+    ) -> Tuple[List[int], int]: ...
+
+
+class IProductNegativeCacheRepository(ABC):
+    @abstractmethod
+    async def contains(self, id: int) -> bool: ...
+
+    @abstractmethod
+    async def fetch_many(self, ids: List[int]) -> List[int]: ...
+
+    @abstractmethod
+    async def insert_many(self, ids: List[int]) -> None: ...
+
 
 class ICustomerFavoriteProductRepository(IBaseRepository[CustomerFavoriteProduct]):
+    # retorna False, sem erro, quando o produto já era favorito
+    @abstractmethod
+    async def insert_if_absent(self, entity: CustomerFavoriteProduct) -> bool: ...
+
+    # retorna os product_ids inseridos; os que já eram favoritos são ignorados
+    @abstractmethod
+    async def insert_many(
+        self, entities: List[CustomerFavoriteProduct]
+    ) -> List[int]: ...
+
     @abstractmethod
     async def fetch_one(
         self, customer_id: str, product_id: int
@@ -54,8 +92,23 @@ class ICustomerFavoriteProductRepository(IBaseRepository[CustomerFavoriteProduct
         self, customer_id: str, pagination: PaginationInput
     ) -> List[CustomerFavoriteProduct]: ...
 
+    @abstractmethod
+    async def fetch_page(
+        self, customer_id: str, pagination: PaginationInput
+    ) -> CustomerFavoriteProductsPage: ...
+
     @abstractmethod
     async def count_all(self, customer_id: str) -> int: ...
 
     @abstractmethod
     async def delete_one(self, customer_id: str, product_id: int) -> None: ...
+
+    # retorna False quando o produto não era favorito
+    @abstractmethod
+    async def delete_if_present(self, customer_id: str, product_id: int) -> bool: ...
+
+    # retorna os product_ids removidos; os que não eram favoritos são ignorados
+    @abstractmethod
+    async def delete_many(
+        self, customer_id: str, product_ids: List[int]
+    ) -> List[int]: ...
@@ -1,20 +1,41 @@
 import asyncio
 import sys
 from contextlib import asynccontextmanager
+from typing import List
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.middleware.httpsredirect import HTTPSRedirectMiddleware
 
+from app.__core__.application.circuit_breaker import CircuitBreaker
+from app.__core__.application.hot_key_tracker import HotKeyTracker
 from app.__core__.application.logger import logger
+from app.__core__.application.metrics import metrics
+from app.__core__.application.periodic_job import PeriodicJob
 from app.__core__.application.settings import get_settings
+from app.__core__.application.single_flight import SingleFlight
 from app.__core__.application.task_manager import TaskManager
-from app.infra.dependency import close_httpx_client
+from app.infra.dependency import (build_cache_invalidation_listener,
+                                  build_hot_product_refresher,
+                                  build_product_cache_sweeper,
+                                  build_product_cache_warmer,
+                                  build_product_cache_write_buffer,
+                                  build_product_catalog_hedge_policy,
+                                  build_product_catalog_limiter,
+                                  build_product_catalog_retry_policy,
+                                  build_product_catalog_snapshot,
+                                  build_product_l2_cache,
+                                  build_product_refresh_scheduler,
+                                  close_httpx_client,
+                                  dump_product_catalog_snapshot,
+                                  init_httpx_client)
 from app.infra.http.middleware.correlation_id import CorrelationIdMiddleware
 from app.infra.http.router import auth, customers, favorites
+from app.infra.memory.product_lru_cache import ProductLRUCache
 from app.infra.postgres.database import close_db, init_db
+from app.infra.security import require_api_key
 
 if sys.platform == "win32":
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
@@ -22,20 +43,96 @@ if sys.platform == "win32":
 settings = get_settings()
 
 
+def init_app_state(app: FastAPI) -> None:
+    # Objetos compartilhados por todas as requisições do processo (worker)
+    app.state.task_manager = TaskManager()
+    app.state.product_l1_cache = ProductLRUCache()
+    app.state.product_l2_cache = build_product_l2_cache()
+    app.state.product_single_flight = SingleFlight("product_catalog")
+    app.state.product_catalog_limiter = build_product_catalog_limiter()
+    app.state.product_catalog_retry_policy = build_product_catalog_retry_policy()
+    app.state.product_catalog_hedge_policy = build_product_catalog_hedge_policy()
+    app.state.product_catalog_snapshot = build_product_catalog_snapshot()
+    app.state.product_catalog_circuit_breaker = CircuitBreaker(
+        "product_catalog",
+        window_size=settings.PRODUCT_CATALOG_CIRCUIT_BREAKER_WINDOW_SIZE,
+        min_calls=settings.PRODUCT_CATALOG_CIRCUIT_BREAKER_MIN_CALLS,
+        error_rate_threshold=settings.PRODUCT_CATALOG_CIRCUIT_BREAKER_ERROR_RATE,
+        slow_call_threshold=settings.PRODUCT_CATALOG_CIRCUIT_BREAKER_SLOW_CALL_SECONDS,
+        slow_call_rate_threshold=settings.PRODUCT_CATALOG_CIRCUIT_BREAKER_SLOW_CALL_RATE,
+        cooldown=settings.PRODUCT_CATALOG_CIRCUIT_BREAKER_COOLDOWN_SECONDS,
+    )
+    app.state.product_refresh_scheduler = build_product_refresh_scheduler(app.state)
+    app.state.product_popularity = HotKeyTracker(
+        capacity=settings.PRODUCT_HOT_REFRESH_TOP_N
+    )
+    # o write-behind e os workers de refresh são ligados só no lifespan, pois
+    # usam as próprias sessões do banco
+    app.state.product_cache_write_buffer = None
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("app_startup_complete")
     await init_db()
-    app.state.task_manager = TaskManager()
+    await init_httpx_client()
+    init_app_state(app)
+
+    if settings.PRODUCT_CACHE_WRITE_BEHIND_ENABLED:
+        app.state.product_cache_write_buffer = build_product_cache_write_buffer()
+        app.state.product_cache_write_buffer.start(app.state.task_manager)
+    app.state.product_refresh_scheduler.start(app.state.task_manager)
+    if settings.CACHE_INVALIDATION_ENABLED:
+        build_cache_invalidation_listener(app.state).start(app.state.task_manager)
+
+    periodic_jobs: List[PeriodicJob] = []
+    if settings.PRODUCT_HOT_REFRESH_ENABLED:
+        periodic_jobs.append(build_hot_product_refresher(app.state))
+    if settings.PRODUCT_CACHE_WARMER_ENABLED:
+        periodic_jobs.append(build_product_cache_warmer(app.state))
+    if settings.PRODUCT_CACHE_GC_ENABLED:
+        periodic_jobs.append(build_product_cache_sweeper(app.state))
+    for job in periodic_jobs:
+        job.start(app.state.task_manager)
 
     yield
 
-    await close_db()
+    await app.state.task_manager.shutdown(settings.SHUTDOWN_DRAIN_TIMEOUT_SECONDS)
+    for job in periodic_jobs:
+        await job.stop()
+    if app.state.product_cache_write_buffer is not None:
+        await app.state.product_cache_write_buffer.flush()
+    if app.state.product_catalog_snapshot is not None:
+        app.state.product_catalog_snapshot.close()
+    if app.state.product_l2_cache is not None:
+        await app.state.product_l2_cache.close()
     await close_httpx_client()
-    await app.state.task_manager.shutdown()
+    await close_db()
     logger.info("app_shutdown_complete")
 
 
+async def run_command(command: str) -> None:
+    try:
+        match command:
+            case "warm-product-cache":
+                job = build_product_cache_warmer()
+                if not await job.run_once():
+                    logger.warning("product_cache_warmer_already_running")
+                await job.stop()
+            case "sweep-product-cache":
+                job = build_product_cache_sweeper()
+                if not await job.run_once():
+                    logger.warning("product_cache_sweeper_already_running")
+                await job.stop()
+            case "dump-catalog-snapshot":
+                await dump_product_catalog_snapshot()
+            case _:
+                logger.error("unknown_command", command=command)
+    finally:
+        await close_httpx_client()
+        await close_db()
+
+
 def bootstrap() -> FastAPI:
     app = FastAPI(
         title="aiqfome - Favorites API",
@@ -69,12 +166,19 @@ def bootstrap() -> FastAPI:
     async def health_check():
         return {"status": "healthy"}
 
+    @app.get("/metrics", dependencies=[Depends(require_api_key)])
+    async def metrics_snapshot():
+        return metrics.snapshot()
+
     return app
 
 
 app = bootstrap()
 
-if __name__ == "__main__":
+if __name__ == "__main__" and len(sys.argv) > 1:
+    asyncio.run(run_command(sys.argv[1]))
+
+elif __name__ == "__main__":
     port = settings.API_PORT
     reload = settings.ENV == "dev"
     uvicorn.run(
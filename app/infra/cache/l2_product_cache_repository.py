@@ -0,0 +1,90 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from app.__core__.application.logger import logger
+from app.__core__.application.metrics import metrics
+from app.__core__.domain.entity.product import Product
+from app.__core__.domain.repository.repository import IProductCacheRepository
+from app.infra.cache.product_l2_cache import IProductL2Cache
+
+
+class L2ProductCacheRepository(IProductCacheRepository):
+    """Camada compartilhada (L2) entre o L1 de cada worker e o Postgres.
+
+    Segue o mesmo esquema do L1: leituras tentam o L2 antes do repositório de
+    trás e escritas são replicadas nele. O L2 é só uma otimização, então
+    qualquer falha nele vira um miss e a requisição segue para o Postgres.
+    """
+
+    def __init__(self, repository: IProductCacheRepository, cache: IProductL2Cache):
+        self.repository = repository
+        self.cache = cache
+
+    async def insert_one(self, entity: Product) -> None:
+        await self.repository.insert_one(entity)
+        await self._set_many([entity])
+
+    async def fetch_one(self, id: int) -> Optional[Product]:
+        cached = await self._get_many([id])
+        if cached:
+            metrics.increment("product_l2_cache_hits")
+            return cached[0]
+
+        metrics.increment("product_l2_cache_misses")
+        product = await self.repository.fetch_one(id)
+        if product is not None:
+            await self._set_many([product])
+        return product
+
+    async def fetch_many(self, ids: List[int]) -> List[Product]:
+        products = await self._get_many(ids)
+        metrics.increment("product_l2_cache_hits", len(products))
+
+        found_ids = {product.id for product in products}
+        missing_ids = [id for id in ids if id not in found_ids]
+        if missing_ids:
+            metrics.increment("product_l2_cache_misses", len(missing_ids))
+            fetched_products = await self.repository.fetch_many(missing_ids)
+            await self._set_many(fetched_products)
+            products.extend(fetched_products)
+
+        return products
+
+    async def refresh(self, entity: Product) -> None:
+        await self.repository.refresh(entity)
+        await self._set_many([entity])
+
+    async def upsert_many(self, entities: List[Product]) -> None:
+        await self.repository.upsert_many(entities)
+        await self._set_many(entities)
+
+    async def delete_unreferenced(
+        self, fetched_before: datetime, limit: int
+    ) -> Tuple[List[int], int]:
+        deleted_ids, reclaimed_bytes = await self.repository.delete_unreferenced(
+            fetched_before, limit
+        )
+        # sem isso o L2 continuaria servindo o produto apagado até o TTL dele
+        if deleted_ids:
+            try:
+                await self.cache.delete_many(deleted_ids)
+            except Exception:
+                self._record_error("delete")
+        return deleted_ids, reclaimed_bytes
+
+    async def _get_many(self, ids: List[int]) -> List[Product]:
+        try:
+            return await self.cache.get_many(ids)
+        except Exception:
+            self._record_error("get")
+            return []
+
+    async def _set_many(self, products: List[Product]) -> None:
+        try:
+            await self.cache.set_many(products)
+        except Exception:
+            self._record_error("set")
+
+    def _record_error(self, operation: str) -> None:
+        logger.warning("product_l2_cache_failed", operation=operation, exc_info=True)
+        metrics.increment("product_l2_cache_errors")
@@ -0,0 +1,61 @@
+from typing import List, Optional
+
+from app.__core__.application.gateways.product_cache_tiers import \
+    IProductCacheTiers
+from app.__core__.application.logger import logger
+from app.__core__.application.metrics import metrics
+from app.__core__.domain.entity.product import Product
+from app.infra.cache.product_l2_cache import IProductL2Cache
+from app.infra.memory.product_lru_cache import ProductLRUCache
+
+
+class ProductCacheTiers(IProductCacheTiers):
+    """L1 e L2 na mesma ordem do `build_product_cache_repository`, sem o Postgres.
+
+    Como no `L2ProductCacheRepository`, uma falha no L2 vira um miss.
+    """
+
+    def __init__(self, l1_cache: ProductLRUCache, l2_cache: Optional[IProductL2Cache]):
+        self.l1_cache = l1_cache
+        self.l2_cache = l2_cache
+
+    async def get_many(self, ids: List[int]) -> List[Product]:
+        products: List[Product] = []
+        missing_ids: List[int] = []
+
+        for id in ids:
+            cached = self.l1_cache.get(id)
+            if cached is not None:
+                products.append(cached)
+            else:
+                missing_ids.append(id)
+
+        if missing_ids and self.l2_cache is not None:
+            try:
+                l2_products = await self.l2_cache.get_many(missing_ids)
+            except Exception:
+                self._record_error("get")
+                l2_products = []
+            metrics.increment("product_l2_cache_hits", len(l2_products))
+            metrics.increment(
+                "product_l2_cache_misses", len(missing_ids) - len(l2_products)
+            )
+            for product in l2_products:
+                self.l1_cache.put(product)
+            products.extend(l2_products)
+
+        return products
+
+    async def put_many(self, products: List[Product]) -> None:
+        for product in products:
+            self.l1_cache.put(product)
+
+        if products and self.l2_cache is not None:
+            try:
+                await self.l2_cache.set_many(products)
+            except Exception:
+                self._record_error("set")
+
+    def _record_error(self, operation: str) -> None:
+        logger.warning("product_l2_cache_failed", operation=operation, exc_info=True)
+        metrics.increment("product_l2_cache_errors")
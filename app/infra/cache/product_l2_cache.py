@@ -0,0 +1,59 @@
+import json
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from app.__core__.domain.entity.product import Product, Review
+
+
+class IProductL2Cache(ABC):
+    """Cache de produtos compartilhado entre os workers (L2).
+
+    Cada entrada expira sozinha quando o produto passa do hard TTL; o soft TTL
+    continua sendo decidido pelo `fetched_at`, que vai junto com o produto.
+    """
+
+    @abstractmethod
+    async def get_many(self, ids: List[int]) -> List[Product]: ...
+
+    @abstractmethod
+    async def set_many(self, products: List[Product]) -> None: ...
+
+    @abstractmethod
+    async def delete_many(self, ids: List[int]) -> None: ...
+
+    async def close(self) -> None:
+        return None
+
+
+def get_remaining_ttl(product: Product, hard_ttl: timedelta) -> float:
+    # mesmo cálculo de idade do L1, com o fetched_at em UTC
+    age = datetime.now(timezone.utc) - product.fetched_at.replace(tzinfo=timezone.utc)
+    return (hard_ttl - age).total_seconds()
+
+
+def encode_product(product: Product) -> bytes:
+    return json.dumps(
+        [
+            product.id,
+            product.title,
+            product.image_url,
+            product.price,
+            product.review.rate if product.review else None,
+            product.review.count if product.review else None,
+            product.fetched_at.isoformat(),
+        ],
+        separators=(",", ":"),
+    ).encode()
+
+
+def decode_product(content: bytes) -> Product:
+    id, title, image_url, price, rate, count, fetched_at = json.loads(content)
+    return Product(
+        id=id,
+        title=title,
+        image_url=image_url,
+        price=price,
+        review=Review(rate=rate, count=count) if count is not None else None,
+        fetched_at=datetime.fromisoformat(fetched_at),
+    )
@@ -1,13 +1,32 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, AsyncGenerator, Optional
+import struct
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import TYPE_CHECKING, AsyncGenerator, List, Optional
 
 from fastapi import Depends, Request
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
-
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from starlette.datastructures import State
+
+from app.__core__.application.adaptive_concurrency_limiter import \
+    AdaptiveConcurrencyLimiter
+from app.__core__.application.circuit_breaker import CircuitBreaker
+from app.__core__.application.hedge_policy import HedgePolicy
+from app.__core__.application.hot_key_tracker import HotKeyTracker
+from app.__core__.application.logger import logger
+from app.__core__.application.periodic_job import PeriodicJob
+from app.__core__.application.refresh_scheduler import RefreshScheduler
+from app.__core__.application.retry_policy import RetryBudget, RetryPolicy
 from app.__core__.application.settings import get_settings
-from app.__core__.application.task_manager import TaskManager
+from app.__core__.application.single_flight import SingleFlight
+from app.__core__.application.use_case.base_product_cache_use_case import (
+    ProductCacheRepositories, ProductCacheSession)
+from app.__core__.application.use_case.batch_favorite_products_use_case import \
+    BatchFavoriteProductsUseCase
+from app.__core__.application.use_case.batch_unfavorite_products_use_case import \
+    BatchUnfavoriteProductsUseCase
 from app.__core__.application.use_case.delete_customer_use_case import \
     DeleteCustomerUseCase
 from app.__core__.application.use_case.favorite_product_use_case import \
@@ -18,27 +37,62 @@ from app.__core__.application.use_case.list_customer_favorite_products_use_case
     ListCustomerFavoriteProductsUseCase
 from app.__core__.application.use_case.list_customers_use_case import \
     ListCustomersUseCase
+from app.__core__.application.use_case.refresh_hot_products_use_case import \
+    RefreshHotProductsUseCase
+from app.__core__.application.use_case.refresh_product_cache_use_case import (
+    RefreshProductCacheInput, RefreshProductCacheUseCase)
 from app.__core__.application.use_case.sign_in_use_case import SignInUseCase
 from app.__core__.application.use_case.sign_up_use_case import SignUpUseCase
+from app.__core__.application.use_case.sweep_product_cache_use_case import \
+    SweepProductCacheUseCase
 from app.__core__.application.use_case.unfavorite_product_use_case import \
     UnfavoriteProductUseCase
 from app.__core__.application.use_case.update_customer_use_case import \
     UpdateCustomerUseCase
+from app.__core__.application.use_case.warm_product_cache_use_case import \
+    WarmProductCacheUseCase
+from app.__core__.application.write_behind_buffer import WriteBehindBuffer
+from app.infra.cache.l2_product_cache_repository import \
+    L2ProductCacheRepository
+from app.infra.cache.product_cache_tiers import ProductCacheTiers
+from app.infra.cache.product_l2_cache import IProductL2Cache
 from app.infra.fakestore.fakestore_product_catalog import \
     FakeStoreProductCatalog
+from app.infra.fakestore.http_client import (build_product_catalog_client,
+                                             warm_up_client)
 from app.infra.jwt.jwt_service import JWTService
-from app.infra.postgres.database import AsyncSessionFactory
+from app.infra.memory.in_memory_product_l2_cache import InMemoryProductL2Cache
+from app.infra.memory.l1_product_cache_repository import \
+    L1ProductCacheRepository
+from app.infra.memory.product_lru_cache import ProductLRUCache
+from app.infra.postgres.advisory_lock import PostgresAdvisoryLock
+from app.infra.postgres.cache_invalidation import \
+    PostgresCacheInvalidationListener
+from app.infra.postgres.database import (AsyncSessionFactory,
+                                         CacheSessionFactory)
 from app.infra.postgres.repository.customer_favorite_product_repository import \
     PostgresCustomerFavoriteProductRepository
 from app.infra.postgres.repository.customer_repository import \
     PostgresCustomerRepository
 from app.infra.postgres.repository.product_cache_repository import \
     PostgresProductCacheRepository
+from app.infra.postgres.repository.product_negative_cache_repository import \
+    PostgresProductNegativeCacheRepository
+from app.infra.redis.redis_product_l2_cache import RedisProductL2Cache
+from app.infra.redis.resp_client import RespClient
+from app.infra.snapshot.snapshot_product_catalog import (
+    SnapshotProductCatalog, write_snapshot)
 
 if TYPE_CHECKING:
     from app.__core__.application.gateways.jwt_service import IJWTService
+    from app.__core__.application.gateways.product_cache_tiers import \
+        IProductCacheTiers
     from app.__core__.application.gateways.product_catalog import \
         IProductCatalog
+    from app.__core__.application.use_case.batch_favorite_products_use_case import \
+        IBatchFavoriteProductsUseCase
+    from app.__core__.application.use_case.batch_unfavorite_products_use_case import \
+        IBatchUnfavoriteProductsUseCase
     from app.__core__.application.use_case.delete_customer_use_case import \
         IDeleteCustomerUseCase
     from app.__core__.application.use_case.favorite_product_use_case import \
@@ -57,9 +111,10 @@ if TYPE_CHECKING:
         IUnfavoriteProductUseCase
     from app.__core__.application.use_case.update_customer_use_case import \
         IUpdateCustomerUseCase
+    from app.__core__.domain.entity.product import Product
     from app.__core__.domain.repository.repository import (
         ICustomerFavoriteProductRepository, ICustomerRepository,
-        IProductCacheRepository)
+        IProductCacheRepository, IProductNegativeCacheRepository)
 
 
 settings = get_settings()
@@ -70,13 +125,19 @@ client: Optional[AsyncClient] = None
 def get_httpx_client() -> AsyncClient:
     global client
     if client is None:
-        client = AsyncClient(
-            base_url=settings.PRODUCT_CATALOG_API_BASE_URL,
-            timeout=settings.PRODUCT_CATALOG_API_TIMEOUT_LIMIT,
-        )
+        client = build_product_catalog_client()
     return client
 
 
+async def init_httpx_client():
+    # no lifespan o cliente é criado já com conexões abertas, para que as
+    # primeiras requisições depois do deploy não paguem o handshake
+    warmed = await warm_up_client(
+        get_httpx_client(), settings.PRODUCT_CATALOG_API_WARM_CONNECTIONS
+    )
+    logger.info("http_client_warmed_up", connections=warmed)
+
+
 async def close_httpx_client():
     global client
     if client:
@@ -113,10 +174,119 @@ def get_sign_up_use_case(
     return SignUpUseCase(customer_repository)
 
 
+def get_product_catalog_circuit_breaker(request: Request) -> CircuitBreaker:
+    return request.app.state.product_catalog_circuit_breaker
+
+
+def build_product_catalog_limiter(
+    name: str = "product_catalog",
+) -> AdaptiveConcurrencyLimiter:
+    return AdaptiveConcurrencyLimiter(
+        name,
+        min_concurrency=settings.PRODUCT_CATALOG_API_MIN_CONCURRENCY,
+        max_concurrency=settings.PRODUCT_CATALOG_API_MAX_CONCURRENCY,
+        initial_concurrency=settings.PRODUCT_CATALOG_API_INITIAL_CONCURRENCY,
+        max_queue_size=settings.PRODUCT_CATALOG_API_MAX_QUEUE_SIZE,
+        queue_timeout=settings.PRODUCT_CATALOG_API_QUEUE_TIMEOUT,
+        latency_target=settings.PRODUCT_CATALOG_API_LATENCY_TARGET,
+        backoff_ratio=settings.PRODUCT_CATALOG_API_BACKOFF_RATIO,
+    )
+
+
+def get_product_catalog_limiter(request: Request) -> AdaptiveConcurrencyLimiter:
+    return request.app.state.product_catalog_limiter
+
+
+def build_product_catalog_retry_policy(name: str = "product_catalog") -> RetryPolicy:
+    return RetryPolicy(
+        name,
+        max_attempts=settings.PRODUCT_CATALOG_API_MAX_RETRIES,
+        base_delay=settings.PRODUCT_CATALOG_API_RETRY_BASE_DELAY,
+        max_delay=settings.PRODUCT_CATALOG_API_RETRY_MAX_DELAY,
+        budget=RetryBudget(
+            settings.PRODUCT_CATALOG_API_RETRY_BUDGET_RATIO,
+            settings.PRODUCT_CATALOG_API_RETRY_BUDGET_MIN_PER_SECOND,
+        ),
+    )
+
+
+def get_product_catalog_retry_policy(request: Request) -> RetryPolicy:
+    return request.app.state.product_catalog_retry_policy
+
+
+def build_product_catalog_hedge_policy() -> Optional[HedgePolicy]:
+    if not settings.PRODUCT_CATALOG_API_HEDGE_ENABLED:
+        return None
+    return HedgePolicy(
+        "product_catalog",
+        percentile=settings.PRODUCT_CATALOG_API_HEDGE_PERCENTILE,
+        min_delay=settings.PRODUCT_CATALOG_API_HEDGE_MIN_DELAY,
+        window_size=settings.PRODUCT_CATALOG_API_HEDGE_WINDOW_SIZE,
+        min_samples=settings.PRODUCT_CATALOG_API_HEDGE_MIN_SAMPLES,
+        budget=RetryBudget(
+            settings.PRODUCT_CATALOG_API_HEDGE_BUDGET_RATIO,
+            settings.PRODUCT_CATALOG_API_HEDGE_BUDGET_MIN_PER_SECOND,
+        ),
+    )
+
+
+def get_product_catalog_hedge_policy(request: Request) -> Optional[HedgePolicy]:
+    return request.app.state.product_catalog_hedge_policy
+
+
 def get_fake_store_product_catalog(
     client: AsyncClient = Depends(get_httpx_client),
+    limiter: AdaptiveConcurrencyLimiter = Depends(get_product_catalog_limiter),
+    retry_policy: RetryPolicy = Depends(get_product_catalog_retry_policy),
+    circuit_breaker: CircuitBreaker = Depends(get_product_catalog_circuit_breaker),
+    hedge_policy: Optional[HedgePolicy] = Depends(get_product_catalog_hedge_policy),
 ) -> IProductCatalog:
-    return FakeStoreProductCatalog(client)
+    return FakeStoreProductCatalog(
+        client, limiter, retry_policy, circuit_breaker, hedge_policy
+    )
+
+
+def build_product_catalog_snapshot() -> Optional[SnapshotProductCatalog]:
+    if settings.PRODUCT_CATALOG_BACKEND != "snapshot":
+        return None
+    # sem um snapshot legível a API sobe mesmo assim, falando com o catálogo
+    # de cima como no backend "fakestore"
+    try:
+        return SnapshotProductCatalog(
+            settings.PRODUCT_CATALOG_SNAPSHOT_PATH,
+            settings.PRODUCT_CATALOG_SNAPSHOT_RELOAD_SECONDS,
+        )
+    except (OSError, ValueError, struct.error):
+        logger.warning(
+            "product_catalog_snapshot_unavailable",
+            path=settings.PRODUCT_CATALOG_SNAPSHOT_PATH,
+            exc_info=True,
+        )
+        return None
+
+
+def build_product_catalog(state: State) -> IProductCatalog:
+    # fora de uma requisição (workers de refresh), com os objetos do processo
+    if state.product_catalog_snapshot is not None:
+        return state.product_catalog_snapshot
+    return FakeStoreProductCatalog(
+        get_httpx_client(),
+        state.product_catalog_limiter,
+        state.product_catalog_retry_policy,
+        state.product_catalog_circuit_breaker,
+        state.product_catalog_hedge_policy,
+    )
+
+
+def get_product_catalog(
+    request: Request,
+    fake_store_product_catalog: IProductCatalog = Depends(
+        get_fake_store_product_catalog
+    ),
+) -> IProductCatalog:
+    if request.app.state.product_catalog_snapshot is not None:
+        return request.app.state.product_catalog_snapshot
+    return fake_store_product_catalog
 
 
 def get_list_customers_use_case(
@@ -144,8 +314,16 @@ def get_delete_customer_use_case(
 
 
 # Favorites
-def get_task_manager(request: Request) -> TaskManager:
-    return request.app.state.task_manager
+def get_product_refresh_scheduler(request: Request) -> RefreshScheduler:
+    return request.app.state.product_refresh_scheduler
+
+
+def get_product_popularity(request: Request) -> HotKeyTracker:
+    return request.app.state.product_popularity
+
+
+def get_product_single_flight(request: Request) -> SingleFlight:
+    return request.app.state.product_single_flight
 
 
 def get_customer_favorite_product_repository(
@@ -154,10 +332,107 @@ def get_customer_favorite_product_repository(
     return PostgresCustomerFavoriteProductRepository(session)
 
 
+def get_product_l1_cache(request: Request) -> ProductLRUCache:
+    return request.app.state.product_l1_cache
+
+
+def get_product_cache_write_buffer(
+    request: Request,
+) -> Optional[WriteBehindBuffer[Product]]:
+    return request.app.state.product_cache_write_buffer
+
+
+def build_product_l2_cache() -> Optional[IProductL2Cache]:
+    hard_ttl = timedelta(minutes=settings.PRODUCT_CACHE_HARD_TTL_MINUTES)
+    match settings.PRODUCT_L2_CACHE_BACKEND:
+        case "redis":
+            return RedisProductL2Cache(
+                RespClient.from_url(
+                    settings.PRODUCT_L2_CACHE_REDIS_URL,
+                    timeout=settings.PRODUCT_L2_CACHE_TIMEOUT,
+                    pool_size=settings.PRODUCT_L2_CACHE_POOL_SIZE,
+                ),
+                hard_ttl,
+                key_prefix=settings.PRODUCT_L2_CACHE_KEY_PREFIX,
+            )
+        case "memory":
+            return InMemoryProductL2Cache(hard_ttl)
+        case _:
+            return None
+
+
+def get_product_l2_cache(request: Request) -> Optional[IProductL2Cache]:
+    return request.app.state.product_l2_cache
+
+
+def build_product_cache_repository(
+    session: AsyncSession,
+    write_buffer: Optional[WriteBehindBuffer[Product]],
+    l1_cache: ProductLRUCache,
+    l2_cache: Optional[IProductL2Cache],
+) -> IProductCacheRepository:
+    # L1 (do worker) -> L2 (compartilhado, opcional) -> Postgres
+    repository: IProductCacheRepository = PostgresProductCacheRepository(
+        session, write_buffer
+    )
+    if l2_cache is not None:
+        repository = L2ProductCacheRepository(repository, l2_cache)
+    return L1ProductCacheRepository(repository, l1_cache)
+
+
 def get_product_cache_repository(
     session: AsyncSession = Depends(get_async_session),
+    product_l1_cache: ProductLRUCache = Depends(get_product_l1_cache),
+    product_l2_cache: Optional[IProductL2Cache] = Depends(get_product_l2_cache),
+    write_buffer: Optional[WriteBehindBuffer[Product]] = Depends(
+        get_product_cache_write_buffer
+    ),
 ) -> IProductCacheRepository:
-    return PostgresProductCacheRepository(session)
+    return build_product_cache_repository(
+        session, write_buffer, product_l1_cache, product_l2_cache
+    )
+
+
+def get_product_cache_tiers(
+    product_l1_cache: ProductLRUCache = Depends(get_product_l1_cache),
+    product_l2_cache: Optional[IProductL2Cache] = Depends(get_product_l2_cache),
+) -> IProductCacheTiers:
+    return ProductCacheTiers(product_l1_cache, product_l2_cache)
+
+
+def get_product_negative_cache_repository(
+    session: AsyncSession = Depends(get_async_session),
+) -> IProductNegativeCacheRepository:
+    return PostgresProductNegativeCacheRepository(session)
+
+
+def build_product_cache_session(
+    state: State, session_factory: async_sessionmaker = CacheSessionFactory
+) -> ProductCacheSession:
+    # o fetch e a escrita compartilhados pelo single flight rodam em uma
+    # sessão própria, e não na de quem chegou primeiro (ver
+    # `BaseProductCacheUseCase._open_repositories`), e do pool do cache, já
+    # que a requisição continua segurando a conexão dela enquanto espera
+    @asynccontextmanager
+    async def open_product_cache_session() -> (
+        AsyncGenerator[ProductCacheRepositories, None]
+    ):
+        async with session_factory() as session:
+            yield (
+                build_product_cache_repository(
+                    session,
+                    state.product_cache_write_buffer,
+                    state.product_l1_cache,
+                    state.product_l2_cache,
+                ),
+                PostgresProductNegativeCacheRepository(session),
+            )
+
+    return open_product_cache_session
+
+
+def get_product_cache_session(request: Request) -> ProductCacheSession:
+    return build_product_cache_session(request.app.state)
 
 
 def get_favorite_product_use_case(
@@ -167,12 +442,20 @@ def get_favorite_product_use_case(
     product_cache_repository: IProductCacheRepository = Depends(
         get_product_cache_repository
     ),
-    product_catalog: IProductCatalog = Depends(get_fake_store_product_catalog),
+    product_negative_cache_repository: IProductNegativeCacheRepository = Depends(
+        get_product_negative_cache_repository
+    ),
+    product_catalog: IProductCatalog = Depends(get_product_catalog),
+    single_flight: SingleFlight = Depends(get_product_single_flight),
+    product_cache_session: ProductCacheSession = Depends(get_product_cache_session),
 ) -> IFavoriteProductUseCase:
     return FavoriteProductUseCase(
         customer_favorite_product_repository,
         product_cache_repository,
+        product_negative_cache_repository,
         product_catalog,
+        single_flight,
+        product_cache_session,
     )
 
 
@@ -183,14 +466,26 @@ def get_list_customer_favorite_products_use_case(
     product_cache_repository: IProductCacheRepository = Depends(
         get_product_cache_repository
     ),
-    product_catalog: IProductCatalog = Depends(get_fake_store_product_catalog),
-    task_manager: TaskManager = Depends(get_task_manager),
+    product_negative_cache_repository: IProductNegativeCacheRepository = Depends(
+        get_product_negative_cache_repository
+    ),
+    product_catalog: IProductCatalog = Depends(get_product_catalog),
+    single_flight: SingleFlight = Depends(get_product_single_flight),
+    refresh_scheduler: RefreshScheduler = Depends(get_product_refresh_scheduler),
+    product_popularity: HotKeyTracker = Depends(get_product_popularity),
+    product_cache_tiers: IProductCacheTiers = Depends(get_product_cache_tiers),
+    product_cache_session: ProductCacheSession = Depends(get_product_cache_session),
 ) -> IListCustomerFavoriteProductsUseCase:
     return ListCustomerFavoriteProductsUseCase(
         customer_favorite_product_repository,
         product_cache_repository,
+        product_negative_cache_repository,
         product_catalog,
-        task_manager,
+        single_flight,
+        refresh_scheduler,
+        product_popularity,
+        product_cache_tiers,
+        product_cache_session,
     )
 
 
@@ -200,3 +495,215 @@ def get_unfavorite_product_use_case(
     ),
 ) -> IUnfavoriteProductUseCase:
     return UnfavoriteProductUseCase(customer_favorite_product_repository)
+
+
+def get_batch_favorite_products_use_case(
+    customer_favorite_product_repository: ICustomerFavoriteProductRepository = Depends(
+        get_customer_favorite_product_repository
+    ),
+    product_cache_repository: IProductCacheRepository = Depends(
+        get_product_cache_repository
+    ),
+    product_negative_cache_repository: IProductNegativeCacheRepository = Depends(
+        get_product_negative_cache_repository
+    ),
+    product_catalog: IProductCatalog = Depends(get_product_catalog),
+    single_flight: SingleFlight = Depends(get_product_single_flight),
+    product_cache_session: ProductCacheSession = Depends(get_product_cache_session),
+) -> IBatchFavoriteProductsUseCase:
+    return BatchFavoriteProductsUseCase(
+        customer_favorite_product_repository,
+        product_cache_repository,
+        product_negative_cache_repository,
+        product_catalog,
+        single_flight,
+        product_cache_session,
+    )
+
+
+def get_batch_unfavorite_products_use_case(
+    customer_favorite_product_repository: ICustomerFavoriteProductRepository = Depends(
+        get_customer_favorite_product_repository
+    ),
+) -> IBatchUnfavoriteProductsUseCase:
+    return BatchUnfavoriteProductsUseCase(customer_favorite_product_repository)
+
+
+# Background jobs
+def build_psycopg_dsn() -> str:
+    # conexões dedicadas (listener, advisory locks) usam o psycopg direto,
+    # fora do pool do SQLAlchemy
+    return settings.DATABASE_URL.replace("+psycopg", "", 1)
+
+
+def build_standalone_fake_store_product_catalog() -> FakeStoreProductCatalog:
+    # comandos de linha de comando, que rodam sem o `app.state`, usam objetos
+    # próprios, com outro nome para não misturar as métricas com as da API
+    return FakeStoreProductCatalog(
+        get_httpx_client(),
+        build_product_catalog_limiter("product_catalog_cli"),
+        build_product_catalog_retry_policy("product_catalog_cli"),
+    )
+
+
+@asynccontextmanager
+async def open_product_cache_repository(
+    state: Optional[State],
+) -> AsyncGenerator[IProductCacheRepository, None]:
+    # dentro da API os jobs escrevem pelo L1/L2 do processo: o listener de
+    # invalidação ignora as mensagens do próprio processo, então o L1 deste
+    # worker precisa ser atualizado na escrita. Como comando não há L1, e as
+    # invalidações chegam a todos os workers da API, mas o L2 é compartilhado
+    # e o listener não mexe nele, então a escrita passa por ele também
+    async with AsyncSessionFactory() as session:
+        if state is not None:
+            yield build_product_cache_repository(
+                session, None, state.product_l1_cache, state.product_l2_cache
+            )
+            return
+
+        repository: IProductCacheRepository = PostgresProductCacheRepository(session)
+        l2_cache = build_product_l2_cache()
+        if l2_cache is None:
+            yield repository
+            return
+        try:
+            yield L2ProductCacheRepository(repository, l2_cache)
+        finally:
+            await l2_cache.close()
+
+
+async def warm_product_cache(state: Optional[State] = None) -> None:
+    async with open_product_cache_repository(state) as product_cache_repository:
+        if state is not None:
+            # dentro da API o warmer usa o limitador, o orçamento de retries e
+            # o circuit breaker do processo, como qualquer outra chamada ao
+            # catálogo
+            product_catalog = build_product_catalog(state)
+        else:
+            product_catalog = (
+                build_product_catalog_snapshot()
+                or build_standalone_fake_store_product_catalog()
+            )
+
+        use_case = WarmProductCacheUseCase(product_cache_repository, product_catalog)
+        await use_case.execute()
+
+
+async def dump_product_catalog_snapshot() -> None:
+    # o snapshot é sempre gerado a partir da API, nunca de outro snapshot
+    products = await build_standalone_fake_store_product_catalog().fetch_all()
+    dumped = write_snapshot(settings.PRODUCT_CATALOG_SNAPSHOT_PATH, products)
+    logger.info(
+        "product_catalog_snapshot_dumped",
+        path=settings.PRODUCT_CATALOG_SNAPSHOT_PATH,
+        products=dumped,
+    )
+
+
+def build_product_cache_warmer(state: Optional[State] = None) -> PeriodicJob:
+    return PeriodicJob(
+        "product_cache_warmer",
+        lambda: warm_product_cache(state),
+        period=settings.PRODUCT_CACHE_WARMER_PERIOD_SECONDS,
+        jitter=settings.PRODUCT_CACHE_WARMER_JITTER_SECONDS,
+        lock=PostgresAdvisoryLock("product_cache_warmer", build_psycopg_dsn()),
+    )
+
+
+async def sweep_product_cache(state: Optional[State] = None) -> None:
+    async with open_product_cache_repository(state) as product_cache_repository:
+        use_case = SweepProductCacheUseCase(product_cache_repository)
+        await use_case.execute()
+
+
+def build_product_cache_sweeper(state: Optional[State] = None) -> PeriodicJob:
+    return PeriodicJob(
+        "product_cache_sweeper",
+        lambda: sweep_product_cache(state),
+        period=settings.PRODUCT_CACHE_GC_PERIOD_SECONDS,
+        jitter=settings.PRODUCT_CACHE_GC_PERIOD_SECONDS / 10,
+        lock=PostgresAdvisoryLock("product_cache_sweeper", build_psycopg_dsn()),
+    )
+
+
+def build_cache_invalidation_listener(
+    state: State,
+) -> PostgresCacheInvalidationListener:
+    listener = PostgresCacheInvalidationListener(
+        build_psycopg_dsn(),
+        settings.CACHE_INVALIDATION_RECONNECT_SECONDS,
+    )
+
+    def evict_products(keys: Optional[List[str]]) -> None:
+        if keys is None:
+            state.product_l1_cache.clear()
+            return
+        for key in keys:
+            state.product_l1_cache.discard(int(key))
+
+    listener.subscribe("product", evict_products)
+    return listener
+
+
+def build_product_refresh_scheduler(state: State) -> RefreshScheduler:
+    # os workers rodam fora de qualquer requisição, então cada refresh abre a
+    # própria sessão e usa os objetos do processo guardados em `app.state`
+    async def refresh_product_cache(product_id: int) -> None:
+        async with AsyncSessionFactory() as session:
+            use_case = RefreshProductCacheUseCase(
+                build_product_cache_repository(
+                    session,
+                    state.product_cache_write_buffer,
+                    state.product_l1_cache,
+                    state.product_l2_cache,
+                ),
+                PostgresProductNegativeCacheRepository(session),
+                build_product_catalog(state),
+                state.product_single_flight,
+                build_product_cache_session(state),
+            )
+            await use_case.execute(RefreshProductCacheInput(product_id=product_id))
+
+    return RefreshScheduler(
+        "product",
+        refresh_product_cache,
+        workers=settings.PRODUCT_REFRESH_WORKERS,
+        max_queue_size=settings.PRODUCT_REFRESH_QUEUE_MAX_SIZE,
+    )
+
+
+def build_hot_product_refresher(state: State) -> PeriodicJob:
+    # a popularidade e a fila de refresh são do processo, então cada worker
+    # do uvicorn cuida dos próprios produtos quentes, sem lock distribuído
+    async def refresh_hot_products() -> None:
+        async with AsyncSessionFactory() as session:
+            use_case = RefreshHotProductsUseCase(
+                build_product_cache_repository(
+                    session, None, state.product_l1_cache, state.product_l2_cache
+                ),
+                state.product_popularity,
+                state.product_refresh_scheduler,
+            )
+            await use_case.execute()
+
+    return PeriodicJob(
+        "hot_product_refresher",
+        refresh_hot_products,
+        period=settings.PRODUCT_HOT_REFRESH_PERIOD_SECONDS,
+    )
+
+
+async def flush_product_cache_writes(products: List[Product]) -> None:
+    async with AsyncSessionFactory() as session:
+        await PostgresProductCacheRepository(session).upsert_many(products)
+
+
+def build_product_cache_write_buffer() -> WriteBehindBuffer[Product]:
+    return WriteBehindBuffer(
+        "product_cache",
+        flush_product_cache_writes,
+        key=lambda product: product.id,
+        max_batch_size=settings.PRODUCT_CACHE_WRITE_BEHIND_MAX_BATCH_SIZE,
+        flush_interval=settings.PRODUCT_CACHE_WRITE_BEHIND_FLUSH_INTERVAL_SECONDS,
+    )
@@ -1,22 +1,161 @@
-from typing import Optional
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import List, Optional, TypeVar
 
-from httpx import AsyncClient, TimeoutException
+from httpx import AsyncClient, Response, TimeoutException, TransportError
 
+from app.__core__.application.adaptive_concurrency_limiter import \
+    AdaptiveConcurrencyLimiter
+from app.__core__.application.circuit_breaker import CircuitBreaker
 from app.__core__.application.gateways.product_catalog import IProductCatalog
-from app.__core__.application.retry_with_backoff import retry_with_backoff
+from app.__core__.application.hedge_policy import HedgePolicy
+from app.__core__.application.retry_policy import RetryPolicy
 from app.__core__.application.settings import get_settings
 from app.__core__.domain.entity.product import Product
+from app.__core__.domain.exception.exception import RetryableError
+from app.infra.fakestore.product_decoder import (IProductDecoder,
+                                                 build_product_decoder)
 
 settings = get_settings()
 
+T = TypeVar("T")
+
+# respostas que indicam um problema passageiro do lado da API
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
 
 class FakeStoreProductCatalog(IProductCatalog):
-    MAX_RETRIES = settings.PRODUCT_CATALOG_API_MAX_RETRIES
+    BULK_FETCH_THRESHOLD = settings.PRODUCT_CATALOG_API_BULK_FETCH_THRESHOLD
 
-    def __init__(self, client: AsyncClient):
+    def __init__(
+        self,
+        client: AsyncClient,
+        limiter: AdaptiveConcurrencyLimiter,
+        retry_policy: RetryPolicy,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        decoder: Optional[IProductDecoder] = None,
+    ):
         self.client = client
+        # o limitador e a política de retry (com o seu orçamento) também são
+        # do processo, para valerem para todas as requisições e refreshes
+        self.limiter = limiter
+        self.retry_policy = retry_policy
+        # o circuit breaker é do processo (criado no lifespan); sem ele, as
+        # chamadas vão direto para a API (ex.: comandos de linha de comando)
+        self.circuit_breaker = circuit_breaker
+        # o hedge só vale para buscas individuais, que são as que seguram a
+        # página inteira no `asyncio.gather`; a listagem completa é uma só
+        self.hedge_policy = hedge_policy
+        self.decoder = decoder or build_product_decoder()
 
-    @retry_with_backoff(TimeoutException)
     async def fetch_one(self, id: int) -> Optional[Product]:
-        response = await self.client.get(f"/products/{id}")
-        return Product.from_api_to_domain(response.json())
+        if self.hedge_policy is None:
+            return await self._call(lambda: self._fetch_one(id))
+        # a cópia do hedge é uma tentativa como outra qualquer: pega o seu
+        # próprio slot do limitador e registra o seu resultado no breaker
+        return await self.retry_policy.execute(
+            lambda: self.hedge_policy.execute(
+                lambda: self._attempt(lambda: self._fetch_one(id))
+            )
+        )
+
+    async def fetch_many(self, ids: List[int]) -> List[Product]:
+        if not ids:
+            return []
+
+        # A fakestore não tem busca por vários ids, mas a listagem completa é
+        # pequena, então com muitos ids faltantes uma única chamada sai mais
+        # barato do que N chamadas individuais
+        if len(ids) >= self.BULK_FETCH_THRESHOLD:
+            wanted_ids = set(ids)
+            products = await self.fetch_all()
+            return [product for product in products if product.id in wanted_ids]
+
+        products = await asyncio.gather(*[self.fetch_one(id) for id in ids])
+        return [product for product in products if product is not None]
+
+    async def fetch_all(self) -> List[Product]:
+        return await self._call(self._fetch_all)
+
+    async def _call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        return await self.retry_policy.execute(lambda: self._attempt(fn))
+
+    async def _attempt(self, fn: Callable[[], Awaitable[T]]) -> T:
+        # o slot do limitador e o resultado no circuit breaker são por
+        # tentativa: a espera do backoff (ou do Retry-After) entre tentativas
+        # não segura slot nem conta como chamada lenta. Chamadas rejeitadas
+        # pelo limitador (fila cheia) não chegam ao circuit breaker, já que
+        # não dizem nada sobre a saúde da API
+        async with self.limiter:
+            if self.circuit_breaker is None:
+                return await fn()
+            return await self.circuit_breaker.call(fn)
+
+    @asynccontextmanager
+    async def _get(self, path: str) -> AsyncIterator[Response]:
+        # a resposta é aberta em modo stream, para que o corpo possa ser lido
+        # aos poucos; cada tentativa alimenta o limitador adaptativo
+        started_at = time.monotonic()
+        try:
+            async with self.client.stream("GET", path) as response:
+                self._check_status(response)
+                yield response
+        except TimeoutException as exc:
+            self.limiter.on_overload()
+            raise RetryableError("product_catalog_timeout") from exc
+        except TransportError as exc:
+            raise RetryableError("product_catalog_connection_error") from exc
+
+        self.limiter.on_success(time.monotonic() - started_at)
+
+    def _check_status(self, response: Response) -> None:
+        if response.status_code in RETRYABLE_STATUS_CODES:
+            if response.status_code == 429:
+                self.limiter.on_overload()
+            raise RetryableError(
+                f"product_catalog_status_{response.status_code}",
+                retry_after=self._parse_retry_after(response),
+            )
+
+        if response.status_code != 404:
+            response.raise_for_status()
+
+    async def _fetch_one(self, id: int) -> Optional[Product]:
+        async with self._get(f"/products/{id}") as response:
+            content = await response.aread()
+        # a fakestore responde 200 com corpo vazio para ids que não existem
+        if response.status_code == 404 or not content:
+            return None
+        return self.decoder.decode_one(content)
+
+    async def _fetch_all(self) -> List[Product]:
+        # os produtos são decodificados conforme os bytes chegam, sem guardar
+        # o corpo inteiro nem uma lista de dicts intermediária
+        async with self._get("/products") as response:
+            return [
+                product
+                async for product in self.decoder.decode_many(response.aiter_bytes())
+            ]
+
+    @staticmethod
+    def _parse_retry_after(response: Response) -> Optional[float]:
+        # o Retry-After pode vir em segundos ou como data HTTP
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        if value.isdigit():
+            return float(value)
+        try:
+            retry_at = parsedate_to_datetime(value)
+            # com o fuso "-0000" a data vem sem tzinfo, mas continua em UTC
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, delay)
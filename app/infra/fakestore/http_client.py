@@ -0,0 +1,135 @@
+import asyncio
+import importlib.util
+from collections.abc import AsyncIterator, Callable
+
+from httpx import (AsyncBaseTransport, AsyncByteStream, AsyncClient,
+                   AsyncHTTPTransport, Limits, Request, Response, Timeout)
+
+from app.__core__.application.logger import logger
+from app.__core__.application.metrics import metrics
+from app.__core__.application.settings import get_settings
+
+settings = get_settings()
+
+
+class _ReleaseOnCloseStream(AsyncByteStream):
+    # a conexão só volta para o pool quando o corpo termina de ser lido (ou é
+    # descartado), não quando chegam os headers
+    def __init__(self, stream: AsyncByteStream, release: Callable[[], None]):
+        self.stream = stream
+        self.release = release
+        self._closed = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self.stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self.stream.aclose()
+        finally:
+            self.release()
+
+
+class PoolMetricsTransport(AsyncBaseTransport):
+    """Transport que publica a ocupação do pool de conexões do cliente.
+
+    O httpx não expõe o estado do pool, então contamos as requisições em
+    andamento: cada uma ocupa uma conexão, e a utilização é essa contagem
+    dividida pelo `max_connections`.
+    """
+
+    def __init__(self, transport: AsyncBaseTransport, name: str, max_connections: int):
+        self.transport = transport
+        self.name = name
+        self.max_connections = max_connections
+        self._in_flight = 0
+
+    async def handle_async_request(self, request: Request) -> Response:
+        self._in_flight += 1
+        self._publish()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            self._release()
+            raise
+
+        # com o corpo em streaming a conexão continua ocupada depois dos
+        # headers; a contagem só cai quando o stream da resposta é fechado
+        if response.is_closed:
+            self._release()
+        else:
+            response.stream = _ReleaseOnCloseStream(response.stream, self._release)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._publish()
+
+    def _publish(self) -> None:
+        metrics.set_gauge(f"{self.name}_http_pool_in_use", self._in_flight)
+        metrics.set_gauge(
+            f"{self.name}_http_pool_utilization",
+            round(self._in_flight / self.max_connections, 3),
+        )
+
+
+def is_http2_available() -> bool:
+    # HTTP/2 no httpx depende do pacote opcional `h2` (httpx[http2])
+    return importlib.util.find_spec("h2") is not None
+
+
+def build_product_catalog_client() -> AsyncClient:
+    http2 = settings.PRODUCT_CATALOG_API_HTTP2
+    if http2 and not is_http2_available():
+        logger.warning("http2_unavailable_falling_back_to_http1")
+        http2 = False
+
+    limits = Limits(
+        max_connections=settings.PRODUCT_CATALOG_API_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.PRODUCT_CATALOG_API_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.PRODUCT_CATALOG_API_KEEPALIVE_EXPIRY,
+    )
+    transport = PoolMetricsTransport(
+        AsyncHTTPTransport(limits=limits, http2=http2),
+        "product_catalog",
+        max_connections=settings.PRODUCT_CATALOG_API_MAX_CONNECTIONS,
+    )
+
+    return AsyncClient(
+        base_url=settings.PRODUCT_CATALOG_API_BASE_URL,
+        transport=transport,
+        timeout=Timeout(
+            settings.PRODUCT_CATALOG_API_TIMEOUT_LIMIT,
+            connect=settings.PRODUCT_CATALOG_API_CONNECT_TIMEOUT,
+            read=settings.PRODUCT_CATALOG_API_READ_TIMEOUT,
+        ),
+    )
+
+
+async def warm_up_client(client: AsyncClient, connections: int) -> int:
+    """Abre `connections` conexões com requisições simultâneas.
+
+    Como as requisições são concorrentes, cada uma precisa da sua própria
+    conexão; ao terminarem, elas voltam para o pool como keep-alive e as
+    primeiras requisições reais não pagam o handshake TCP/TLS.
+    """
+    if connections <= 0:
+        return 0
+
+    results = await asyncio.gather(
+        *[client.head("/") for _ in range(connections)], return_exceptions=True
+    )
+
+    warmed = sum(1 for result in results if isinstance(result, Response))
+    if warmed < connections:
+        logger.warning(
+            "http_client_warm_up_incomplete", warmed=warmed, requested=connections
+        )
+    return warmed
@@ -0,0 +1,136 @@
+import json
+import re
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from typing import List, Optional
+
+from app.__core__.domain.entity.product import Product, Review
+
+try:
+    import msgspec
+except ImportError:  # dependência opcional
+    msgspec = None
+
+# caracteres que mudam o estado do parser; todo o resto é pulado pela regex
+_STRUCTURAL_CHARS = re.compile(rb'["\\{}\[\]]')
+_QUOTE, _BACKSLASH = ord('"'), ord("\\")
+_OPENERS, _CLOSERS = frozenset(b"{["), frozenset(b"}]")
+
+
+class JsonArrayStream:
+    """Separa os elementos de um array JSON de objetos conforme os bytes chegam.
+
+    Só acompanha aspas, escapes e a profundidade de chaves/colchetes, sem
+    decodificar nada: cada elemento completo sai como bytes para o decoder, e
+    o buffer guarda no máximo o elemento que ainda está chegando.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._start: Optional[int] = None
+
+    @property
+    def complete(self) -> bool:
+        return self._depth == 0 and self._start is None
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        self._buffer += chunk
+        items: List[bytes] = []
+
+        pos = self._pos
+        while match := _STRUCTURAL_CHARS.search(self._buffer, pos):
+            idx = match.start()
+            char = self._buffer[idx]
+
+            if self._in_string:
+                if char == _BACKSLASH:
+                    if idx + 1 >= len(self._buffer):
+                        # o caractere escapado ainda não chegou
+                        pos = idx
+                        break
+                    pos = idx + 2
+                    continue
+                self._in_string = char != _QUOTE
+            elif char == _QUOTE:
+                self._in_string = True
+            elif char in _OPENERS:
+                if self._depth == 1:
+                    self._start = idx
+                self._depth += 1
+            elif char in _CLOSERS:
+                self._depth -= 1
+                if self._depth == 1 and self._start is not None:
+                    items.append(bytes(self._buffer[self._start : idx + 1]))
+                    self._start = None
+            pos = idx + 1
+        else:
+            pos = len(self._buffer)
+
+        # descarta o que já foi consumido, mantendo o elemento incompleto
+        consumed = pos if self._start is None else self._start
+        del self._buffer[:consumed]
+        self._pos = pos - consumed
+        if self._start is not None:
+            self._start = 0
+        return items
+
+
+class IProductDecoder(ABC):
+    @abstractmethod
+    def decode_one(self, content: bytes) -> Product: ...
+
+    async def decode_many(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[Product]:
+        stream = JsonArrayStream()
+        async for chunk in chunks:
+            for item in stream.feed(chunk):
+                yield self.decode_one(item)
+
+        if not stream.complete:
+            raise ValueError("incomplete_json_array")
+
+
+class StdlibProductDecoder(IProductDecoder):
+    def decode_one(self, content: bytes) -> Product:
+        return Product.from_api_to_domain(json.loads(content))
+
+
+class MsgspecProductDecoder(IProductDecoder):
+    """Decodifica direto para structs tipadas, sem passar por dicts."""
+
+    def __init__(self) -> None:
+        rating = msgspec.defstruct("ApiRating", [("rate", float), ("count", int)])
+        product = msgspec.defstruct(
+            "ApiProduct",
+            [
+                ("id", int),
+                ("title", str),
+                ("image", str),
+                ("price", float),
+                ("rating", Optional[rating], None),
+            ],
+        )
+        self._decoder = msgspec.json.Decoder(product)
+
+    def decode_one(self, content: bytes) -> Product:
+        raw = self._decoder.decode(content)
+        return Product(
+            id=raw.id,
+            title=raw.title,
+            image_url=raw.image,
+            price=raw.price,
+            review=(
+                Review(rate=raw.rating.rate, count=raw.rating.count)
+                if raw.rating
+                else None
+            ),
+        )
+
+
+def build_product_decoder() -> IProductDecoder:
+    # o msgspec é bem mais rápido, mas é opcional; sem ele fica o json da stdlib
+    if msgspec is not None:
+        return MsgspecProductDecoder()
+    return StdlibProductDecoder()
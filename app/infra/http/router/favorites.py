@@ -1,7 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 
 from app.__core__.application.logger import logger
 from app.__core__.application.settings import get_settings
+from app.__core__.application.use_case.batch_favorite_products_use_case import (
+    BatchFavoriteProductsInput, BatchFavoriteProductsOutput,
+    IBatchFavoriteProductsUseCase)
+from app.__core__.application.use_case.batch_unfavorite_products_use_case import (
+    BatchUnfavoriteProductsInput, BatchUnfavoriteProductsOutput,
+    IBatchUnfavoriteProductsUseCase)
 from app.__core__.application.use_case.favorite_product_use_case import (
     FavoriteProductInput, IFavoriteProductUseCase)
 from app.__core__.application.use_case.list_customer_favorite_products_use_case import (
@@ -10,8 +18,12 @@ from app.__core__.application.use_case.list_customer_favorite_products_use_case
 from app.__core__.application.use_case.unfavorite_product_use_case import (
     IUnfavoriteProductUseCase, UnfavoriteProductInput)
 from app.__core__.domain.entity.customer import Customer
-from app.__core__.domain.exception.exception import ValidationError
-from app.infra.dependency import (get_favorite_product_use_case,
+from app.__core__.domain.exception.exception import (CircuitOpenError,
+                                                     ConcurrencyLimitError,
+                                                     ValidationError)
+from app.infra.dependency import (get_batch_favorite_products_use_case,
+                                  get_batch_unfavorite_products_use_case,
+                                  get_favorite_product_use_case,
                                   get_list_customer_favorite_products_use_case,
                                   get_unfavorite_product_use_case)
 from app.infra.security import get_current_customer_by_token
@@ -20,6 +32,66 @@ router = APIRouter()
 settings = get_settings()
 
 
+# o caminho começa sem barra para ficar colado ao prefixo do router:
+# `/customers/{customer_id}/favorites:batch`
+@router.post(":batch", response_model=BatchFavoriteProductsOutput, status_code=200)
+async def batch_favorite_products(
+    customer_id: str,
+    product_ids: List[int] = Body(
+        ..., embed=True, min_length=1, max_length=settings.FAVORITES_BATCH_MAX_SIZE
+    ),
+    customer: Customer = Depends(get_current_customer_by_token),
+    batch_favorite_products_use_case: IBatchFavoriteProductsUseCase = Depends(
+        get_batch_favorite_products_use_case
+    ),
+):
+    if customer_id != customer.str_id:
+        raise HTTPException(status_code=403, detail="forbidden")
+
+    try:
+        input_dto = BatchFavoriteProductsInput(
+            customer_id=customer_id, product_ids=product_ids
+        )
+        return await batch_favorite_products_use_case.execute(input_dto)
+
+    except ConcurrencyLimitError:
+        logger.warning("batch_favorite_products_overloaded")
+        raise HTTPException(status_code=503, detail="product_catalog_overloaded")
+
+    except CircuitOpenError:
+        logger.warning("batch_favorite_products_catalog_unavailable")
+        raise HTTPException(status_code=503, detail="product_catalog_unavailable")
+
+    except Exception:
+        logger.exception("batch_favorite_products_failed")
+        raise HTTPException(status_code=500)
+
+
+@router.delete(":batch", response_model=BatchUnfavoriteProductsOutput, status_code=200)
+async def batch_unfavorite_products(
+    customer_id: str,
+    product_ids: List[int] = Body(
+        ..., embed=True, min_length=1, max_length=settings.FAVORITES_BATCH_MAX_SIZE
+    ),
+    customer: Customer = Depends(get_current_customer_by_token),
+    batch_unfavorite_products_use_case: IBatchUnfavoriteProductsUseCase = Depends(
+        get_batch_unfavorite_products_use_case
+    ),
+):
+    if customer_id != customer.str_id:
+        raise HTTPException(status_code=403, detail="forbidden")
+
+    try:
+        input_dto = BatchUnfavoriteProductsInput(
+            customer_id=customer_id, product_ids=product_ids
+        )
+        return await batch_unfavorite_products_use_case.execute(input_dto)
+
+    except Exception:
+        logger.exception("batch_unfavorite_products_failed")
+        raise HTTPException(status_code=500)
+
+
 @router.post("/{product_id}", status_code=201)
 async def favorite_product(
     customer_id: str,
@@ -45,6 +117,14 @@ async def favorite_product(
             case _:
                 raise HTTPException(status_code=400, detail=str(exc))
 
+    except ConcurrencyLimitError:
+        logger.warning("favorite_product_overloaded")
+        raise HTTPException(status_code=503, detail="product_catalog_overloaded")
+
+    except CircuitOpenError:
+        logger.warning("favorite_product_catalog_unavailable")
+        raise HTTPException(status_code=503, detail="product_catalog_unavailable")
+
     except Exception:
         logger.exception("favorite_product_failed")
         raise HTTPException(status_code=500)
@@ -55,6 +135,7 @@ async def list_customer_favorite_products(
     customer_id: str,
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=settings.PAGINATION_PER_PAGE_LIMIT),
+    cursor: Optional[str] = Query(None),
     customer: Customer = Depends(get_current_customer_by_token),
     list_customer_favorite_products_use_case: IListCustomerFavoriteProductsUseCase = Depends(
         get_list_customer_favorite_products_use_case
@@ -65,10 +146,24 @@ async def list_customer_favorite_products(
 
     try:
         input_dto = ListCustomerFavoriteProductsInput(
-            customer_id=customer_id, page=page, per_page=per_page
+            customer_id=customer_id, page=page, per_page=per_page, cursor=cursor
         )
         return await list_customer_favorite_products_use_case.execute(input_dto)
 
+    except ValidationError as exc:
+        if str(exc) != "invalid_cursor":
+            logger.exception("list_customer_favorite_products_failed")
+            raise HTTPException(status_code=500)
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    except ConcurrencyLimitError:
+        logger.warning("list_customer_favorite_products_overloaded")
+        raise HTTPException(status_code=503, detail="product_catalog_overloaded")
+
+    except CircuitOpenError:
+        logger.warning("list_customer_favorite_products_catalog_unavailable")
+        raise HTTPException(status_code=503, detail="product_catalog_unavailable")
+
     except Exception:
         logger.exception("list_customer_favorite_products_failed")
         raise HTTPException(status_code=500)
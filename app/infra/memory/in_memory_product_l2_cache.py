@@ -0,0 +1,53 @@
+import time
+from collections.abc import Callable
+from datetime import timedelta
+from typing import Dict, List, Tuple
+
+from app.__core__.domain.entity.product import Product
+from app.infra.cache.product_l2_cache import (IProductL2Cache, decode_product,
+                                              encode_product,
+                                              get_remaining_ttl)
+
+
+class InMemoryProductL2Cache(IProductL2Cache):
+    """L2 dentro do próprio processo, para testes e execuções com um worker.
+
+    Guarda os produtos serializados, como o Redis faria, para que os dois
+    caminhos passem pela mesma codificação.
+    """
+
+    def __init__(
+        self, hard_ttl: timedelta, *, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.hard_ttl = hard_ttl
+
+        self._clock = clock
+        self._entries: Dict[int, Tuple[bytes, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_many(self, ids: List[int]) -> List[Product]:
+        now = self._clock()
+        products: List[Product] = []
+        for id in ids:
+            entry = self._entries.get(id)
+            if entry is None:
+                continue
+            content, expires_at = entry
+            if expires_at <= now:
+                del self._entries[id]
+                continue
+            products.append(decode_product(content))
+        return products
+
+    async def set_many(self, products: List[Product]) -> None:
+        now = self._clock()
+        for product in products:
+            ttl = get_remaining_ttl(product, self.hard_ttl)
+            if ttl > 0:
+                self._entries[product.id] = (encode_product(product), now + ttl)
+
+    async def delete_many(self, ids: List[int]) -> None:
+        for id in ids:
+            self._entries.pop(id, None)
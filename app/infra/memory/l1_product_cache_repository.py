@@ -0,0 +1,71 @@
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from app.__core__.domain.entity.product import Product
+from app.__core__.domain.repository.repository import IProductCacheRepository
+from app.infra.memory.product_lru_cache import ProductLRUCache
+
+
+class L1ProductCacheRepository(IProductCacheRepository):
+    """Camada em memória (L1) na frente de outro IProductCacheRepository.
+
+    Leituras passam primeiro pelo LRU do processo e só vão ao repositório de
+    trás nos misses; escritas são feitas no repositório de trás e depois
+    replicadas no LRU (write-through).
+    """
+
+    def __init__(self, repository: IProductCacheRepository, cache: ProductLRUCache):
+        self.repository = repository
+        self.cache = cache
+
+    async def insert_one(self, entity: Product) -> None:
+        await self.repository.insert_one(entity)
+        self.cache.put(entity)
+
+    async def fetch_one(self, id: int) -> Optional[Product]:
+        cached = self.cache.get(id)
+        if cached is not None:
+            return cached
+
+        product = await self.repository.fetch_one(id)
+        if product is not None:
+            self.cache.put(product)
+        return product
+
+    async def fetch_many(self, ids: List[int]) -> List[Product]:
+        products: List[Product] = []
+        missing_ids: List[int] = []
+
+        for id in ids:
+            cached = self.cache.get(id)
+            if cached is not None:
+                products.append(cached)
+            else:
+                missing_ids.append(id)
+
+        if missing_ids:
+            fetched_products = await self.repository.fetch_many(missing_ids)
+            for product in fetched_products:
+                self.cache.put(product)
+            products.extend(fetched_products)
+
+        return products
+
+    async def refresh(self, entity: Product) -> None:
+        await self.repository.refresh(entity)
+        self.cache.put(entity)
+
+    async def upsert_many(self, entities: List[Product]) -> None:
+        await self.repository.upsert_many(entities)
+        for entity in entities:
+            self.cache.put(entity)
+
+    async def delete_unreferenced(
+        self, fetched_before: datetime, limit: int
+    ) -> Tuple[List[int], int]:
+        deleted_ids, reclaimed_bytes = await self.repository.delete_unreferenced(
+            fetched_before, limit
+        )
+        for id in deleted_ids:
+            self.cache.discard(id)
+        return deleted_ids, reclaimed_bytes
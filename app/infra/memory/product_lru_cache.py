@@ -0,0 +1,106 @@
+import sys
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from app.__core__.application.metrics import metrics
+from app.__core__.application.settings import get_settings
+from app.__core__.domain.entity.product import Product
+
+settings = get_settings()
+
+# Overhead aproximado de um Product (dataclass com slots + Review + datetime)
+PRODUCT_BASE_SIZE_BYTES = 256
+
+
+class ProductLRUCache:
+    def __init__(
+        self,
+        max_entries: int = settings.PRODUCT_L1_CACHE_MAX_ENTRIES,
+        max_bytes: int = settings.PRODUCT_L1_CACHE_MAX_BYTES,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hard_ttl = timedelta(minutes=settings.PRODUCT_CACHE_HARD_TTL_MINUTES)
+
+        self._entries: "OrderedDict[int, Tuple[Product, int]]" = OrderedDict()
+        self._size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size_bytes
+
+    def get(self, id: int) -> Optional[Product]:
+        entry = self._entries.get(id)
+        if entry is None:
+            self._record_miss()
+            return None
+
+        product, _ = entry
+        # Passou do hard TTL, o dado não pode mais ser servido nem pelo L1
+        if self._get_age(product) > self.hard_ttl:
+            self.discard(id)
+            self._record_miss()
+            return None
+
+        self._entries.move_to_end(id)
+        self._record_hit()
+        return product
+
+    def put(self, product: Product) -> None:
+        self.discard(product.id)
+
+        size = self._estimate_size(product)
+        if size > self.max_bytes:
+            return
+
+        self._entries[product.id] = (product, size)
+        self._size_bytes += size
+
+        while len(self._entries) > self.max_entries or self._size_bytes > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size_bytes -= evicted_size
+            metrics.increment("product_l1_cache_evictions")
+
+        self._publish_gauges()
+
+    def discard(self, id: int) -> None:
+        entry = self._entries.pop(id, None)
+        if entry is not None:
+            self._size_bytes -= entry[1]
+            self._publish_gauges()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size_bytes = 0
+        self._publish_gauges()
+
+    def _record_hit(self) -> None:
+        self.hits += 1
+        metrics.increment("product_l1_cache_hits")
+
+    def _record_miss(self) -> None:
+        self.misses += 1
+        metrics.increment("product_l1_cache_misses")
+
+    def _publish_gauges(self) -> None:
+        metrics.set_gauge("product_l1_cache_entries", len(self._entries))
+        metrics.set_gauge("product_l1_cache_size_bytes", self._size_bytes)
+
+    def _get_age(self, product: Product) -> timedelta:
+        return datetime.now(timezone.utc) - product.fetched_at.replace(
+            tzinfo=timezone.utc
+        )
+
+    @staticmethod
+    def _estimate_size(product: Product) -> int:
+        return (
+            PRODUCT_BASE_SIZE_BYTES
+            + sys.getsizeof(product.title)
+            + sys.getsizeof(product.image_url)
+        )
@@ -0,0 +1,75 @@
+import zlib
+from typing import Optional
+
+import psycopg
+
+from app.__core__.application.gateways.distributed_lock import IDistributedLock
+from app.__core__.application.logger import logger
+
+
+class PostgresAdvisoryLock(IDistributedLock):
+    """Lock distribuído baseado em `pg_try_advisory_lock`.
+
+    O lock é de sessão, então fica preso à conexão que o adquiriu: enquanto
+    ela estiver aberta o lock continua nosso, e se ela cair (ou o processo
+    morrer) o próprio PostgreSQL o libera para outro worker. A conexão é
+    dedicada, fora do pool do SQLAlchemy (como a do listener de invalidação),
+    para que segurar o lock não tire conexões das requisições.
+    """
+
+    def __init__(self, name: str, dsn: str) -> None:
+        self.name = name
+        self.dsn = dsn
+        self.key = zlib.crc32(name.encode())
+        self._connection: Optional[psycopg.AsyncConnection] = None
+
+    async def try_acquire(self) -> bool:
+        if self._connection is not None:
+            if await self._is_connection_alive():
+                return True
+            await self._drop_connection()
+
+        # autocommit: a conexão nunca fica "idle in transaction" segurando o lock
+        connection = await psycopg.AsyncConnection.connect(self.dsn, autocommit=True)
+        try:
+            cursor = await connection.execute(
+                "SELECT pg_try_advisory_lock(%s)", (self.key,)
+            )
+            acquired = bool((await cursor.fetchone())[0])
+        except Exception:
+            await connection.close()
+            raise
+
+        if not acquired:
+            await connection.close()
+            return False
+
+        logger.info("advisory_lock_acquired", lock_name=self.name)
+        self._connection = connection
+        return True
+
+    async def release(self) -> None:
+        if self._connection is None:
+            return
+
+        try:
+            await self._connection.execute("SELECT pg_advisory_unlock(%s)", (self.key,))
+        except Exception:
+            logger.exception("advisory_lock_release_failed", lock_name=self.name)
+        finally:
+            await self._drop_connection()
+
+    async def _is_connection_alive(self) -> bool:
+        try:
+            await self._connection.execute("SELECT 1")
+            return True
+        except Exception:
+            logger.warning("advisory_lock_connection_lost", lock_name=self.name)
+            return False
+
+    async def _drop_connection(self) -> None:
+        connection, self._connection = self._connection, None
+        try:
+            await connection.close()
+        except Exception:
+            logger.exception("advisory_lock_close_failed", lock_name=self.name)
@@ -0,0 +1,114 @@
+import asyncio
+import uuid
+from collections.abc import Callable, Iterable
+from typing import Dict, List, Optional
+
+import psycopg
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import text
+
+from app.__core__.application.logger import logger
+from app.__core__.application.metrics import metrics
+from app.__core__.application.settings import get_settings
+from app.__core__.application.task_manager import TaskManager
+
+settings = get_settings()
+
+CACHE_INVALIDATION_CHANNEL = "cache_invalidation"
+# o payload do NOTIFY tem limite de 8000 bytes; as chaves vão em lotes menores
+MAX_PAYLOAD_BYTES = 7000
+# identifica este processo, para que ele ignore as próprias mensagens
+PROCESS_ORIGIN = uuid.uuid4().hex[:12]
+
+# recebe as chaves invalidadas, ou None quando tudo deve ser descartado
+InvalidationHandler = Callable[[Optional[List[str]]], None]
+
+
+def encode_invalidations(kind: str, keys: Iterable[object]) -> List[str]:
+    prefix = f"{kind}|{PROCESS_ORIGIN}|"
+    payloads: List[str] = []
+    batch: List[str] = []
+    size = len(prefix)
+    for key in keys:
+        key = str(key)
+        if batch and size + len(key) + 1 > MAX_PAYLOAD_BYTES:
+            payloads.append(prefix + ",".join(batch))
+            batch, size = [], len(prefix)
+        batch.append(key)
+        size += len(key) + 1
+    if batch:
+        payloads.append(prefix + ",".join(batch))
+    return payloads
+
+
+async def publish_cache_invalidation(
+    session: AsyncSession, kind: str, keys: Iterable[object]
+) -> None:
+    """Publica a invalidação na mesma transação da escrita.
+
+    O PostgreSQL só entrega o NOTIFY no commit, então os outros workers nunca
+    descartam o cache antes de o dado novo estar visível, e um rollback não
+    invalida nada.
+    """
+    if not settings.CACHE_INVALIDATION_ENABLED:
+        return
+
+    for payload in encode_invalidations(kind, keys):
+        await session.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": CACHE_INVALIDATION_CHANNEL, "payload": payload},
+        )
+        metrics.increment("cache_invalidation_published")
+
+
+class PostgresCacheInvalidationListener:
+    """Escuta as invalidações dos outros processos em uma conexão dedicada.
+
+    Cada tipo de cache registra o seu handler com `subscribe`. Enquanto a
+    conexão estiver caída as mensagens se perdem, então a cada (re)conexão
+    todos os handlers recebem None e descartam o cache inteiro.
+    """
+
+    def __init__(self, dsn: str, reconnect_delay: float) -> None:
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+        self._handlers: Dict[str, InvalidationHandler] = {}
+
+    def subscribe(self, kind: str, handler: InvalidationHandler) -> None:
+        self._handlers[kind] = handler
+
+    def start(self, task_manager: TaskManager) -> None:
+        task_manager.create(self._run(), name="cache_invalidation_listener")
+
+    def dispatch(self, payload: str) -> None:
+        try:
+            kind, origin, keys = payload.split("|", 2)
+        except ValueError:
+            logger.warning("cache_invalidation_invalid_payload", payload=payload)
+            return
+
+        handler = self._handlers.get(kind)
+        # as escritas deste processo passam pelo L1 (inclusive as do warmer),
+        # que já é atualizado na própria escrita
+        if origin == PROCESS_ORIGIN or handler is None:
+            return
+        handler(keys.split(","))
+        metrics.increment("cache_invalidation_received")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with await psycopg.AsyncConnection.connect(
+                    self.dsn, autocommit=True
+                ) as connection:
+                    await connection.execute(f"LISTEN {CACHE_INVALIDATION_CHANNEL}")
+                    for handler in self._handlers.values():
+                        handler(None)
+                    logger.info("cache_invalidation_listener_connected")
+
+                    async for notify in connection.notifies():
+                        self.dispatch(notify.payload)
+            except Exception:
+                logger.exception("cache_invalidation_listener_failed")
+                metrics.increment("cache_invalidation_listener_reconnects")
+            await asyncio.sleep(self.reconnect_delay)
@@ -1,6 +1,7 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import (AsyncConnection, AsyncSession,
+                                    create_async_engine)
 from sqlalchemy.ext.asyncio.session import async_sessionmaker
-from sqlmodel import SQLModel
+from sqlmodel import SQLModel, text
 
 from app.__core__.application.settings import get_settings
 
@@ -22,11 +23,52 @@ AsyncSessionFactory = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Pool separado para o fetch e a escrita compartilhados pelo single flight,
+# que rodam enquanto a requisição ainda segura a conexão dela: no mesmo pool,
+# poucas requisições frias ao mesmo tempo bastariam para esgotá-lo, cada uma
+# esperando por uma segunda conexão que nenhuma outra libera
+cache_engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=False,
+    future=True,
+    pool_size=settings.DATABASE_CACHE_POOL_SIZE,
+    max_overflow=settings.DATABASE_CACHE_POOL_SIZE // 3,
+    pool_recycle=3600,
+)
+
+CacheSessionFactory = async_sessionmaker(
+    cache_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+# O `create_all` só cria tabelas que ainda não existem e nunca altera as
+# existentes; as mudanças de schema em tabelas já criadas vão aqui, sempre
+# idempotentes, e também no `development/init.sql`
+SCHEMA_MIGRATIONS = [
+    "ALTER TABLE products_cache ADD COLUMN IF NOT EXISTS content_hash VARCHAR(32)",
+    # usado pelo NOT EXISTS da limpeza do products_cache
+    "CREATE INDEX IF NOT EXISTS ix_customer_favorite_products_product_id "
+    "ON customer_favorite_products (product_id)",
+    # usado pela paginação por cursor da listagem de favoritos
+    "CREATE INDEX IF NOT EXISTS ix_customer_favorite_products_customer_id_favorited_at "
+    "ON customer_favorite_products (customer_id, favorited_at, product_id)",
+]
+
+
+async def apply_schema(conn: AsyncConnection) -> None:
+    await conn.run_sync(SQLModel.metadata.create_all)
+    for statement in SCHEMA_MIGRATIONS:
+        await conn.execute(text(statement))
+
 
 async def init_db() -> None:
     async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all)
+        await apply_schema(conn)
 
 
 async def close_db() -> None:
     await engine.dispose()
+    await cache_engine.dispose()
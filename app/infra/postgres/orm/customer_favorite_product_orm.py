@@ -2,15 +2,24 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import Index
 from sqlalchemy.orm import Mapped
 from sqlmodel import Field, Relationship, SQLModel
 
 
 class CustomerFavoriteProductORM(SQLModel, table=True):
     __tablename__ = "customer_favorite_products"
+    __table_args__ = (
+        Index(
+            "ix_customer_favorite_products_customer_id_favorited_at",
+            "customer_id",
+            "favorited_at",
+            "product_id",
+        ),
+    )
 
     customer_id: UUID = Field(foreign_key="customers.id", primary_key=True)
-    product_id: int = Field(primary_key=True)
+    product_id: int = Field(primary_key=True, index=True)
     favorited_at: datetime
 
     customer: Mapped[Optional["CustomerORM"]] = Relationship(
@@ -16,4 +16,5 @@ class ProductCacheORM(SQLModel, table=True):
     price: Decimal
     review_rate: Optional[Decimal]
     review_count: Optional[int]
+    content_hash: Optional[str] = Field(default=None, max_length=32)
     fetched_at: datetime
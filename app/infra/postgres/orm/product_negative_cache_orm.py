@@ -0,0 +1,10 @@
+from datetime import datetime
+
+from sqlmodel import Field, SQLModel
+
+
+class ProductNegativeCacheORM(SQLModel, table=True):
+    __tablename__ = "products_negative_cache"
+
+    id: int = Field(primary_key=True)
+    checked_at: datetime = Field(index=True)
@@ -1,15 +1,19 @@
 from typing import List, Optional
 
+from sqlalchemy import Select, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import delete, func, select
 
+from app.__core__.domain.entity.product import Product
 from app.__core__.domain.repository.pagination import PaginationInput
-from app.__core__.domain.repository.repository import \
-    ICustomerFavoriteProductRepository
+from app.__core__.domain.repository.repository import (
+    CustomerFavoriteProductsPage, ICustomerFavoriteProductRepository)
 from app.__core__.domain.value_object.customer_favorite_product import \
     CustomerFavoriteProduct
 from app.infra.postgres.orm.customer_favorite_product_orm import \
     CustomerFavoriteProductORM
+from app.infra.postgres.orm.product_cache_orm import ProductCacheORM
 
 
 class PostgresCustomerFavoriteProductRepository(ICustomerFavoriteProductRepository):
@@ -21,6 +25,38 @@ class PostgresCustomerFavoriteProductRepository(ICustomerFavoriteProductReposito
         self.session.add(customer_favorite_product)
         await self.session.commit()
 
+    async def insert_if_absent(self, entity: CustomerFavoriteProduct) -> bool:
+        # o ON CONFLICT decide se o favorito já existia no próprio INSERT, sem
+        # uma consulta antes e sem erro de chave quando duas requisições
+        # favoritam o mesmo produto ao mesmo tempo
+        return bool(await self.insert_many([entity]))
+
+    async def insert_many(self, entities: List[CustomerFavoriteProduct]) -> List[int]:
+        if not entities:
+            return []
+
+        # um único INSERT de várias linhas; os que já são favoritos são
+        # ignorados e o RETURNING traz só os product_ids de fato inseridos
+        query = (
+            insert(CustomerFavoriteProductORM)
+            .values(
+                [
+                    {
+                        "customer_id": entity.customer_id,
+                        "product_id": entity.product_id,
+                        "favorited_at": entity.favorited_at,
+                    }
+                    for entity in entities
+                ]
+            )
+            .on_conflict_do_nothing()
+            .returning(CustomerFavoriteProductORM.product_id)
+        )
+        result = await self.session.execute(query)
+        inserted_ids = list(result.scalars().all())
+        await self.session.commit()
+        return inserted_ids
+
     async def fetch_one(
         self, customer_id: str, product_id: int
     ) -> Optional[CustomerFavoriteProduct]:
@@ -38,14 +74,10 @@ class PostgresCustomerFavoriteProductRepository(ICustomerFavoriteProductReposito
     async def fetch_many(
         self, customer_id: str, pagination: PaginationInput
     ) -> List[CustomerFavoriteProduct]:
-        query = (
-            select(CustomerFavoriteProductORM)
-            .where(CustomerFavoriteProductORM.customer_id == customer_id)
-            .order_by(CustomerFavoriteProductORM.favorited_at.desc())
+        query = select(CustomerFavoriteProductORM).where(
+            CustomerFavoriteProductORM.customer_id == customer_id
         )
-        offset = (pagination.page - 1) * pagination.per_page
-        query = query.offset(offset)
-        query = query.limit(pagination.per_page)
+        query = self._paginate(query, pagination)
 
         result = await self.session.execute(query)
         customer_favorite_product_orms = result.scalars().all()
@@ -54,6 +86,71 @@ class PostgresCustomerFavoriteProductRepository(ICustomerFavoriteProductReposito
             for customer_favorite_product_orm in customer_favorite_product_orms
         ]
 
+    async def fetch_page(
+        self, customer_id: str, pagination: PaginationInput
+    ) -> CustomerFavoriteProductsPage:
+        # Uma única query: a página de favoritos, o produto de cada um no cache
+        # (LEFT JOIN) e o total de favoritos do cliente. O total vem de uma
+        # subquery e não de count(*) OVER(), que com cursor só contaria as
+        # linhas depois dele
+        total_items = (
+            select(func.count())
+            .select_from(CustomerFavoriteProductORM)
+            .where(CustomerFavoriteProductORM.customer_id == customer_id)
+            .correlate(None)
+            .scalar_subquery()
+        )
+        query = (
+            select(CustomerFavoriteProductORM, ProductCacheORM, total_items)
+            .outerjoin(
+                ProductCacheORM,
+                ProductCacheORM.id == CustomerFavoriteProductORM.product_id,
+            )
+            .where(CustomerFavoriteProductORM.customer_id == customer_id)
+        )
+        query = self._paginate(query, pagination)
+
+        result = await self.session.execute(query)
+        rows = result.all()
+        if not rows:
+            # página depois da última: não veio nenhuma linha para trazer o total
+            return CustomerFavoriteProductsPage(
+                items=[], total_items=await self.count_all(customer_id)
+            )
+
+        return CustomerFavoriteProductsPage(
+            items=[
+                (
+                    CustomerFavoriteProduct.to_domain(customer_favorite_product_orm),
+                    Product.to_domain(product_orm) if product_orm else None,
+                )
+                for customer_favorite_product_orm, product_orm, _ in rows
+            ],
+            total_items=rows[0][2],
+        )
+
+    @staticmethod
+    def _paginate(query: Select, pagination: PaginationInput) -> Select:
+        # o product_id desempata produtos favoritados no mesmo instante, e a
+        # ordenação bate com o índice (customer_id, favorited_at, product_id)
+        query = query.order_by(
+            CustomerFavoriteProductORM.favorited_at.desc(),
+            CustomerFavoriteProductORM.product_id.desc(),
+        )
+        if pagination.cursor is not None:
+            # keyset: o índice já começa na posição do cursor, sem descartar
+            # as linhas das páginas anteriores como o OFFSET faz
+            query = query.where(
+                tuple_(
+                    CustomerFavoriteProductORM.favorited_at,
+                    CustomerFavoriteProductORM.product_id,
+                )
+                < tuple_(pagination.cursor.favorited_at, pagination.cursor.product_id)
+            )
+        else:
+            query = query.offset((pagination.page - 1) * pagination.per_page)
+        return query.limit(pagination.per_page)
+
     async def count_all(self, customer_id: str) -> int:
         query = (
             select(func.count())
@@ -71,3 +168,22 @@ class PostgresCustomerFavoriteProductRepository(ICustomerFavoriteProductReposito
         )
         await self.session.execute(query)
         await self.session.commit()
+
+    async def delete_if_present(self, customer_id: str, product_id: int) -> bool:
+        # o RETURNING diz se havia o que remover, sem uma consulta antes
+        return bool(await self.delete_many(customer_id, [product_id]))
+
+    async def delete_many(self, customer_id: str, product_ids: List[int]) -> List[int]:
+        if not product_ids:
+            return []
+
+        query = (
+            delete(CustomerFavoriteProductORM)
+            .where(CustomerFavoriteProductORM.customer_id == customer_id)
+            .where(CustomerFavoriteProductORM.product_id.in_(product_ids))
+            .returning(CustomerFavoriteProductORM.product_id)
+        )
+        result = await self.session.execute(query)
+        deleted_ids = list(result.scalars().all())
+        await self.session.commit()
+        return deleted_ids
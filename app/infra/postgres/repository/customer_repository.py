@@ -6,6 +6,7 @@ from sqlmodel import delete, func, select, update
 from app.__core__.domain.entity.customer import Customer
 from app.__core__.domain.repository.pagination import PaginationInput
 from app.__core__.domain.repository.repository import ICustomerRepository
+from app.infra.postgres.cache_invalidation import publish_cache_invalidation
 from app.infra.postgres.orm.customer_orm import CustomerORM
 
 
@@ -55,9 +56,11 @@ class PostgresCustomerRepository(ICustomerRepository):
             .values(new_entity.to_orm().model_dump(exclude_unset=True))
         )
         await self.session.execute(query)
+        await publish_cache_invalidation(self.session, "customer", [new_entity.id])
         await self.session.commit()
 
     async def delete_one(self, id: str) -> None:
         query = delete(CustomerORM).where(CustomerORM.id == id)
         await self.session.execute(query)
+        await publish_cache_invalidation(self.session, "customer", [id])
         await self.session.commit()
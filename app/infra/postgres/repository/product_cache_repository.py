@@ -1,22 +1,39 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+from sqlalchemy import (DateTime, Integer, column, delete, exists, func,
+                        update, values)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlmodel import select, update
+from sqlmodel import select
 
+from app.__core__.application.metrics import metrics
+from app.__core__.application.write_behind_buffer import WriteBehindBuffer
 from app.__core__.domain.entity.product import Product
 from app.__core__.domain.repository.repository import IProductCacheRepository
+from app.infra.postgres.cache_invalidation import publish_cache_invalidation
+from app.infra.postgres.orm.customer_favorite_product_orm import \
+    CustomerFavoriteProductORM
 from app.infra.postgres.orm.product_cache_orm import ProductCacheORM
 
+# Limite de linhas por INSERT, para não estourar o limite de parâmetros
+# do PostgreSQL (65535) com o número de colunas da tabela
+UPSERT_BATCH_SIZE = 1000
+
 
 class PostgresProductCacheRepository(IProductCacheRepository):
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        write_buffer: Optional[WriteBehindBuffer[Product]] = None,
+    ):
         self.session = session
+        self.write_buffer = write_buffer
 
     async def insert_one(self, entity: Product) -> None:
-        product_cache = entity.to_orm()
-        self.session.add(product_cache)
-        await self.session.commit()
+        # upsert em vez de INSERT puro: dois workers inserindo o mesmo produto
+        # novo ao mesmo tempo não podem estourar IntegrityError na PK
+        await self.upsert_many([entity])
 
     async def fetch_one(self, id: int) -> Optional[Product]:
         query = select(ProductCacheORM).where(ProductCacheORM.id == id)
@@ -33,17 +50,114 @@ class PostgresProductCacheRepository(IProductCacheRepository):
         return [Product.to_domain(product_orm) for product_orm in product_orms]
 
     async def refresh(self, entity: Product) -> None:
+        if self.write_buffer is not None:
+            self.write_buffer.submit(entity)
+            return
+
+        await self.upsert_many([entity])
+
+    async def upsert_many(self, entities: List[Product]) -> None:
+        if not entities:
+            return
+
+        for start in range(0, len(entities), UPSERT_BATCH_SIZE):
+            batch = entities[start : start + UPSERT_BATCH_SIZE]
+            query = insert(ProductCacheORM).values(
+                [self._to_row(entity) for entity in batch]
+            )
+            # a linha só é reescrita quando o conteúdo mudou; o RETURNING traz
+            # os ids inseridos ou alterados, o resto veio igual do catálogo
+            query = query.on_conflict_do_update(
+                index_elements=[ProductCacheORM.id],
+                set_={
+                    "title": query.excluded.title,
+                    "image_url": query.excluded.image_url,
+                    "price": query.excluded.price,
+                    "review_rate": query.excluded.review_rate,
+                    "review_count": query.excluded.review_count,
+                    "content_hash": query.excluded.content_hash,
+                    "fetched_at": query.excluded.fetched_at,
+                },
+                where=ProductCacheORM.content_hash.is_distinct_from(
+                    query.excluded.content_hash
+                ),
+            ).returning(ProductCacheORM.id)
+            result = await self.session.execute(query)
+            changed_ids = set(result.scalars().all())
+
+            unchanged = [entity for entity in batch if entity.id not in changed_ids]
+            if unchanged:
+                await self._touch_many(unchanged)
+
+            metrics.increment("product_cache_refresh_changed", len(changed_ids))
+            metrics.increment("product_cache_refresh_unchanged", len(unchanged))
+
+        # mesmo os produtos que não mudaram ganharam um fetched_at novo, que os
+        # outros workers precisam ver para não acharem que o dado está velho
+        await publish_cache_invalidation(
+            self.session, "product", [entity.id for entity in entities]
+        )
+        await self.session.commit()
+
+    async def _touch_many(self, entities: List[Product]) -> None:
+        # um único UPDATE só do fetched_at para todo o lote, cada linha com o
+        # seu próprio fetched_at (UPDATE ... FROM VALUES): o TTL e o XFetch
+        # dependem da idade real de cada produto. Como a coluna não é
+        # indexada, o PostgreSQL consegue fazer HOT update
+        touched = values(
+            column("id", Integer), column("fetched_at", DateTime), name="touched"
+        ).data([(entity.id, entity.fetched_at) for entity in entities])
         query = (
             update(ProductCacheORM)
-            .where(ProductCacheORM.id == entity.id)
-            .values(
-                title=entity.title,
-                image_url=entity.image_url,
-                price=entity.price,
-                review_rate=entity.review.rate if entity.review else None,
-                review_count=entity.review.count if entity.review else None,
-                fetched_at=datetime.now(),
-            )
+            .where(ProductCacheORM.id == touched.c.id)
+            .values(fetched_at=touched.c.fetched_at)
         )
         await self.session.execute(query)
+
+    async def delete_unreferenced(
+        self, fetched_before: datetime, limit: int
+    ) -> Tuple[List[int], int]:
+        # SKIP LOCKED: linhas que alguém está atualizando ficam para a próxima
+        # rodada, em vez de o sweeper ficar esperando por elas. Se o produto for
+        # favoritado logo depois de apagado, a listagem só o busca de novo
+        doomed = (
+            select(ProductCacheORM.id)
+            .where(
+                ProductCacheORM.fetched_at < fetched_before,
+                ~exists().where(
+                    CustomerFavoriteProductORM.product_id == ProductCacheORM.id
+                ),
+            )
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("doomed")
+        )
+        query = (
+            delete(ProductCacheORM)
+            .where(ProductCacheORM.id.in_(select(doomed.c.id)))
+            .returning(
+                ProductCacheORM.id,
+                func.pg_column_size(ProductCacheORM.__table__.table_valued()),
+            )
+        )
+        result = await self.session.execute(query)
+        rows = result.all()
+        deleted_ids = [id for id, _ in rows]
+
+        # os outros workers descartam do L1 o que acabou de ser apagado
+        await publish_cache_invalidation(self.session, "product", deleted_ids)
         await self.session.commit()
+        return deleted_ids, sum(size for _, size in rows)
+
+    @staticmethod
+    def _to_row(entity: Product) -> dict:
+        return {
+            "id": entity.id,
+            "title": entity.title,
+            "image_url": entity.image_url,
+            "price": entity.price,
+            "review_rate": entity.review.rate if entity.review else None,
+            "review_count": entity.review.count if entity.review else None,
+            "content_hash": entity.content_hash(),
+            "fetched_at": entity.fetched_at,
+        }
@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import delete, or_, select
+
+from app.__core__.application.settings import get_settings
+from app.__core__.domain.repository.repository import \
+    IProductNegativeCacheRepository
+from app.infra.postgres.orm.product_negative_cache_orm import \
+    ProductNegativeCacheORM
+
+settings = get_settings()
+
+
+class PostgresProductNegativeCacheRepository(IProductNegativeCacheRepository):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.ttl = timedelta(minutes=settings.PRODUCT_NEGATIVE_CACHE_TTL_MINUTES)
+        self.max_entries = settings.PRODUCT_NEGATIVE_CACHE_MAX_ENTRIES
+
+    async def contains(self, id: int) -> bool:
+        return len(await self.fetch_many([id])) > 0
+
+    async def fetch_many(self, ids: List[int]) -> List[int]:
+        if not ids:
+            return []
+
+        query = (
+            select(ProductNegativeCacheORM.id)
+            .where(ProductNegativeCacheORM.id.in_(ids))
+            .where(ProductNegativeCacheORM.checked_at > self._expired_before())
+        )
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def insert_many(self, ids: List[int]) -> None:
+        if not ids:
+            return
+
+        now = datetime.now(timezone.utc)
+        query = insert(ProductNegativeCacheORM).values(
+            [{"id": id, "checked_at": now} for id in dict.fromkeys(ids)]
+        )
+        query = query.on_conflict_do_update(
+            index_elements=[ProductNegativeCacheORM.id],
+            set_={"checked_at": query.excluded.checked_at},
+        )
+        await self.session.execute(query)
+
+        # mantém a tabela limitada: remove o que já venceu e o que passar
+        # do tamanho máximo, começando pelos registros mais antigos
+        overflow = (
+            select(ProductNegativeCacheORM.id)
+            .order_by(ProductNegativeCacheORM.checked_at.desc())
+            .offset(self.max_entries)
+        )
+        await self.session.execute(
+            delete(ProductNegativeCacheORM).where(
+                or_(
+                    ProductNegativeCacheORM.checked_at <= self._expired_before(),
+                    ProductNegativeCacheORM.id.in_(overflow),
+                )
+            )
+        )
+        await self.session.commit()
+
+    def _expired_before(self) -> datetime:
+        return datetime.now(timezone.utc) - self.ttl
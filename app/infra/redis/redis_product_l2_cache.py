@@ -0,0 +1,55 @@
+import math
+from datetime import timedelta
+from typing import List
+
+from app.__core__.domain.entity.product import Product
+from app.infra.cache.product_l2_cache import (IProductL2Cache, decode_product,
+                                              encode_product,
+                                              get_remaining_ttl)
+from app.infra.redis.resp_client import Command, RespClient
+
+
+class RedisProductL2Cache(IProductL2Cache):
+    def __init__(
+        self, client: RespClient, hard_ttl: timedelta, key_prefix: str = "product:"
+    ) -> None:
+        self.client = client
+        self.hard_ttl = hard_ttl
+        self.key_prefix = key_prefix
+
+    async def get_many(self, ids: List[int]) -> List[Product]:
+        if not ids:
+            return []
+
+        # um único MGET para todos os ids, em vez de um GET por produto
+        contents = await self.client.execute("MGET", *[self._key(id) for id in ids])
+        return [decode_product(content) for content in contents if content is not None]
+
+    async def set_many(self, products: List[Product]) -> None:
+        commands: List[Command] = []
+        for product in products:
+            # a entrada expira junto com o hard TTL do produto
+            ttl_ms = math.floor(get_remaining_ttl(product, self.hard_ttl) * 1000)
+            if ttl_ms > 0:
+                commands.append(
+                    (
+                        "SET",
+                        self._key(product.id),
+                        encode_product(product),
+                        "PX",
+                        ttl_ms,
+                    )
+                )
+
+        if commands:
+            await self.client.pipeline(commands)
+
+    async def delete_many(self, ids: List[int]) -> None:
+        if ids:
+            await self.client.execute("DEL", *[self._key(id) for id in ids])
+
+    async def close(self) -> None:
+        await self.client.close()
+
+    def _key(self, id: int) -> str:
+        return f"{self.key_prefix}{id}"
@@ -0,0 +1,153 @@
+import asyncio
+from collections.abc import Sequence
+from typing import Any, List, Optional, Tuple
+from urllib.parse import urlparse
+
+Command = Sequence[str | bytes | int | float]
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class RespError(Exception): ...
+
+
+class RespClient:
+    """Cliente mínimo do protocolo do Redis (RESP2) com um pool pequeno de conexões.
+
+    Os comandos de uma chamada de `pipeline` são escritos de uma vez e as
+    respostas lidas em sequência, em um único round trip, sobre uma conexão
+    emprestada do pool. As conexões são abertas sob demanda, até `pool_size`,
+    e descartadas em qualquer erro, para que a próxima chamada comece de um
+    estado limpo. O `timeout` cobre a chamada inteira, inclusive a espera por
+    uma conexão livre.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        db: int = 0,
+        password: Optional[str] = None,
+        timeout: float,
+        pool_size: int = 4,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self.pool_size = pool_size
+
+        self._slots = asyncio.Semaphore(pool_size)
+        self._idle: List[Connection] = []
+
+    @classmethod
+    def from_url(cls, url: str, *, timeout: float, pool_size: int = 4) -> "RespClient":
+        parsed = urlparse(url)
+        return cls(
+            parsed.hostname or "localhost",
+            parsed.port or 6379,
+            db=int(parsed.path.lstrip("/") or 0),
+            password=parsed.password,
+            timeout=timeout,
+            pool_size=pool_size,
+        )
+
+    async def execute(self, *args: str | bytes | int | float) -> Any:
+        (reply,) = await self.pipeline([args])
+        if isinstance(reply, RespError):
+            raise reply
+        return reply
+
+    async def pipeline(self, commands: Sequence[Command]) -> List[Any]:
+        # erros de comando voltam como RespError na posição dele, sem derrubar
+        # o restante do pipeline
+        async with asyncio.timeout(self.timeout), self._slots:
+            connection = self._idle.pop() if self._idle else None
+            try:
+                if connection is None:
+                    connection = await self._connect()
+                reader, writer = connection
+                writer.write(b"".join(self._encode(command) for command in commands))
+                await writer.drain()
+                replies = [await self._read_reply(reader) for _ in commands]
+            except BaseException:
+                if connection is not None:
+                    await self._disconnect(connection)
+                raise
+
+            self._idle.append(connection)
+            return replies
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            await self._disconnect(connection)
+
+    async def _connect(self) -> Connection:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        connection = (reader, writer)
+
+        setup: List[Command] = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        try:
+            if setup:
+                writer.write(b"".join(self._encode(command) for command in setup))
+                await writer.drain()
+                for _ in setup:
+                    reply = await self._read_reply(reader)
+                    if isinstance(reply, RespError):
+                        raise reply
+        except BaseException:
+            await self._disconnect(connection)
+            raise
+        return connection
+
+    @staticmethod
+    async def _disconnect(connection: Connection) -> None:
+        _, writer = connection
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+    @staticmethod
+    def _encode(command: Command) -> bytes:
+        parts = [b"*%d\r\n" % len(command)]
+        for arg in command:
+            if isinstance(arg, str):
+                arg = arg.encode()
+            elif not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    async def _read_reply(self, reader: asyncio.StreamReader) -> Any:
+        line = await reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("redis_connection_closed")
+
+        prefix, payload = line[:1], line[1:-2]
+        match prefix:
+            case b"+":
+                return payload.decode()
+            case b"-":
+                return RespError(payload.decode())
+            case b":":
+                return int(payload)
+            case b"$":
+                length = int(payload)
+                if length == -1:
+                    return None
+                return (await reader.readexactly(length + 2))[:-2]
+            case b"*":
+                length = int(payload)
+                if length == -1:
+                    return None
+                return [await self._read_reply(reader) for _ in range(length)]
+            case _:
+                raise ConnectionError("redis_protocol_error")
@@ -0,0 +1,217 @@
+import bisect
+import mmap
+import os
+import struct
+import tempfile
+import time
+from collections.abc import Callable, Iterable
+from typing import List, Optional, Tuple
+
+from app.__core__.application.gateways.product_catalog import IProductCatalog
+from app.__core__.application.logger import logger
+from app.__core__.application.metrics import metrics
+from app.__core__.domain.entity.product import Product, Review
+
+# Formato do arquivo (little-endian):
+#   cabeçalho: magic (4 bytes) + quantidade de produtos (u32)
+#   índice: (id u32, offset u32, tamanho u32) por produto, ordenado por id
+#   registros: preço (f64), nota (f64), avaliações (i64, -1 sem review),
+#              tamanho do título (u32), tamanho da imagem (u32), título, imagem
+SNAPSHOT_MAGIC = b"PCS1"
+_HEADER = struct.Struct("<4sI")
+_INDEX_ENTRY = struct.Struct("<III")
+_RECORD = struct.Struct("<ddqII")
+
+
+def write_snapshot(path: str, products: Iterable[Product]) -> int:
+    """Grava o snapshot em um arquivo temporário e o troca de lugar atomicamente.
+
+    Quem estiver lendo o arquivo antigo continua com o mapeamento dele, e a
+    próxima checagem de mudança encontra o arquivo novo já completo.
+    """
+    products = sorted(products, key=lambda product: product.id)
+
+    records: List[bytes] = []
+    for product in products:
+        title = product.title.encode()
+        image_url = product.image_url.encode()
+        records.append(
+            _RECORD.pack(
+                product.price,
+                product.review.rate if product.review else 0.0,
+                product.review.count if product.review else -1,
+                len(title),
+                len(image_url),
+            )
+            + title
+            + image_url
+        )
+
+    offset = _HEADER.size + _INDEX_ENTRY.size * len(records)
+    index = bytearray()
+    for product, record in zip(products, records):
+        index += _INDEX_ENTRY.pack(product.id, offset, len(record))
+        offset += len(record)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".snapshot-")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(_HEADER.pack(SNAPSHOT_MAGIC, len(records)))
+            file.write(index)
+            for record in records:
+                file.write(record)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(records)
+
+
+class _Snapshot:
+    """Um arquivo de snapshot mapeado em memória, com o índice de ids carregado."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as file:
+            stat = os.fstat(file.fileno())
+            self.version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.ids: List[int] = []
+        self.locations: List[Tuple[int, int]] = []
+        try:
+            self._load_index()
+        except (ValueError, struct.error):
+            self.data.close()
+            raise
+
+    def _load_index(self) -> None:
+        # um arquivo truncado ou corrompido é recusado aqui, na carga, e não
+        # na primeira busca que cair fora dele
+        size = len(self.data)
+        if size < _HEADER.size:
+            raise ValueError("invalid_product_catalog_snapshot")
+
+        magic, count = _HEADER.unpack_from(self.data, 0)
+        records_start = _HEADER.size + _INDEX_ENTRY.size * count
+        if magic != SNAPSHOT_MAGIC or size < records_start:
+            raise ValueError("invalid_product_catalog_snapshot")
+
+        for id, offset, length in _INDEX_ENTRY.iter_unpack(
+            self.data[_HEADER.size : records_start]
+        ):
+            if (
+                offset < records_start
+                or length < _RECORD.size
+                or offset + length > size
+            ):
+                raise ValueError("invalid_product_catalog_snapshot")
+            *_, title_len, image_len = _RECORD.unpack_from(self.data, offset)
+            if _RECORD.size + title_len + image_len != length:
+                raise ValueError("invalid_product_catalog_snapshot")
+
+            self.ids.append(id)
+            self.locations.append((offset, length))
+
+    def get(self, id: int) -> Optional[Product]:
+        idx = bisect.bisect_left(self.ids, id)
+        if idx == len(self.ids) or self.ids[idx] != id:
+            return None
+        return self._decode(id, self.locations[idx][0])
+
+    def all(self) -> List[Product]:
+        return [
+            self._decode(id, offset)
+            for id, (offset, _) in zip(self.ids, self.locations)
+        ]
+
+    def _decode(self, id: int, offset: int) -> Product:
+        price, rate, count, title_len, image_len = _RECORD.unpack_from(
+            self.data, offset
+        )
+        start = offset + _RECORD.size
+        title = self.data[start : start + title_len].decode()
+        image_url = self.data[start + title_len : start + title_len + image_len]
+        return Product(
+            id=id,
+            title=title,
+            image_url=image_url.decode(),
+            price=price,
+            review=Review(rate=rate, count=count) if count >= 0 else None,
+        )
+
+
+class SnapshotProductCatalog(IProductCatalog):
+    """Catálogo servido de um snapshot local, sem chamadas de rede.
+
+    O arquivo é mapeado em memória e só o índice (ids e offsets) é carregado;
+    cada produto é decodificado na hora da busca. A cada `reload_interval`
+    segundos o arquivo é checado e, se foi trocado (ver `write_snapshot`), o
+    novo mapeamento substitui o antigo de uma vez.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        reload_interval: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path = path
+        self.reload_interval = reload_interval
+
+        self._clock = clock
+        self._snapshot = _Snapshot(path)
+        self._checked_at = clock()
+        self._publish()
+
+    def __len__(self) -> int:
+        return len(self._current().ids)
+
+    async def fetch_one(self, id: int) -> Optional[Product]:
+        return self._current().get(id)
+
+    async def fetch_many(self, ids: List[int]) -> List[Product]:
+        snapshot = self._current()
+        products = [snapshot.get(id) for id in ids]
+        return [product for product in products if product is not None]
+
+    async def fetch_all(self) -> List[Product]:
+        return self._current().all()
+
+    def close(self) -> None:
+        self._snapshot.data.close()
+
+    def _current(self) -> _Snapshot:
+        now = self._clock()
+        if now - self._checked_at >= self.reload_interval:
+            self._checked_at = now
+            self._reload_if_changed()
+        return self._snapshot
+
+    def _reload_if_changed(self) -> None:
+        try:
+            stat = os.stat(self.path)
+            if (stat.st_ino, stat.st_mtime_ns, stat.st_size) == self._snapshot.version:
+                return
+            snapshot = _Snapshot(self.path)
+        except (OSError, ValueError, struct.error):
+            # sem um arquivo válido, seguimos servindo o snapshot anterior
+            logger.exception("product_catalog_snapshot_reload_failed", path=self.path)
+            return
+
+        # as buscas são síncronas, então nenhuma está usando o mapeamento antigo
+        previous, self._snapshot = self._snapshot, snapshot
+        previous.data.close()
+        metrics.increment("product_catalog_snapshot_reloads")
+        self._publish()
+        logger.info(
+            "product_catalog_snapshot_reloaded",
+            path=self.path,
+            products=len(snapshot.ids),
+        )
+
+    def _publish(self) -> None:
+        metrics.set_gauge("product_catalog_snapshot_products", len(self._snapshot.ids))
@@ -15,9 +15,18 @@ CREATE TABLE IF NOT EXISTS products_cache (
     price DECIMAL(10, 2) NOT NULL,
     review_rate DECIMAL(10, 2),
     review_count INT,
+    content_hash VARCHAR(32),
     fetched_at TIMESTAMPTZ NOT NULL
 );
 
+CREATE TABLE IF NOT EXISTS products_negative_cache (
+    id BIGINT PRIMARY KEY,
+    checked_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_products_negative_cache_checked_at
+    ON products_negative_cache (checked_at);
+
 CREATE TABLE IF NOT EXISTS customer_favorite_products (
     customer_id UUID NOT NULL,
     product_id BIGINT NOT NULL,
@@ -26,3 +35,9 @@ CREATE TABLE IF NOT EXISTS customer_favorite_products (
     CONSTRAINT "fk_customerfavoriteproducts_customer"
         FOREIGN KEY (customer_id) REFERENCES customers(id) ON DELETE CASCADE
 );
+
+CREATE INDEX IF NOT EXISTS ix_customer_favorite_products_product_id
+    ON customer_favorite_products (product_id);
+
+CREATE INDEX IF NOT EXISTS ix_customer_favorite_products_customer_id_favorited_at
+    ON customer_favorite_products (customer_id, favorited_at, product_id);
@@ -1,4 +1,4 @@
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from uuid import uuid4
 
 import pytest
@@ -8,9 +8,11 @@ from sqlmodel import SQLModel
 
 from app.__core__.application.gateways.product_catalog import IProductCatalog
 from app.__core__.domain.entity.product import Product
-from app.__main__ import app
-from app.infra.dependency import (get_async_session,
-                                  get_fake_store_product_catalog)
+from app.__main__ import app, init_app_state
+from app.infra.dependency import (build_product_cache_session,
+                                  get_async_session,
+                                  get_fake_store_product_catalog,
+                                  get_product_cache_session)
 
 
 @pytest.fixture(scope="session")
@@ -91,26 +93,40 @@ def stub_product_catalog():
                 review=None,
             )
 
+        async def fetch_many(self, ids: List[int]) -> List[Product]:
+            products = [await self.fetch_one(id) for id in ids]
+            return [product for product in products if product is not None]
+
+        async def fetch_all(self) -> List[Product]:
+            return await self.fetch_many(list(range(1, 21)))
+
     return StubProductCatalog()
 
 
 @pytest_asyncio.fixture
 async def http_client(
-    async_session: AsyncSession, customer_id: str, stub_product_catalog: IProductCatalog
+    async_session: AsyncSession,
+    session_factory,
+    customer_id: str,
+    stub_product_catalog: IProductCatalog,
 ):
     from httpx import ASGITransport, AsyncClient
 
-    from app.__core__.application.task_manager import TaskManager
     from app.infra.jwt.jwt_service import JWTService
 
     async def get_test_session():
         yield async_session
 
     app.dependency_overrides[get_async_session] = get_test_session
-    app.state.task_manager = TaskManager()
+    init_app_state(app)
     app.dependency_overrides[get_fake_store_product_catalog] = (
         lambda: stub_product_catalog
     )
+    # o fetch compartilhado pelo single flight abre sessões próprias, que
+    # também precisam ir para o banco do teste
+    app.dependency_overrides[get_product_cache_session] = (
+        lambda: build_product_cache_session(app.state, session_factory)
+    )
 
     jwt_service = JWTService()
     access_token = jwt_service.create_token(customer_id)
@@ -1,8 +1,10 @@
 import pytest
 from httpx import AsyncClient
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlmodel import text
 
+from app.infra.postgres.database import apply_schema
+
 
 @pytest.mark.asyncio
 @pytest.mark.integration
@@ -15,3 +17,43 @@ class TestIntegrationSetup:
         response = await http_client.get("/health")
         assert response.status_code == 200
         assert response.json()["status"] == "healthy"
+
+    async def test_should_add_content_hash_to_an_existing_products_cache_table(
+        self, async_engine: AsyncEngine
+    ):
+        async with async_engine.begin() as conn:
+            await conn.execute(
+                text("ALTER TABLE products_cache DROP COLUMN content_hash")
+            )
+            await apply_schema(conn)
+            # idempotente: rodar de novo não falha
+            await apply_schema(conn)
+
+            result = await conn.execute(
+                text(
+                    "SELECT 1 FROM information_schema.columns "
+                    "WHERE table_name = 'products_cache' "
+                    "AND column_name = 'content_hash'"
+                )
+            )
+            assert result.scalar() == 1
+
+    @pytest.mark.parametrize(
+        "index_name",
+        [
+            "ix_customer_favorite_products_product_id",
+            "ix_customer_favorite_products_customer_id_favorited_at",
+        ],
+    )
+    async def test_should_add_missing_indexes_to_an_existing_favorites_table(
+        self, index_name: str, async_engine: AsyncEngine
+    ):
+        async with async_engine.begin() as conn:
+            await conn.execute(text(f"DROP INDEX {index_name}"))
+            await apply_schema(conn)
+
+            result = await conn.execute(
+                text("SELECT 1 FROM pg_indexes WHERE indexname = :index_name"),
+                {"index_name": index_name},
+            )
+            assert result.scalar() == 1
@@ -0,0 +1,45 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from app.__core__.domain.entity.product import Product
+from app.infra.postgres.orm.product_cache_orm import ProductCacheORM
+from app.infra.postgres.repository.product_cache_repository import \
+    PostgresProductCacheRepository
+
+
+def make_product(id: int, fetched_at: datetime) -> Product:
+    return Product(
+        id=id,
+        title="Product",
+        image_url="https://example.com",
+        price=30.0,
+        review=None,
+        fetched_at=fetched_at,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+class TestPostgresProductCacheRepository:
+    async def test_should_keep_each_products_own_fetched_at_when_content_is_unchanged(
+        self, async_session: AsyncSession
+    ):
+        repository = PostgresProductCacheRepository(async_session)
+        now = datetime.now().replace(microsecond=0)
+        await repository.upsert_many(
+            [make_product(1, now - timedelta(hours=2)), make_product(2, now)]
+        )
+
+        # mesmo conteúdo, fetched_at diferentes dentro do mesmo lote
+        older, newer = now - timedelta(minutes=10), now + timedelta(minutes=5)
+        await repository.upsert_many([make_product(1, older), make_product(2, newer)])
+
+        result = await async_session.execute(
+            select(ProductCacheORM.id, ProductCacheORM.fetched_at).order_by(
+                ProductCacheORM.id
+            )
+        )
+        assert result.all() == [(1, older), (2, newer)]
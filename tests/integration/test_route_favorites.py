@@ -232,3 +232,106 @@ class TestFavoritesRoute:
 
         assert response.status_code == 204
         assert customer_favorite_product is None
+
+    async def test_should_walk_through_the_favorites_with_the_next_cursor(
+        self,
+        http_client: AsyncClient,
+        async_session: AsyncSession,
+        test_customer_data: dict,
+    ):
+        await self.create_test_customer(async_session, test_customer_data)
+        for product_id in [1, 2, 3]:
+            await self.add_product_to_cache(async_session, product_id, datetime.now())
+            await self.add_favorite_to_test_customer(
+                async_session, test_customer_data, product_id
+            )
+
+        endpoint = BASE_ENDPOINT.format(test_customer_data["id"])
+        first_page = (await http_client.get(endpoint, params={"per_page": 2})).json()
+        second_page = (
+            await http_client.get(
+                endpoint,
+                params={
+                    "per_page": 2,
+                    "cursor": first_page["pagination"]["next_cursor"],
+                },
+            )
+        ).json()
+
+        assert [product["id"] for product in first_page["data"]] == [3, 2]
+        assert [product["id"] for product in second_page["data"]] == [1]
+        assert second_page["pagination"]["next_cursor"] is None
+
+    async def test_should_return_400_when_the_cursor_is_invalid(
+        self,
+        http_client: AsyncClient,
+        async_session: AsyncSession,
+        test_customer_data: dict,
+    ):
+        await self.create_test_customer(async_session, test_customer_data)
+
+        response = await http_client.get(
+            BASE_ENDPOINT.format(test_customer_data["id"]), params={"cursor": "@@"}
+        )
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "invalid_cursor"
+
+    async def test_should_favorite_a_batch_of_products_and_report_each_one(
+        self,
+        http_client: AsyncClient,
+        async_session: AsyncSession,
+        test_customer_data: dict,
+    ):
+        await self.create_test_customer(async_session, test_customer_data)
+        for product_id in [1, 2]:
+            await self.add_product_to_cache(async_session, product_id, datetime.now())
+        await self.add_favorite_to_test_customer(async_session, test_customer_data, 2)
+
+        response = await http_client.post(
+            f"{BASE_ENDPOINT.format(test_customer_data['id'])}:batch",
+            json={"product_ids": [1, 2, 999999]},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["results"] == [
+            {"product_id": 1, "status": "favorited"},
+            {"product_id": 2, "status": "product_already_in_favorites"},
+            {"product_id": 999999, "status": "product_not_found"},
+        ]
+
+    async def test_should_unfavorite_a_batch_of_products_and_report_each_one(
+        self,
+        http_client: AsyncClient,
+        async_session: AsyncSession,
+        test_customer_data: dict,
+    ):
+        await self.create_test_customer(async_session, test_customer_data)
+        await self.add_favorite_to_test_customer(async_session, test_customer_data, 1)
+
+        response = await http_client.request(
+            "DELETE",
+            f"{BASE_ENDPOINT.format(test_customer_data['id'])}:batch",
+            json={"product_ids": [1, 2]},
+        )
+
+        assert response.status_code == 200
+        assert response.json()["results"] == [
+            {"product_id": 1, "status": "unfavorited"},
+            {"product_id": 2, "status": "product_not_in_favorites"},
+        ]
+
+    async def test_should_return_422_when_the_batch_is_empty(
+        self,
+        http_client: AsyncClient,
+        async_session: AsyncSession,
+        test_customer_data: dict,
+    ):
+        await self.create_test_customer(async_session, test_customer_data)
+
+        response = await http_client.post(
+            f"{BASE_ENDPOINT.format(test_customer_data['id'])}:batch",
+            json={"product_ids": []},
+        )
+
+        assert response.status_code == 422
@@ -0,0 +1,32 @@
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import pytest
+
+from app.__core__.domain.entity.product import Product, Review
+
+
+@pytest.fixture
+def make_product() -> Callable[..., Product]:
+    # o fetched_at é gravado sem fuso, em UTC, como o cache calcula a idade;
+    # `age` recua o fetched_at para simular produtos em cache há mais tempo
+    def factory(
+        id: int = 1,
+        age: timedelta = timedelta(),
+        *,
+        title: str = "Product",
+        image_url: str = "https://example.com",
+        price: float = 30.0,
+        review: Optional[Review] = None,
+    ) -> Product:
+        return Product(
+            id=id,
+            title=title,
+            image_url=image_url,
+            price=price,
+            review=review,
+            fetched_at=datetime.now(timezone.utc).replace(tzinfo=None) - age,
+        )
+
+    return factory
@@ -0,0 +1,60 @@
+import pytest
+
+from app.__core__.application.adaptive_concurrency_limiter import \
+    AdaptiveConcurrencyLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_limiter(clock, initial_concurrency=4):
+    return AdaptiveConcurrencyLimiter(
+        "test",
+        min_concurrency=1,
+        max_concurrency=8,
+        initial_concurrency=initial_concurrency,
+        max_queue_size=10,
+        queue_timeout=1.0,
+        latency_target=0.5,
+        clock=clock,
+    )
+
+
+@pytest.mark.unit
+class TestAdaptiveConcurrencyLimiter:
+    def test_should_raise_the_limit_by_about_one_per_window_of_successes(self):
+        limiter = make_limiter(FakeClock())
+
+        for _ in range(5):
+            limiter.on_success(0.1)
+
+        assert limiter.limit == 5
+
+    def test_should_never_go_above_the_max_concurrency(self):
+        limiter = make_limiter(FakeClock(), initial_concurrency=8)
+
+        for _ in range(100):
+            limiter.on_success(0.1)
+
+        assert limiter.limit == 8
+
+    def test_should_halve_the_limit_on_overload_once_per_burst(self):
+        clock = FakeClock()
+        limiter = make_limiter(clock)
+
+        limiter.on_overload()
+        limiter.on_overload()
+        assert limiter.limit == 2
+
+        clock.now += 1.0
+        limiter.on_success(2.0)  # acima do alvo de latência
+        assert limiter.limit == 1
+
+        clock.now += 1.0
+        limiter.on_overload()
+        assert limiter.limit == 1
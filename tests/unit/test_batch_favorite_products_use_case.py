@@ -0,0 +1,168 @@
+from datetime import timedelta
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from app.__core__.application.single_flight import SingleFlight
+from app.__core__.application.use_case.batch_favorite_products_use_case import (
+    BatchFavoriteProductsInput, BatchFavoriteProductsUseCase)
+from app.__core__.application.use_case.batch_unfavorite_products_use_case import (
+    BatchUnfavoriteProductsInput, BatchUnfavoriteProductsUseCase)
+from app.__core__.domain.exception.exception import CircuitOpenError
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestBatchFavoriteProductsUseCase:
+    customer_id = str(uuid4())
+
+    def make_use_case(self, cached_products, catalog_products, already_favorited=()):
+        customer_favorite_product_repo = AsyncMock()
+        customer_favorite_product_repo.insert_many.side_effect = lambda entities: [
+            entity.product_id
+            for entity in entities
+            if entity.product_id not in already_favorited
+        ]
+        product_cache_repo = AsyncMock()
+        product_cache_repo.fetch_many.return_value = cached_products
+        product_negative_cache_repo = AsyncMock()
+        product_negative_cache_repo.fetch_many.return_value = []
+        product_catalog = AsyncMock()
+        product_catalog.fetch_many.return_value = catalog_products
+
+        use_case = BatchFavoriteProductsUseCase(
+            customer_favorite_product_repo,
+            product_cache_repo,
+            product_negative_cache_repo,
+            product_catalog,
+            SingleFlight("test"),
+        )
+        self.customer_favorite_product_repo = customer_favorite_product_repo
+        return use_case, product_cache_repo, product_catalog
+
+    async def test_should_return_a_result_for_each_product_in_input_order(
+        self, make_product
+    ):
+        use_case, _, _ = self.make_use_case(
+            cached_products=[make_product(1), make_product(2)],
+            catalog_products=[],
+            already_favorited={2},
+        )
+
+        output = await use_case.execute(
+            BatchFavoriteProductsInput(
+                customer_id=self.customer_id, product_ids=[3, 1, 2, 1]
+            )
+        )
+
+        assert [(result.product_id, result.status) for result in output.results] == [
+            (3, "product_not_found"),
+            (1, "favorited"),
+            (2, "product_already_in_favorites"),
+        ]
+
+    async def test_should_insert_all_valid_products_in_one_call(self, make_product):
+        use_case, product_cache_repo, _ = self.make_use_case(
+            cached_products=[make_product(1)], catalog_products=[make_product(2)]
+        )
+
+        await use_case.execute(
+            BatchFavoriteProductsInput(
+                customer_id=self.customer_id, product_ids=[1, 2, 3]
+            )
+        )
+
+        product_cache_repo.fetch_many.assert_awaited_once_with([1, 2, 3])
+        self.customer_favorite_product_repo.insert_many.assert_awaited_once()
+        (entities,) = self.customer_favorite_product_repo.insert_many.await_args.args
+        assert [entity.product_id for entity in entities] == [1, 2]
+
+    async def test_should_fetch_cold_and_stale_products_in_one_catalog_call(
+        self, make_product
+    ):
+        use_case, product_cache_repo, product_catalog = self.make_use_case(
+            cached_products=[make_product(1), make_product(2, timedelta(days=1))],
+            catalog_products=[make_product(2), make_product(3)],
+        )
+
+        output = await use_case.execute(
+            BatchFavoriteProductsInput(
+                customer_id=self.customer_id, product_ids=[1, 2, 3]
+            )
+        )
+
+        assert {result.status for result in output.results} == {"favorited"}
+        product_catalog.fetch_many.assert_awaited_once_with([3, 2])
+        product_cache_repo.upsert_many.assert_awaited_once()
+
+    async def test_should_not_call_catalog_when_all_products_are_fresh(
+        self, make_product
+    ):
+        use_case, _, product_catalog = self.make_use_case(
+            cached_products=[make_product(1), make_product(2)], catalog_products=[]
+        )
+
+        await use_case.execute(
+            BatchFavoriteProductsInput(customer_id=self.customer_id, product_ids=[1, 2])
+        )
+
+        product_catalog.fetch_many.assert_not_awaited()
+
+    async def test_should_favorite_stale_products_when_refresh_fails(
+        self, make_product
+    ):
+        use_case, _, product_catalog = self.make_use_case(
+            cached_products=[make_product(1, timedelta(days=1))], catalog_products=[]
+        )
+        product_catalog.fetch_many.side_effect = CircuitOpenError(
+            "product_catalog_circuit_open"
+        )
+
+        output = await use_case.execute(
+            BatchFavoriteProductsInput(customer_id=self.customer_id, product_ids=[1])
+        )
+
+        assert output.results[0].status == "favorited"
+
+    async def test_should_raise_when_catalog_fails_for_cold_products(self):
+        use_case, _, product_catalog = self.make_use_case(
+            cached_products=[], catalog_products=[]
+        )
+        product_catalog.fetch_many.side_effect = CircuitOpenError(
+            "product_catalog_circuit_open"
+        )
+
+        with pytest.raises(CircuitOpenError):
+            await use_case.execute(
+                BatchFavoriteProductsInput(
+                    customer_id=self.customer_id, product_ids=[1]
+                )
+            )
+
+        self.customer_favorite_product_repo.insert_many.assert_not_awaited()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestBatchUnfavoriteProductsUseCase:
+    customer_id = str(uuid4())
+
+    async def test_should_delete_in_one_call_and_report_each_product(self):
+        customer_favorite_product_repo = AsyncMock()
+        customer_favorite_product_repo.delete_many.return_value = [2]
+        use_case = BatchUnfavoriteProductsUseCase(customer_favorite_product_repo)
+
+        output = await use_case.execute(
+            BatchUnfavoriteProductsInput(
+                customer_id=self.customer_id, product_ids=[1, 2, 1]
+            )
+        )
+
+        customer_favorite_product_repo.delete_many.assert_awaited_once_with(
+            self.customer_id, [1, 2]
+        )
+        assert [(result.product_id, result.status) for result in output.results] == [
+            (1, "product_not_in_favorites"),
+            (2, "unfavorited"),
+        ]
@@ -0,0 +1,54 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.infra.postgres.cache_invalidation import (
+    MAX_PAYLOAD_BYTES, PROCESS_ORIGIN, PostgresCacheInvalidationListener,
+    encode_invalidations, publish_cache_invalidation)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestCacheInvalidation:
+    async def test_should_split_the_keys_into_payloads_that_fit_in_a_notify(self):
+        keys = list(range(5000))
+
+        payloads = encode_invalidations("product", keys)
+
+        assert len(payloads) > 1
+        assert all(len(payload) <= MAX_PAYLOAD_BYTES for payload in payloads)
+        decoded = [
+            int(key)
+            for payload in payloads
+            for key in payload.split("|", 2)[2].split(",")
+        ]
+        assert decoded == keys
+
+    async def test_should_notify_within_the_write_transaction(self):
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        await publish_cache_invalidation(session, "product", [1, 2])
+
+        params = session.execute.await_args.args[1]
+        assert params["payload"] == f"product|{PROCESS_ORIGIN}|1,2"
+
+    async def test_should_dispatch_the_keys_to_the_subscribed_handler(self):
+        listener = PostgresCacheInvalidationListener("postgresql://", 1.0)
+        handler = MagicMock()
+        listener.subscribe("product", handler)
+
+        listener.dispatch("product|another-process|1,2")
+        listener.dispatch("customer|another-process|abc")
+
+        handler.assert_called_once_with(["1", "2"])
+
+    async def test_should_ignore_its_own_messages(self):
+        listener = PostgresCacheInvalidationListener("postgresql://", 1.0)
+        handler = MagicMock()
+        listener.subscribe("product", handler)
+
+        for payload in encode_invalidations("product", [1]):
+            listener.dispatch(payload)
+
+        handler.assert_not_called()
@@ -0,0 +1,111 @@
+import asyncio
+
+import pytest
+
+from app.__core__.application.circuit_breaker import (CircuitBreaker,
+                                                      CircuitState)
+from app.__core__.domain.exception.exception import CircuitOpenError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_circuit_breaker(clock, min_calls=4):
+    return CircuitBreaker(
+        "test",
+        window_size=10,
+        min_calls=min_calls,
+        error_rate_threshold=0.5,
+        slow_call_threshold=1.0,
+        slow_call_rate_threshold=0.5,
+        cooldown=30.0,
+        clock=clock,
+    )
+
+
+async def succeed():
+    return "product"
+
+
+async def fail():
+    raise ValueError("catalog_down")
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestCircuitBreaker:
+    async def test_should_open_when_error_rate_passes_the_threshold(self):
+        circuit_breaker = make_circuit_breaker(FakeClock())
+
+        for fn in (succeed, succeed, fail):
+            try:
+                await circuit_breaker.call(fn)
+            except ValueError:
+                pass
+        assert circuit_breaker.state == CircuitState.CLOSED
+
+        with pytest.raises(ValueError):
+            await circuit_breaker.call(fail)
+        assert circuit_breaker.state == CircuitState.OPEN
+
+        with pytest.raises(CircuitOpenError) as exc:
+            await circuit_breaker.call(succeed)
+        assert str(exc.value) == "test_circuit_open"
+
+    async def test_should_open_when_calls_are_slow(self):
+        clock = FakeClock()
+        circuit_breaker = make_circuit_breaker(clock, min_calls=2)
+
+        async def slow():
+            clock.now += 2.0
+            return "product"
+
+        await circuit_breaker.call(slow)
+        await circuit_breaker.call(slow)
+
+        assert circuit_breaker.state == CircuitState.OPEN
+
+    async def test_should_close_after_a_successful_probe_in_half_open(self):
+        clock = FakeClock()
+        circuit_breaker = make_circuit_breaker(clock, min_calls=1)
+
+        with pytest.raises(ValueError):
+            await circuit_breaker.call(fail)
+
+        clock.now += 30.0
+        assert circuit_breaker.state == CircuitState.HALF_OPEN
+
+        assert await circuit_breaker.call(succeed) == "product"
+        assert circuit_breaker.state == CircuitState.CLOSED
+
+    async def test_should_reopen_when_the_probe_fails(self):
+        clock = FakeClock()
+        circuit_breaker = make_circuit_breaker(clock, min_calls=1)
+
+        with pytest.raises(ValueError):
+            await circuit_breaker.call(fail)
+        clock.now += 30.0
+
+        with pytest.raises(ValueError):
+            await circuit_breaker.call(fail)
+
+        assert circuit_breaker.state == CircuitState.OPEN
+        with pytest.raises(CircuitOpenError):
+            await circuit_breaker.call(succeed)
+
+    async def test_should_not_count_cancelled_calls_as_failures(self):
+        circuit_breaker = make_circuit_breaker(FakeClock(), min_calls=1)
+
+        task = asyncio.ensure_future(circuit_breaker.call(asyncio.Event().wait))
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        assert circuit_breaker.state == CircuitState.CLOSED
+        assert await circuit_breaker.call(succeed) == "product"
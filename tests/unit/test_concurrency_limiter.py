@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from app.__core__.application.concurrency_limiter import ConcurrencyLimiter
+from app.__core__.domain.exception.exception import ConcurrencyLimitError
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestConcurrencyLimiter:
+    async def test_should_never_exceed_the_concurrency_limit(self):
+        limiter = ConcurrencyLimiter(
+            "test", max_concurrency=2, max_queue_size=10, queue_timeout=1.0
+        )
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with limiter:
+                peak = max(peak, limiter.in_flight)
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(*[call() for _ in range(6)])
+
+        assert peak == 2
+        assert limiter.in_flight == 0
+        assert limiter.queue_depth == 0
+
+    async def test_should_reject_when_the_wait_queue_is_full(self):
+        limiter = ConcurrencyLimiter(
+            "test", max_concurrency=1, max_queue_size=1, queue_timeout=1.0
+        )
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(ConcurrencyLimitError, match="test_queue_full"):
+            await limiter.acquire()
+
+        limiter.release()
+        await waiter
+        assert limiter.in_flight == 1
+
+    async def test_should_reject_when_the_queue_timeout_expires(self):
+        limiter = ConcurrencyLimiter(
+            "test", max_concurrency=1, max_queue_size=10, queue_timeout=0.01
+        )
+        await limiter.acquire()
+
+        with pytest.raises(ConcurrencyLimitError, match="test_queue_timeout"):
+            await limiter.acquire()
+
+        assert limiter.queue_depth == 0
+        limiter.release()
+        assert limiter.in_flight == 0
@@ -0,0 +1,172 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from unittest.mock import AsyncMock
+
+import httpx
+import pytest
+
+from app.__core__.application.adaptive_concurrency_limiter import \
+    AdaptiveConcurrencyLimiter
+from app.__core__.application.circuit_breaker import CircuitBreaker
+from app.__core__.application.hedge_policy import HedgePolicy
+from app.__core__.application.retry_policy import RetryBudget, RetryPolicy
+from app.__core__.domain.exception.exception import RetryError
+from app.infra.fakestore.fakestore_product_catalog import \
+    FakeStoreProductCatalog
+
+RAW_PRODUCT = {
+    "id": 1,
+    "title": "Product",
+    "image": "https://example.com",
+    "price": 30,
+    "rating": {"rate": 4.5, "count": 10},
+}
+
+
+def make_catalog(handler, sleep=None, circuit_breaker=None, hedge_policy=None):
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), base_url="http://fake-api.local"
+    )
+    limiter = AdaptiveConcurrencyLimiter(
+        "test",
+        min_concurrency=1,
+        max_concurrency=10,
+        initial_concurrency=5,
+        max_queue_size=10,
+        queue_timeout=1.0,
+        latency_target=1.0,
+    )
+    retry_policy = RetryPolicy(
+        "test",
+        max_attempts=3,
+        base_delay=0.1,
+        max_delay=1.0,
+        budget=RetryBudget(0.1, 10.0),
+        sleep=sleep or AsyncMock(),
+    )
+    return FakeStoreProductCatalog(
+        client, limiter, retry_policy, circuit_breaker, hedge_policy
+    )
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestFakeStoreProductCatalog:
+    @pytest.mark.parametrize(
+        "response", [httpx.Response(404), httpx.Response(200, content=b"")]
+    )
+    async def test_should_return_none_when_the_product_does_not_exist(self, response):
+        catalog = make_catalog(lambda request: response)
+
+        assert await catalog.fetch_one(1) is None
+
+    async def test_should_retry_server_errors(self):
+        responses = iter([httpx.Response(503), httpx.Response(200, json=RAW_PRODUCT)])
+        catalog = make_catalog(lambda request: next(responses))
+
+        product = await catalog.fetch_one(1)
+
+        assert product.id == 1
+
+    async def test_should_raise_instead_of_reporting_not_found_on_errors(self):
+        catalog = make_catalog(lambda request: httpx.Response(503))
+
+        with pytest.raises(RetryError):
+            await catalog.fetch_one(1)
+
+    async def test_should_retry_connection_errors(self):
+        calls = 0
+
+        def handler(request):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise httpx.ConnectError("connection refused")
+            return httpx.Response(200, json=RAW_PRODUCT)
+
+        catalog = make_catalog(handler)
+
+        assert (await catalog.fetch_one(1)).id == 1
+        assert calls == 2
+
+    async def test_should_fetch_all_products_from_a_streamed_response(self):
+        products = [RAW_PRODUCT, {**RAW_PRODUCT, "id": 2, "rating": None}]
+        catalog = make_catalog(lambda request: httpx.Response(200, json=products))
+
+        fetched = await catalog.fetch_all()
+
+        assert [product.id for product in fetched] == [1, 2]
+
+    async def test_should_release_the_limiter_slot_while_waiting_to_retry(self):
+        in_flight_while_sleeping = []
+        responses = iter(
+            [
+                httpx.Response(503, headers={"Retry-After": "1"}),
+                httpx.Response(200, json=RAW_PRODUCT),
+            ]
+        )
+
+        async def sleep(delay):
+            in_flight_while_sleeping.append(catalog.limiter.in_flight)
+
+        catalog = make_catalog(lambda request: next(responses), sleep=sleep)
+
+        assert (await catalog.fetch_one(1)).id == 1
+        assert in_flight_while_sleeping == [0]
+        assert catalog.limiter.in_flight == 0
+
+    async def test_should_parse_a_retry_after_date_without_a_time_zone(self):
+        # "-0000" é UTC, mas o parsedate_to_datetime devolve a data sem tzinfo
+        retry_at = format_datetime(
+            datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(seconds=30)
+        )
+        assert retry_at.endswith("-0000")
+
+        delay = FakeStoreProductCatalog._parse_retry_after(
+            httpx.Response(503, headers={"Retry-After": retry_at})
+        )
+
+        assert 25 < delay <= 30
+
+    async def test_should_record_each_attempt_in_the_circuit_breaker(self):
+        circuit_breaker = CircuitBreaker(
+            "test",
+            window_size=10,
+            min_calls=10,
+            error_rate_threshold=0.5,
+            slow_call_threshold=1.0,
+            slow_call_rate_threshold=0.5,
+            cooldown=1.0,
+        )
+        responses = iter([httpx.Response(503), httpx.Response(200, json=RAW_PRODUCT)])
+        catalog = make_catalog(
+            lambda request: next(responses), circuit_breaker=circuit_breaker
+        )
+
+        await catalog.fetch_one(1)
+
+        assert [failed for failed, _ in circuit_breaker._outcomes] == [True, False]
+
+    async def test_should_take_a_limiter_slot_for_the_hedged_request(self):
+        hedge_policy = HedgePolicy(
+            "test",
+            percentile=0.9,
+            min_delay=0.01,
+            window_size=10,
+            min_samples=1,
+            budget=RetryBudget(0.1, 10.0),
+        )
+        hedge_policy._latencies.append(0.01)
+        in_flight_per_call = []
+
+        async def handler(request):
+            in_flight_per_call.append(catalog.limiter.in_flight)
+            if len(in_flight_per_call) == 1:
+                await asyncio.sleep(1.0)
+            return httpx.Response(200, json=RAW_PRODUCT)
+
+        catalog = make_catalog(handler, hedge_policy=hedge_policy)
+
+        assert (await catalog.fetch_one(1)).id == 1
+        assert in_flight_per_call == [1, 2]
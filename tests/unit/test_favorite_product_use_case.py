@@ -0,0 +1,128 @@
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from app.__core__.application.single_flight import SingleFlight
+from app.__core__.application.use_case.favorite_product_use_case import (
+    FavoriteProductInput, FavoriteProductUseCase)
+from app.__core__.application.use_case.unfavorite_product_use_case import (
+    UnfavoriteProductInput, UnfavoriteProductUseCase)
+from app.__core__.domain.exception.exception import (CircuitOpenError,
+                                                     ValidationError)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestFavoriteProductUseCase:
+    customer_id = str(uuid4())
+
+    def make_use_case(self, make_product, inserted: bool):
+        customer_favorite_product_repo = AsyncMock()
+        customer_favorite_product_repo.insert_if_absent.return_value = inserted
+        product_cache_repo = AsyncMock()
+        product_cache_repo.fetch_one.return_value = make_product(1)
+
+        use_case = FavoriteProductUseCase(
+            customer_favorite_product_repo,
+            product_cache_repo,
+            AsyncMock(),
+            AsyncMock(),
+            SingleFlight("test"),
+        )
+        return use_case, customer_favorite_product_repo
+
+    async def test_should_favorite_with_a_single_write(self, make_product):
+        use_case, customer_favorite_product_repo = self.make_use_case(
+            make_product, inserted=True
+        )
+
+        await use_case.execute(
+            FavoriteProductInput(customer_id=self.customer_id, product_id=1)
+        )
+
+        customer_favorite_product_repo.insert_if_absent.assert_awaited_once()
+        customer_favorite_product_repo.fetch_one.assert_not_awaited()
+
+    async def test_should_raise_when_product_is_already_in_favorites(
+        self, make_product
+    ):
+        use_case, _ = self.make_use_case(make_product, inserted=False)
+
+        with pytest.raises(ValidationError, match="product_already_in_favorites"):
+            await use_case.execute(
+                FavoriteProductInput(customer_id=self.customer_id, product_id=1)
+            )
+
+    async def test_should_raise_already_in_favorites_when_hydration_fails(
+        self, make_product
+    ):
+        use_case, customer_favorite_product_repo = self.make_use_case(
+            make_product, inserted=False
+        )
+        use_case.product_cache_repository.fetch_one.return_value = None
+        use_case.product_negative_cache_repository.contains.return_value = False
+        use_case.product_catalog.fetch_one.side_effect = CircuitOpenError(
+            "product_catalog_circuit_open"
+        )
+        customer_favorite_product_repo.fetch_one.return_value = object()
+
+        with pytest.raises(ValidationError, match="product_already_in_favorites"):
+            await use_case.execute(
+                FavoriteProductInput(customer_id=self.customer_id, product_id=1)
+            )
+
+        customer_favorite_product_repo.fetch_one.assert_awaited_once_with(
+            self.customer_id, 1
+        )
+        customer_favorite_product_repo.insert_if_absent.assert_not_awaited()
+
+    async def test_should_propagate_the_hydration_error_for_new_favorites(
+        self, make_product
+    ):
+        use_case, customer_favorite_product_repo = self.make_use_case(
+            make_product, inserted=True
+        )
+        use_case.product_cache_repository.fetch_one.return_value = None
+        use_case.product_negative_cache_repository.contains.return_value = False
+        use_case.product_catalog.fetch_one.side_effect = CircuitOpenError(
+            "product_catalog_circuit_open"
+        )
+        customer_favorite_product_repo.fetch_one.return_value = None
+
+        with pytest.raises(CircuitOpenError):
+            await use_case.execute(
+                FavoriteProductInput(customer_id=self.customer_id, product_id=1)
+            )
+
+        customer_favorite_product_repo.insert_if_absent.assert_not_awaited()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestUnfavoriteProductUseCase:
+    customer_id = str(uuid4())
+
+    async def test_should_unfavorite_with_a_single_write(self):
+        customer_favorite_product_repo = AsyncMock()
+        customer_favorite_product_repo.delete_if_present.return_value = True
+        use_case = UnfavoriteProductUseCase(customer_favorite_product_repo)
+
+        await use_case.execute(
+            UnfavoriteProductInput(customer_id=self.customer_id, product_id=1)
+        )
+
+        customer_favorite_product_repo.delete_if_present.assert_awaited_once_with(
+            self.customer_id, 1
+        )
+        customer_favorite_product_repo.fetch_one.assert_not_awaited()
+
+    async def test_should_raise_when_product_is_not_in_favorites(self):
+        customer_favorite_product_repo = AsyncMock()
+        customer_favorite_product_repo.delete_if_present.return_value = False
+        use_case = UnfavoriteProductUseCase(customer_favorite_product_repo)
+
+        with pytest.raises(ValidationError, match="product_not_in_favorites"):
+            await use_case.execute(
+                UnfavoriteProductInput(customer_id=self.customer_id, product_id=1)
+            )
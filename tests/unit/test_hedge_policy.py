@@ -0,0 +1,97 @@
+import asyncio
+
+import pytest
+
+from app.__core__.application.hedge_policy import HedgePolicy
+from app.__core__.application.retry_policy import RetryBudget
+
+
+def make_policy(min_samples=1, budget=None, latencies=(0.01,)):
+    policy = HedgePolicy(
+        "test",
+        percentile=0.9,
+        min_delay=0.01,
+        window_size=10,
+        min_samples=min_samples,
+        budget=budget or RetryBudget(0.1, 10.0),
+    )
+    policy._latencies.extend(latencies)
+    return policy
+
+
+def make_fn(*delays):
+    calls = iter(delays)
+
+    async def fn():
+        delay = next(calls)
+        await asyncio.sleep(delay)
+        return delay
+
+    return fn
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestHedgePolicy:
+    async def test_should_not_hedge_before_it_has_enough_samples(self):
+        policy = make_policy(min_samples=2)
+
+        assert policy.delay is None
+        assert await policy.execute(make_fn(0.05)) == 0.05
+
+    async def test_should_use_the_percentile_of_the_observed_latencies(self):
+        policy = make_policy(latencies=[0.1 * i for i in range(1, 11)])
+
+        assert policy.delay == pytest.approx(0.9)
+
+    async def test_should_use_the_hedge_when_it_answers_first(self):
+        policy = make_policy()
+
+        assert await policy.execute(make_fn(1.0, 0.01)) == 0.01
+
+    async def test_should_keep_the_primary_when_it_answers_before_the_delay(self):
+        policy = make_policy()
+        fn = make_fn(0.001)
+
+        assert await policy.execute(fn) == 0.001
+
+    async def test_should_not_hedge_without_budget(self):
+        budget = RetryBudget(0.0, 0.0)
+        budget.try_withdraw()
+        policy = make_policy(budget=budget)
+
+        assert await policy.execute(make_fn(0.05, 0.01)) == 0.05
+
+    async def test_should_wait_for_the_hedge_when_the_primary_fails(self):
+        policy = make_policy()
+        calls = 0
+
+        async def fn():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(0.02)
+                raise ValueError("primary_failed")
+            await asyncio.sleep(0.05)
+            return "hedge"
+
+        assert await policy.execute(fn) == "hedge"
+
+    async def test_should_raise_when_every_attempt_fails(self):
+        policy = make_policy()
+
+        async def fn():
+            raise ValueError("failed")
+
+        with pytest.raises(ValueError):
+            await policy.execute(fn)
+
+    async def test_should_record_the_latency_of_every_attempt(self):
+        policy = make_policy()
+
+        await policy.execute(make_fn(1.0, 0.01))
+        await asyncio.sleep(0)
+
+        # a vencedora e a tentativa cancelada, cada uma medida do seu início
+        assert len(policy._latencies) == 3
+        assert policy._latencies[-1] > policy._latencies[-2]
@@ -0,0 +1,27 @@
+import pytest
+
+from app.__core__.application.hot_key_tracker import HotKeyTracker
+
+
+@pytest.mark.unit
+class TestHotKeyTracker:
+    def test_should_keep_only_the_most_frequent_keys(self):
+        tracker = HotKeyTracker(capacity=2)
+
+        for key, hits in ((1, 5), (2, 1), (3, 3)):
+            for _ in range(hits):
+                tracker.record(key)
+
+        assert tracker.top(2) == [1, 3]
+        assert tracker.estimate(1) >= 5
+
+    def test_should_let_new_popular_keys_overtake_old_ones_after_decay(self):
+        tracker = HotKeyTracker(capacity=1)
+        for _ in range(10):
+            tracker.record(1)
+
+        tracker.decay(0.1)
+        for _ in range(3):
+            tracker.record(2)
+
+        assert tracker.top(1) == [2]
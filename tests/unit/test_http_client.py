@@ -0,0 +1,86 @@
+import httpx
+import pytest
+
+from app.__core__.application.metrics import metrics
+from app.infra.fakestore.http_client import (PoolMetricsTransport,
+                                             warm_up_client)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestHttpClient:
+    async def test_should_publish_pool_utilization_while_requests_are_in_flight(
+        self,
+    ):
+        seen = []
+
+        def handler(request):
+            seen.append(metrics.get_gauge("test_http_pool_utilization"))
+            return httpx.Response(200)
+
+        transport = PoolMetricsTransport(
+            httpx.MockTransport(handler), "test", max_connections=4
+        )
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://fake-api.local"
+        ) as client:
+            await client.get("/products/1")
+
+        assert seen == [0.25]
+        assert metrics.get_gauge("test_http_pool_in_use") == 0
+
+    async def test_should_keep_the_connection_in_use_until_the_body_is_closed(
+        self,
+    ):
+        class BodyStream(httpx.AsyncByteStream):
+            async def __aiter__(self):
+                yield b"[]"
+
+        transport = PoolMetricsTransport(
+            httpx.MockTransport(
+                lambda request: httpx.Response(200, stream=BodyStream())
+            ),
+            "test_stream",
+            max_connections=4,
+        )
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://fake-api.local"
+        ) as client:
+            async with client.stream("GET", "/products") as response:
+                assert metrics.get_gauge("test_stream_http_pool_in_use") == 1
+                await response.aread()
+
+        assert metrics.get_gauge("test_stream_http_pool_in_use") == 0
+
+    async def test_should_release_the_connection_when_the_request_fails(self):
+        def handler(request):
+            raise httpx.ConnectError("connection refused")
+
+        transport = PoolMetricsTransport(
+            httpx.MockTransport(handler), "test_failed", max_connections=4
+        )
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://fake-api.local"
+        ) as client:
+            with pytest.raises(httpx.ConnectError):
+                await client.get("/products/1")
+
+        assert metrics.get_gauge("test_failed_http_pool_in_use") == 0
+
+    async def test_should_count_only_the_connections_that_were_opened(self):
+        calls = 0
+
+        def handler(request):
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                raise httpx.ConnectError("connection refused")
+            return httpx.Response(200)
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url="http://fake-api.local"
+        ) as client:
+            warmed = await warm_up_client(client, 3)
+
+        assert calls == 3
+        assert warmed == 2
@@ -0,0 +1,307 @@
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+
+from app.__core__.application.single_flight import SingleFlight
+from app.__core__.application.use_case import base_product_cache_use_case
+from app.__core__.application.use_case.list_customer_favorite_products_use_case import (
+    ListCustomerFavoriteProductsInput, ListCustomerFavoriteProductsUseCase)
+from app.__core__.domain.exception.exception import (CircuitOpenError,
+                                                     ValidationError)
+from app.__core__.domain.repository.pagination import Cursor
+from app.__core__.domain.repository.repository import \
+    CustomerFavoriteProductsPage
+from app.__core__.domain.value_object.customer_favorite_product import \
+    CustomerFavoriteProduct
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestListCustomerFavoriteProductsUseCase:
+    customer_id = str(uuid4())
+
+    def make_use_case(
+        self,
+        product_ids,
+        cached_products,
+        catalog_products,
+        known_missing_ids=(),
+        product_cache_session=None,
+    ):
+        cached_by_id = {product.id: product for product in cached_products}
+        customer_favorite_product_repo = AsyncMock()
+        customer_favorite_product_repo.fetch_page.return_value = (
+            CustomerFavoriteProductsPage(
+                items=[
+                    (
+                        CustomerFavoriteProduct(
+                            customer_id=self.customer_id, product_id=id
+                        ),
+                        cached_by_id.get(id),
+                    )
+                    for id in product_ids
+                ],
+                total_items=len(product_ids),
+            )
+        )
+        product_cache_repo = AsyncMock()
+        # sem L1/L2 na frente, só as linhas do JOIN
+        # L1/L2 vazios: os produtos vêm das linhas do JOIN
+        product_cache_tiers = AsyncMock()
+        product_cache_tiers.get_many.return_value = []
+        product_negative_cache_repo = AsyncMock()
+        product_negative_cache_repo.contains.return_value = False
+        product_negative_cache_repo.fetch_many.return_value = known_missing_ids
+        product_catalog = AsyncMock()
+        product_catalog.fetch_many.return_value = catalog_products
+
+        use_case = ListCustomerFavoriteProductsUseCase(
+            customer_favorite_product_repo,
+            product_cache_repo,
+            product_negative_cache_repo,
+            product_catalog,
+            SingleFlight("test"),
+            MagicMock(),
+            MagicMock(),
+            product_cache_tiers,
+            product_cache_session,
+        )
+        self.product_negative_cache_repo = product_negative_cache_repo
+        self.customer_favorite_product_repo = customer_favorite_product_repo
+        self.product_cache_tiers = product_cache_tiers
+        return use_case, product_cache_repo, product_catalog
+
+    async def test_should_fetch_cold_and_hard_stale_products_in_one_batch(
+        self, make_product
+    ):
+        use_case, product_cache_repo, product_catalog = self.make_use_case(
+            product_ids=[1, 2, 3],
+            cached_products=[make_product(1), make_product(2, timedelta(days=1))],
+            catalog_products=[make_product(2), make_product(3)],
+        )
+
+        output = await use_case.execute(
+            ListCustomerFavoriteProductsInput(
+                customer_id=self.customer_id, page=1, per_page=20
+            )
+        )
+
+        assert [product.id for product in output.data] == [1, 2, 3]
+        assert output.pagination.total_items == 3
+        # os produtos do Postgres vieram junto com a página de favoritos
+        product_cache_repo.fetch_many.assert_not_awaited()
+        self.product_cache_tiers.get_many.assert_awaited_once_with([1, 2, 3])
+        # as linhas do JOIN alimentam o L1/L2
+        assert [
+            product.id
+            for product in self.product_cache_tiers.put_many.await_args.args[0]
+        ] == [1, 2]
+        product_catalog.fetch_many.assert_awaited_once_with([2, 3])
+        product_catalog.fetch_one.assert_not_awaited()
+        product_cache_repo.upsert_many.assert_awaited_once()
+        product_cache_repo.refresh.assert_not_awaited()
+        product_cache_repo.insert_one.assert_not_awaited()
+
+    async def test_should_prefer_the_cache_tiers_over_the_joined_rows(
+        self, make_product
+    ):
+        use_case, product_cache_repo, product_catalog = self.make_use_case(
+            product_ids=[1],
+            cached_products=[make_product(1, timedelta(days=1))],
+            catalog_products=[],
+        )
+        # o L1/L2 já tem a versão atualizada, que ainda não chegou ao Postgres
+        self.product_cache_tiers.get_many.return_value = [make_product(1)]
+
+        output = await use_case.execute(
+            ListCustomerFavoriteProductsInput(
+                customer_id=self.customer_id, page=1, per_page=20
+            )
+        )
+
+        assert [product.id for product in output.data] == [1]
+        self.product_cache_tiers.put_many.assert_awaited_once_with([])
+        product_catalog.fetch_many.assert_not_awaited()
+
+    async def test_should_raise_validation_error_when_catalog_does_not_know_the_product(
+        self,
+    ):
+        use_case, _, _ = self.make_use_case(
+            product_ids=[1], cached_products=[], catalog_products=[]
+        )
+
+        with pytest.raises(ValidationError) as exc:
+            await use_case.execute(
+                ListCustomerFavoriteProductsInput(
+                    customer_id=self.customer_id, page=1, per_page=20
+                )
+            )
+
+        assert str(exc.value) == "product_not_found"
+        self.product_negative_cache_repo.insert_many.assert_awaited_once_with([1])
+
+    async def test_should_not_call_the_catalog_for_ids_in_the_negative_cache(self):
+        use_case, _, product_catalog = self.make_use_case(
+            product_ids=[1],
+            cached_products=[],
+            catalog_products=[],
+            known_missing_ids=[1],
+        )
+
+        with pytest.raises(ValidationError):
+            await use_case.execute(
+                ListCustomerFavoriteProductsInput(
+                    customer_id=self.customer_id, page=1, per_page=20
+                )
+            )
+
+        product_catalog.fetch_many.assert_not_awaited()
+
+    async def test_should_serve_hard_stale_products_when_the_circuit_is_open(
+        self, make_product
+    ):
+        use_case, product_cache_repo, product_catalog = self.make_use_case(
+            product_ids=[1, 2],
+            cached_products=[make_product(1), make_product(2, timedelta(days=1))],
+            catalog_products=[],
+        )
+        product_catalog.fetch_many.side_effect = CircuitOpenError(
+            "product_catalog_circuit_open"
+        )
+
+        output = await use_case.execute(
+            ListCustomerFavoriteProductsInput(
+                customer_id=self.customer_id, page=1, per_page=20
+            )
+        )
+
+        assert [(product.id, product.stale) for product in output.data] == [
+            (1, False),
+            (2, True),
+        ]
+        product_cache_repo.upsert_many.assert_not_awaited()
+
+    async def test_should_fail_when_the_circuit_is_open_and_a_product_is_cold(
+        self, make_product
+    ):
+        use_case, _, product_catalog = self.make_use_case(
+            product_ids=[1, 2],
+            cached_products=[make_product(1, timedelta(days=1))],
+            catalog_products=[],
+        )
+        product_catalog.fetch_many.side_effect = CircuitOpenError(
+            "product_catalog_circuit_open"
+        )
+
+        with pytest.raises(CircuitOpenError):
+            await use_case.execute(
+                ListCustomerFavoriteProductsInput(
+                    customer_id=self.customer_id, page=1, per_page=20
+                )
+            )
+
+    async def test_should_spread_soft_ttls_without_going_past_the_configured_one(
+        self,
+    ):
+        use_case, _, _ = self.make_use_case([], [], [])
+
+        soft_ttls = {use_case._get_soft_ttl(id) for id in range(1, 1001)}
+
+        assert len(soft_ttls) > 1
+        assert max(soft_ttls) <= use_case.soft_ttl
+        assert min(soft_ttls) >= use_case.soft_ttl * (1 - use_case.ttl_jitter_ratio)
+
+    async def test_should_refresh_early_when_fetches_are_expensive(self, monkeypatch):
+        use_case, _, _ = self.make_use_case([], [], [])
+        use_case.ttl_jitter_ratio = 0
+        age = use_case.soft_ttl - timedelta(seconds=10)
+
+        monkeypatch.setattr(base_product_cache_use_case.random, "random", lambda: 0.5)
+        monkeypatch.setattr(
+            base_product_cache_use_case, "catalog_fetch_cost", MagicMock(value=1.0)
+        )
+        assert use_case._is_cache_fresh(1, age)
+
+        monkeypatch.setattr(
+            base_product_cache_use_case, "catalog_fetch_cost", MagicMock(value=30.0)
+        )
+        assert not use_case._is_cache_fresh(1, age)
+
+    async def test_should_return_a_cursor_to_the_next_page_when_the_page_is_full(
+        self,
+        make_product,
+    ):
+        use_case, _, _ = self.make_use_case(
+            product_ids=[1, 2],
+            cached_products=[make_product(1), make_product(2)],
+            catalog_products=[],
+        )
+
+        output = await use_case.execute(
+            ListCustomerFavoriteProductsInput(
+                customer_id=self.customer_id, page=1, per_page=2
+            )
+        )
+        cursor = Cursor.decode(output.pagination.next_cursor)
+        await use_case.execute(
+            ListCustomerFavoriteProductsInput(
+                customer_id=self.customer_id,
+                page=1,
+                per_page=2,
+                cursor=output.pagination.next_cursor,
+            )
+        )
+
+        assert cursor.product_id == 2
+        pagination = self.customer_favorite_product_repo.fetch_page.await_args.args[1]
+        assert pagination.cursor == cursor
+
+    async def test_should_reject_an_invalid_cursor(self):
+        use_case, _, _ = self.make_use_case(
+            product_ids=[], cached_products=[], catalog_products=[]
+        )
+
+        with pytest.raises(ValidationError) as exc:
+            await use_case.execute(
+                ListCustomerFavoriteProductsInput(
+                    customer_id=self.customer_id, page=1, per_page=2, cursor="@@"
+                )
+            )
+
+        assert str(exc.value) == "invalid_cursor"
+
+    async def test_should_store_the_fetched_products_in_a_session_of_its_own(
+        self, make_product
+    ):
+        shared_product_cache_repo = AsyncMock()
+        shared_negative_cache_repo = AsyncMock()
+        shared_negative_cache_repo.fetch_many.return_value = []
+        opened = []
+
+        @asynccontextmanager
+        async def product_cache_session():
+            opened.append(True)
+            yield shared_product_cache_repo, shared_negative_cache_repo
+
+        use_case, product_cache_repo, _ = self.make_use_case(
+            product_ids=[1],
+            cached_products=[],
+            catalog_products=[make_product(1)],
+            product_cache_session=product_cache_session,
+        )
+
+        await use_case.execute(
+            ListCustomerFavoriteProductsInput(
+                customer_id=self.customer_id, page=1, per_page=20
+            )
+        )
+
+        # o fetch compartilhado pelo single flight não usa a sessão da requisição
+        assert opened == [True]
+        shared_product_cache_repo.upsert_many.assert_awaited_once()
+        shared_negative_cache_repo.fetch_many.assert_awaited_once_with([1])
+        product_cache_repo.upsert_many.assert_not_awaited()
+        self.product_negative_cache_repo.fetch_many.assert_not_awaited()
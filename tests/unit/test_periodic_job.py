@@ -0,0 +1,46 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.__core__.application.periodic_job import PeriodicJob
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestPeriodicJob:
+    async def test_should_skip_the_run_when_the_lock_is_held_elsewhere(self):
+        job = AsyncMock()
+        lock = AsyncMock()
+        lock.try_acquire.return_value = False
+
+        periodic_job = PeriodicJob("test", job, period=1.0, lock=lock)
+
+        assert await periodic_job.run_once() is False
+        job.assert_not_awaited()
+
+    async def test_should_run_the_job_when_the_lock_is_acquired(self):
+        job = AsyncMock()
+        lock = AsyncMock()
+        lock.try_acquire.return_value = True
+
+        periodic_job = PeriodicJob("test", job, period=1.0, lock=lock)
+
+        assert await periodic_job.run_once() is True
+        job.assert_awaited_once()
+
+    async def test_should_not_propagate_job_failures(self):
+        job = AsyncMock(side_effect=RuntimeError("upstream_down"))
+
+        periodic_job = PeriodicJob("test", job, period=1.0)
+
+        assert await periodic_job.run_once() is True
+
+    async def test_should_skip_the_run_when_the_lock_cannot_be_acquired(self):
+        job = AsyncMock()
+        lock = AsyncMock()
+        lock.try_acquire.side_effect = OSError("connection refused")
+
+        periodic_job = PeriodicJob("test", job, period=1.0, lock=lock)
+
+        assert await periodic_job.run_once() is False
+        job.assert_not_awaited()
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+import pytest
+
+from app.__core__.domain.entity.product import Review
+
+REVIEW = Review(rate=4.5, count=10)
+
+
+@pytest.mark.unit
+class TestProduct:
+    def test_should_keep_the_content_hash_when_only_fetched_at_changes(
+        self, make_product
+    ):
+        product = make_product(review=REVIEW)
+        refreshed = make_product(review=REVIEW, age=-timedelta(hours=1))
+
+        assert product.content_hash() == refreshed.content_hash()
+
+    def test_should_change_the_content_hash_when_catalog_data_changes(
+        self, make_product
+    ):
+        assert (
+            make_product(price=30.0, review=REVIEW).content_hash()
+            != make_product(price=29.99, review=REVIEW).content_hash()
+        )
+
+    def test_should_ignore_price_differences_below_the_column_precision(
+        self, make_product
+    ):
+        assert (
+            make_product(price=30.0, review=REVIEW).content_hash()
+            == make_product(price=30.001, review=REVIEW).content_hash()
+        )
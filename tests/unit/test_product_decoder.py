@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from app.infra.fakestore.product_decoder import (JsonArrayStream,
+                                                 MsgspecProductDecoder,
+                                                 StdlibProductDecoder)
+
+RAW_PRODUCTS = [
+    {
+        "id": 1,
+        "title": 'Mochila "Fjallraven" {edição} [15"]\\',
+        "image": "https://example.com/1.jpg",
+        "price": 109.95,
+        "rating": {"rate": 3.9, "count": 120},
+    },
+    {
+        "id": 2,
+        "title": "Camiseta",
+        "image": "https://example.com/2.jpg",
+        "price": 22,
+        "rating": None,
+    },
+]
+
+
+async def chunked(content: bytes, size: int):
+    for idx in range(0, len(content), size):
+        yield content[idx : idx + size]
+
+
+@pytest.mark.unit
+class TestJsonArrayStream:
+    @pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+    def test_should_split_the_array_elements_regardless_of_chunk_size(self, chunk_size):
+        content = json.dumps(RAW_PRODUCTS, ensure_ascii=False).encode()
+        stream = JsonArrayStream()
+
+        items = []
+        for idx in range(0, len(content), chunk_size):
+            items.extend(stream.feed(content[idx : idx + chunk_size]))
+
+        assert [json.loads(item) for item in items] == RAW_PRODUCTS
+        assert stream.complete
+
+    def test_should_not_be_complete_while_an_element_is_still_arriving(self):
+        stream = JsonArrayStream()
+
+        assert stream.feed(b'[{"id": 1}, {"id"') == [b'{"id": 1}']
+        assert not stream.complete
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestStdlibProductDecoder:
+    async def test_should_decode_a_single_product(self):
+        product = StdlibProductDecoder().decode_one(
+            json.dumps(RAW_PRODUCTS[0]).encode()
+        )
+
+        assert product.id == 1
+        assert product.review.count == 120
+
+    async def test_should_decode_a_streamed_array(self):
+        content = json.dumps(RAW_PRODUCTS).encode()
+
+        products = [
+            product
+            async for product in StdlibProductDecoder().decode_many(
+                chunked(content, 16)
+            )
+        ]
+
+        assert [product.id for product in products] == [1, 2]
+        assert products[1].price == 22.0
+        assert products[1].review is None
+
+    async def test_should_fail_on_a_truncated_array(self):
+        content = json.dumps(RAW_PRODUCTS).encode()[:-10]
+
+        with pytest.raises(ValueError):
+            async for _ in StdlibProductDecoder().decode_many(chunked(content, 16)):
+                pass
+
+
+@pytest.mark.unit
+class TestMsgspecProductDecoder:
+    def test_should_decode_the_same_as_the_stdlib_decoder(self):
+        pytest.importorskip("msgspec")
+        content = json.dumps(RAW_PRODUCTS[0]).encode()
+
+        product = MsgspecProductDecoder().decode_one(content)
+
+        assert product == StdlibProductDecoder().decode_one(content)
+        assert product.title == RAW_PRODUCTS[0]["title"]
+        assert product.review.rate == 3.9
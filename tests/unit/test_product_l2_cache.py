@@ -0,0 +1,250 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.__core__.domain.entity.product import Review
+from app.infra.cache.l2_product_cache_repository import \
+    L2ProductCacheRepository
+from app.infra.cache.product_cache_tiers import ProductCacheTiers
+from app.infra.memory.in_memory_product_l2_cache import InMemoryProductL2Cache
+from app.infra.memory.product_lru_cache import ProductLRUCache
+from app.infra.redis.redis_product_l2_cache import RedisProductL2Cache
+from app.infra.redis.resp_client import RespClient, RespError
+
+HARD_TTL = timedelta(minutes=30)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedisServer:
+    """Servidor RESP com o mínimo de comandos usados pelo L2."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                args = []
+                for _ in range(int(line[1:-2])):
+                    length = int((await reader.readline())[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                writer.write(self._execute(args))
+                await writer.drain()
+        finally:
+            writer.close()
+
+    def _execute(self, args):
+        command = args[0].upper()
+        if command == b"MGET":
+            reply = b"*%d\r\n" % (len(args) - 1)
+            for key in args[1:]:
+                value = self.data.get(key)
+                reply += (
+                    b"$-1\r\n"
+                    if value is None
+                    else b"$%d\r\n%s\r\n"
+                    % (
+                        len(value),
+                        value,
+                    )
+                )
+            return reply
+        if command == b"SET":
+            self.data[args[1]] = args[2]
+            self.ttls[args[1]] = int(args[4])
+            return b"+OK\r\n"
+        if command == b"DEL":
+            deleted = sum(self.data.pop(key, None) is not None for key in args[1:])
+            return b":%d\r\n" % deleted
+        return b"-ERR unknown command\r\n"
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestInMemoryProductL2Cache:
+    async def test_should_return_the_cached_products(self, make_product):
+        cache = InMemoryProductL2Cache(HARD_TTL)
+        products = [make_product(1, review=Review(rate=4.5, count=10)), make_product(2)]
+
+        await cache.set_many(products)
+
+        cached = await cache.get_many([1, 2, 3])
+        assert cached == products
+        assert cached[0].review == Review(rate=4.5, count=10)
+        assert cached[0].fetched_at == products[0].fetched_at
+
+    async def test_should_expire_the_entries_at_the_hard_ttl(self, make_product):
+        clock = FakeClock()
+        cache = InMemoryProductL2Cache(HARD_TTL, clock=clock)
+
+        await cache.set_many([make_product(1, age=timedelta(minutes=20))])
+        await cache.set_many([make_product(2, age=timedelta(minutes=31))])
+        assert len(cache) == 1
+
+        clock.now = timedelta(minutes=10).total_seconds()
+        assert await cache.get_many([1]) == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRedisProductL2Cache:
+    async def test_should_store_and_read_products_through_the_resp_protocol(
+        self, make_product
+    ):
+        server = FakeRedisServer()
+        port = await server.start()
+        client = RespClient("127.0.0.1", port, timeout=1.0)
+        cache = RedisProductL2Cache(client, HARD_TTL, key_prefix="test:")
+        try:
+            await cache.set_many(
+                [make_product(1, review=Review(rate=4.5, count=10)), make_product(2)]
+            )
+            assert 0 < server.ttls[b"test:1"] <= HARD_TTL.total_seconds() * 1000
+
+            cached = await cache.get_many([1, 2, 3])
+            assert [product.id for product in cached] == [1, 2]
+
+            await cache.delete_many([1])
+            assert [product.id for product in await cache.get_many([1, 2])] == [2]
+
+            with pytest.raises(RespError):
+                await client.execute("PING")
+        finally:
+            await cache.close()
+            await server.stop()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRespClient:
+    async def test_should_time_out_while_waiting_for_a_free_connection(self):
+        # aceita as conexões mas nunca responde
+        writers = []
+        server = await asyncio.start_server(
+            lambda reader, writer: writers.append(writer), "127.0.0.1", 0
+        )
+        port = server.sockets[0].getsockname()[1]
+        client = RespClient("127.0.0.1", port, timeout=0.1, pool_size=1)
+
+        async def timed_call():
+            started_at = time.monotonic()
+            with pytest.raises(TimeoutError):
+                await client.execute("GET", "key")
+            return time.monotonic() - started_at
+
+        try:
+            elapsed = await asyncio.gather(*[timed_call() for _ in range(4)])
+            assert max(elapsed) < 0.3
+        finally:
+            await client.close()
+            server.close()
+
+    async def test_should_run_concurrent_calls_on_separate_connections(self):
+        server = FakeRedisServer()
+        port = await server.start()
+        client = RespClient("127.0.0.1", port, timeout=1.0, pool_size=2)
+        try:
+            await asyncio.gather(*[client.execute("DEL", "key") for _ in range(4)])
+            assert 1 <= len(client._idle) <= 2
+        finally:
+            await client.close()
+            await server.stop()
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestL2ProductCacheRepository:
+    async def test_should_fill_the_l2_with_the_products_it_misses(self, make_product):
+        repository = AsyncMock()
+        repository.fetch_many.return_value = [make_product(2)]
+        cache = InMemoryProductL2Cache(HARD_TTL)
+        await cache.set_many([make_product(1)])
+
+        products = await L2ProductCacheRepository(repository, cache).fetch_many([1, 2])
+
+        assert [product.id for product in products] == [1, 2]
+        repository.fetch_many.assert_awaited_once_with([2])
+        assert len(cache) == 2
+
+    async def test_should_fall_back_to_the_repository_when_the_l2_fails(
+        self, make_product
+    ):
+        repository = AsyncMock()
+        repository.fetch_one.return_value = make_product(1)
+        cache = AsyncMock()
+        cache.get_many.side_effect = ConnectionError("redis_connection_closed")
+        cache.set_many.side_effect = ConnectionError("redis_connection_closed")
+
+        product = await L2ProductCacheRepository(repository, cache).fetch_one(1)
+
+        assert product.id == 1
+
+    async def test_should_evict_the_swept_products(self, make_product):
+        repository = AsyncMock()
+        repository.delete_unreferenced.return_value = ([1], 100)
+        cache = InMemoryProductL2Cache(HARD_TTL)
+        await cache.set_many([make_product(1), make_product(2)])
+
+        await L2ProductCacheRepository(repository, cache).delete_unreferenced(
+            datetime.now(timezone.utc), 10
+        )
+
+        assert [product.id for product in await cache.get_many([1, 2])] == [2]
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestProductCacheTiers:
+    async def test_should_fill_the_l1_with_the_l2_hits(self, make_product):
+        l1_cache = ProductLRUCache(max_entries=10, max_bytes=1024 * 1024)
+        l2_cache = InMemoryProductL2Cache(HARD_TTL)
+        await l2_cache.set_many([make_product(2)])
+        l1_cache.put(make_product(1))
+
+        products = await ProductCacheTiers(l1_cache, l2_cache).get_many([1, 2, 3])
+
+        assert [product.id for product in products] == [1, 2]
+        assert l1_cache.get(2) is not None
+
+    async def test_should_write_the_products_to_both_tiers(self, make_product):
+        l1_cache = ProductLRUCache(max_entries=10, max_bytes=1024 * 1024)
+        l2_cache = InMemoryProductL2Cache(HARD_TTL)
+
+        await ProductCacheTiers(l1_cache, l2_cache).put_many([make_product(1)])
+
+        assert l1_cache.get(1) is not None
+        assert [product.id for product in await l2_cache.get_many([1])] == [1]
+
+    async def test_should_treat_l2_failures_as_misses(self, make_product):
+        l1_cache = ProductLRUCache(max_entries=10, max_bytes=1024 * 1024)
+        l2_cache = AsyncMock()
+        l2_cache.get_many.side_effect = ConnectionError("redis_connection_closed")
+        l2_cache.set_many.side_effect = ConnectionError("redis_connection_closed")
+        tiers = ProductCacheTiers(l1_cache, l2_cache)
+
+        await tiers.put_many([make_product(1)])
+
+        assert [product.id for product in await tiers.get_many([1, 2])] == [1]
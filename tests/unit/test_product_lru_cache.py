@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.infra.memory.l1_product_cache_repository import \
+    L1ProductCacheRepository
+from app.infra.memory.product_lru_cache import ProductLRUCache
+
+
+@pytest.mark.unit
+class TestProductLRUCache:
+    def test_should_evict_least_recently_used_product_when_full(self, make_product):
+        cache = ProductLRUCache(max_entries=2, max_bytes=1024 * 1024)
+        cache.put(make_product(1))
+        cache.put(make_product(2))
+
+        cache.get(1)
+        cache.put(make_product(3))
+
+        assert cache.get(1) is not None
+        assert cache.get(2) is None
+        assert cache.get(3) is not None
+
+    def test_should_evict_products_when_memory_cap_is_exceeded(self, make_product):
+        product_size = ProductLRUCache._estimate_size(make_product(1))
+        cache = ProductLRUCache(max_entries=100, max_bytes=product_size * 2)
+
+        for id in range(1, 4):
+            cache.put(make_product(id))
+
+        assert len(cache) == 2
+        assert cache.size_bytes <= product_size * 2
+
+    def test_should_not_serve_products_past_the_hard_ttl(self, make_product):
+        cache = ProductLRUCache(max_entries=10, max_bytes=1024 * 1024)
+        cache.put(make_product(1, age=timedelta(days=1)))
+
+        assert cache.get(1) is None
+        assert len(cache) == 0
+
+    def test_should_count_hits_and_misses(self, make_product):
+        cache = ProductLRUCache(max_entries=10, max_bytes=1024 * 1024)
+        cache.put(make_product(1))
+
+        cache.get(1)
+        cache.get(2)
+
+        assert cache.hits == 1
+        assert cache.misses == 1
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestL1ProductCacheRepository:
+    async def test_should_only_fetch_missing_products_from_the_repository(
+        self, make_product
+    ):
+        cache = ProductLRUCache(max_entries=10, max_bytes=1024 * 1024)
+        cache.put(make_product(1))
+        repository = AsyncMock()
+        repository.fetch_many.return_value = [make_product(2)]
+
+        l1_repository = L1ProductCacheRepository(repository, cache)
+        products = await l1_repository.fetch_many([1, 2])
+
+        assert {p.id for p in products} == {1, 2}
+        repository.fetch_many.assert_awaited_once_with([2])
+
+    async def test_should_write_through_on_insert_and_refresh(self, make_product):
+        cache = ProductLRUCache(max_entries=10, max_bytes=1024 * 1024)
+        repository = AsyncMock()
+
+        l1_repository = L1ProductCacheRepository(repository, cache)
+        await l1_repository.insert_one(make_product(1))
+        await l1_repository.refresh(make_product(2))
+
+        assert await l1_repository.fetch_one(1) is not None
+        assert await l1_repository.fetch_one(2) is not None
+        repository.fetch_one.assert_not_awaited()
+
+    async def test_should_discard_the_swept_products(self, make_product):
+        cache = ProductLRUCache(max_entries=10, max_bytes=1024 * 1024)
+        cache.put(make_product(1))
+        cache.put(make_product(2))
+        repository = AsyncMock()
+        repository.delete_unreferenced.return_value = ([1], 100)
+
+        l1_repository = L1ProductCacheRepository(repository, cache)
+        await l1_repository.delete_unreferenced(datetime.now(timezone.utc), 10)
+
+        assert cache.get(1) is None
+        assert cache.get(2) is not None
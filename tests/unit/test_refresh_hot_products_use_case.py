@@ -0,0 +1,35 @@
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.__core__.application.hot_key_tracker import HotKeyTracker
+from app.__core__.application.refresh_scheduler import RefreshPriority
+from app.__core__.application.use_case.refresh_hot_products_use_case import \
+    RefreshHotProductsUseCase
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRefreshHotProductsUseCase:
+    async def test_should_schedule_hot_products_close_to_the_soft_ttl(
+        self, make_product
+    ):
+        product_popularity = HotKeyTracker(capacity=10)
+        for product_id in (1, 2):
+            product_popularity.record(product_id)
+        product_cache_repo = AsyncMock()
+        product_cache_repo.fetch_many.return_value = [
+            make_product(1, timedelta()),
+            make_product(2, timedelta(minutes=4, seconds=30)),
+        ]
+        refresh_scheduler = MagicMock()
+
+        output = await RefreshHotProductsUseCase(
+            product_cache_repo, product_popularity, refresh_scheduler
+        ).execute()
+
+        assert output.scheduled_products == 1
+        refresh_scheduler.schedule.assert_called_once_with(
+            2, RefreshPriority.SPECULATIVE
+        )
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from app.__core__.application.refresh_scheduler import (RefreshPriority,
+                                                        RefreshScheduler)
+from app.__core__.application.task_manager import TaskManager
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRefreshScheduler:
+    async def test_should_refresh_by_priority_and_without_duplicates(self):
+        refreshed = []
+
+        async def refresh(key):
+            refreshed.append(key)
+
+        scheduler = RefreshScheduler("test", refresh, workers=1, max_queue_size=10)
+        scheduler.schedule(1, RefreshPriority.SPECULATIVE)
+        scheduler.schedule(2, RefreshPriority.SOFT_STALE)
+        scheduler.schedule(2, RefreshPriority.SOFT_STALE)
+        scheduler.schedule(1, RefreshPriority.HARD_STALE)
+        scheduler.schedule(3, RefreshPriority.SPECULATIVE)
+        assert len(scheduler) == 3
+
+        task_manager = TaskManager()
+        scheduler.start(task_manager)
+        await task_manager.shutdown(deadline=1.0)
+
+        assert refreshed == [1, 2, 3]
+
+    async def test_should_drop_new_keys_when_the_queue_is_full(self):
+        async def refresh(key): ...
+
+        scheduler = RefreshScheduler("test", refresh, workers=1, max_queue_size=1)
+
+        assert scheduler.schedule(1, RefreshPriority.SOFT_STALE)
+        assert not scheduler.schedule(2, RefreshPriority.HARD_STALE)
+        assert len(scheduler) == 1
+
+    async def test_should_cancel_pending_refreshes_after_the_drain_deadline(self):
+        started = asyncio.Event()
+
+        async def refresh(key):
+            started.set()
+            await asyncio.sleep(10)
+
+        scheduler = RefreshScheduler("test", refresh, workers=1, max_queue_size=10)
+        scheduler.schedule(1, RefreshPriority.SOFT_STALE)
+        scheduler.schedule(2, RefreshPriority.SOFT_STALE)
+
+        task_manager = TaskManager()
+        scheduler.start(task_manager)
+        await started.wait()
+        await task_manager.shutdown(deadline=0.01)
+
+        assert len(scheduler) == 1
+        assert not scheduler.schedule(3, RefreshPriority.HARD_STALE)
@@ -0,0 +1,89 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.__core__.application.retry_policy import RetryBudget, RetryPolicy
+from app.__core__.domain.exception.exception import RetryableError, RetryError
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_policy(budget=None, max_attempts=3):
+    sleep = AsyncMock()
+    policy = RetryPolicy(
+        "test",
+        max_attempts=max_attempts,
+        base_delay=0.1,
+        max_delay=1.0,
+        budget=budget or RetryBudget(0.1, 10.0, clock=FakeClock()),
+        sleep=sleep,
+    )
+    return policy, sleep
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestRetryPolicy:
+    async def test_should_retry_retryable_errors_until_it_succeeds(self):
+        policy, sleep = make_policy()
+        fn = AsyncMock(side_effect=[RetryableError("timeout"), "product"])
+
+        assert await policy.execute(fn) == "product"
+        assert fn.await_count == 2
+        delay = sleep.await_args.args[0]
+        assert 0 <= delay <= 0.1
+
+    async def test_should_give_up_after_the_max_attempts(self):
+        policy, _ = make_policy(max_attempts=3)
+        fn = AsyncMock(side_effect=RetryableError("timeout"))
+
+        with pytest.raises(RetryError):
+            await policy.execute(fn)
+        assert fn.await_count == 3
+
+    async def test_should_not_retry_other_errors(self):
+        policy, _ = make_policy()
+        fn = AsyncMock(side_effect=ValueError("invalid_payload"))
+
+        with pytest.raises(ValueError):
+            await policy.execute(fn)
+        assert fn.await_count == 1
+
+    async def test_should_wait_what_the_server_asked_for(self):
+        policy, sleep = make_policy()
+        fn = AsyncMock(side_effect=[RetryableError("429", retry_after=0.5), "ok"])
+
+        await policy.execute(fn)
+
+        sleep.assert_awaited_once_with(0.5)
+
+    async def test_should_give_up_when_retry_after_is_longer_than_the_max_delay(
+        self,
+    ):
+        policy, sleep = make_policy()
+        fn = AsyncMock(side_effect=RetryableError("503", retry_after=60))
+
+        with pytest.raises(RetryError):
+            await policy.execute(fn)
+        sleep.assert_not_awaited()
+
+    async def test_should_stop_retrying_when_the_budget_is_exhausted(self):
+        clock = FakeClock()
+        budget = RetryBudget(0.1, 0.1, clock=clock)  # 1 token de capacidade
+        policy, _ = make_policy(budget=budget)
+        fn = AsyncMock(side_effect=RetryableError("timeout"))
+
+        with pytest.raises(RetryError):
+            await policy.execute(fn)
+        assert fn.await_count == 2  # a 1ª tentativa e o único retry do orçamento
+
+        fn.reset_mock()
+        with pytest.raises(RetryError):
+            await policy.execute(fn)
+        assert fn.await_count == 1
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+from app.__core__.application.single_flight import SingleFlight
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSingleFlight:
+    async def test_should_share_one_call_between_concurrent_callers(self):
+        single_flight = SingleFlight("test")
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "product"
+
+        results = await asyncio.gather(
+            *[single_flight.do(1, fetch) for _ in range(5)]
+        )
+
+        assert results == ["product"] * 5
+        assert calls == 1
+        assert single_flight.coalesced == 4
+        assert len(single_flight) == 0
+
+    async def test_should_propagate_the_exception_to_every_caller(self):
+        single_flight = SingleFlight("test")
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise ValueError("product_not_found")
+
+        results = await asyncio.gather(
+            single_flight.do(1, fetch),
+            single_flight.do(1, fetch),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+
+    async def test_should_keep_running_for_other_callers_when_first_is_cancelled(
+        self,
+    ):
+        single_flight = SingleFlight("test")
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            return "product"
+
+        first = asyncio.create_task(single_flight.do(1, fetch))
+        second = asyncio.create_task(single_flight.do(1, fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "product"
+
+    async def test_should_fetch_only_keys_that_are_not_in_flight_in_a_batch(self):
+        single_flight = SingleFlight("test")
+        batches = []
+
+        async def fetch_one():
+            await asyncio.sleep(0.01)
+            return "product-1"
+
+        async def fetch_many(keys):
+            batches.append(keys)
+            await asyncio.sleep(0.01)
+            return {key: f"product-{key}" for key in keys if key != 3}
+
+        in_flight = asyncio.create_task(single_flight.do(1, fetch_one))
+        await asyncio.sleep(0)
+        results = await single_flight.do_many([1, 2, 3], fetch_many)
+
+        assert batches == [[2, 3]]
+        assert results == {1: "product-1", 2: "product-2", 3: None}
+        assert await in_flight == "product-1"
+        assert single_flight.coalesced == 1
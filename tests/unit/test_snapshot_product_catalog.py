@@ -0,0 +1,112 @@
+import os
+
+import pytest
+
+from app.__core__.domain.entity.product import Review
+from app.infra import dependency
+from app.infra.snapshot.snapshot_product_catalog import (
+    SnapshotProductCatalog, write_snapshot)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSnapshotProductCatalog:
+    async def test_should_serve_the_products_of_the_snapshot(
+        self, make_product, tmp_path
+    ):
+        path = str(tmp_path / "catalog.snapshot")
+        products = [
+            make_product(
+                3, title="Câmera", price=31.5, review=Review(rate=4.5, count=3)
+            ),
+            make_product(1),
+            make_product(2),
+        ]
+        assert write_snapshot(path, products) == 3
+
+        catalog = SnapshotProductCatalog(path, reload_interval=60)
+
+        product = await catalog.fetch_one(3)
+        assert product.title == "Câmera"
+        assert product.price == 31.5
+        assert product.review == Review(rate=4.5, count=3)
+        assert (await catalog.fetch_one(2)).review is None
+        assert await catalog.fetch_one(4) is None
+        assert [p.id for p in await catalog.fetch_many([2, 4, 1])] == [2, 1]
+        assert [p.id for p in await catalog.fetch_all()] == [1, 2, 3]
+        catalog.close()
+
+    async def test_should_reload_the_snapshot_when_the_file_changes(
+        self, make_product, tmp_path
+    ):
+        path = str(tmp_path / "catalog.snapshot")
+        write_snapshot(path, [make_product(1)])
+        clock = FakeClock()
+        catalog = SnapshotProductCatalog(path, reload_interval=5, clock=clock)
+
+        write_snapshot(path, [make_product(1, title="Novo"), make_product(2)])
+        assert len(await catalog.fetch_all()) == 1
+
+        clock.now = 5
+        assert (await catalog.fetch_one(1)).title == "Novo"
+        assert len(catalog) == 2
+        catalog.close()
+
+    async def test_should_keep_the_previous_snapshot_when_the_new_one_is_invalid(
+        self, make_product, tmp_path
+    ):
+        path = str(tmp_path / "catalog.snapshot")
+        write_snapshot(path, [make_product(1)])
+        clock = FakeClock()
+        catalog = SnapshotProductCatalog(path, reload_interval=5, clock=clock)
+
+        with open(path + ".tmp", "wb") as file:
+            file.write(b"invalid snapshot")
+        os.replace(path + ".tmp", path)
+        clock.now = 5
+
+        assert (await catalog.fetch_one(1)).id == 1
+        catalog.close()
+
+    @pytest.mark.parametrize("size", [0, 6, 20, -1])
+    async def test_should_keep_the_previous_snapshot_when_the_new_one_is_truncated(
+        self, make_product, tmp_path, size
+    ):
+        path = str(tmp_path / "catalog.snapshot")
+        write_snapshot(path, [make_product(1)])
+        clock = FakeClock()
+        catalog = SnapshotProductCatalog(path, reload_interval=5, clock=clock)
+
+        truncated_path = str(tmp_path / "truncated.snapshot")
+        write_snapshot(truncated_path, [make_product(1, title="Novo"), make_product(2)])
+        with open(truncated_path, "r+b") as file:
+            file.truncate(size if size >= 0 else os.path.getsize(truncated_path) - 1)
+        os.replace(truncated_path, path)
+        clock.now = 5
+
+        assert (await catalog.fetch_one(1)).title == "Product"
+        assert await catalog.fetch_one(2) is None
+        catalog.close()
+
+
+@pytest.mark.unit
+class TestBuildProductCatalogSnapshot:
+    def test_should_fall_back_to_the_upstream_catalog_without_a_snapshot(
+        self, monkeypatch, tmp_path
+    ):
+        monkeypatch.setattr(dependency.settings, "PRODUCT_CATALOG_BACKEND", "snapshot")
+        monkeypatch.setattr(
+            dependency.settings,
+            "PRODUCT_CATALOG_SNAPSHOT_PATH",
+            str(tmp_path / "missing.snapshot"),
+        )
+
+        assert dependency.build_product_catalog_snapshot() is None
@@ -0,0 +1,38 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.__core__.application.use_case.sweep_product_cache_use_case import \
+    SweepProductCacheUseCase
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSweepProductCacheUseCase:
+    async def test_should_delete_in_batches_until_a_batch_is_not_full(self):
+        product_cache_repo = AsyncMock()
+        product_cache_repo.delete_unreferenced.side_effect = [
+            ([1, 2], 200),
+            ([3, 4], 180),
+            ([5], 90),
+        ]
+        use_case = SweepProductCacheUseCase(product_cache_repo)
+        use_case.batch_size = 2
+
+        output = await use_case.execute()
+
+        assert output.deleted_rows == 5
+        assert output.reclaimed_bytes == 470
+        assert product_cache_repo.delete_unreferenced.await_count == 3
+
+    async def test_should_stop_after_the_max_batches(self):
+        product_cache_repo = AsyncMock()
+        product_cache_repo.delete_unreferenced.return_value = ([1, 2], 200)
+        use_case = SweepProductCacheUseCase(product_cache_repo)
+        use_case.batch_size = 2
+        use_case.max_batches = 3
+
+        output = await use_case.execute()
+
+        assert output.deleted_rows == 6
+        assert product_cache_repo.delete_unreferenced.await_count == 3
@@ -0,0 +1,22 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.__core__.application.use_case.warm_product_cache_use_case import (
+    WarmProductCacheOutput, WarmProductCacheUseCase)
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestWarmProductCacheUseCase:
+    async def test_should_upsert_the_whole_catalog_into_the_cache(self):
+        products = [MagicMock(), MagicMock()]
+        product_cache_repo = AsyncMock()
+        product_catalog = AsyncMock()
+        product_catalog.fetch_all.return_value = products
+
+        use_case = WarmProductCacheUseCase(product_cache_repo, product_catalog)
+        output = await use_case.execute()
+
+        assert output == WarmProductCacheOutput(warmed_products=2)
+        product_cache_repo.upsert_many.assert_awaited_once_with(products)
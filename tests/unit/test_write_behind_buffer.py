@@ -0,0 +1,63 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.__core__.application.write_behind_buffer import WriteBehindBuffer
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestWriteBehindBuffer:
+    async def test_should_keep_only_the_latest_item_of_each_key(self):
+        flush = AsyncMock()
+        buffer = WriteBehindBuffer(
+            "test",
+            flush,
+            key=lambda item: item["id"],
+            max_batch_size=10,
+            flush_interval=60.0,
+        )
+
+        buffer.submit({"id": 1, "price": 10.0})
+        buffer.submit({"id": 1, "price": 20.0})
+        buffer.submit({"id": 2, "price": 30.0})
+        await buffer.flush()
+
+        flush.assert_awaited_once_with(
+            [{"id": 1, "price": 20.0}, {"id": 2, "price": 30.0}]
+        )
+        assert len(buffer) == 0
+
+    async def test_should_flush_as_soon_as_the_batch_is_full(self):
+        flush = AsyncMock()
+        buffer = WriteBehindBuffer(
+            "test",
+            flush,
+            key=lambda item: item,
+            max_batch_size=2,
+            flush_interval=60.0,
+        )
+        runner = asyncio.create_task(buffer.run_forever())
+
+        buffer.submit(1)
+        buffer.submit(2)
+        await asyncio.sleep(0.01)
+        runner.cancel()
+
+        flush.assert_awaited_once_with([1, 2])
+
+    async def test_should_drop_the_batch_when_the_flush_fails(self):
+        flush = AsyncMock(side_effect=RuntimeError("database_down"))
+        buffer = WriteBehindBuffer(
+            "test",
+            flush,
+            key=lambda item: item,
+            max_batch_size=10,
+            flush_interval=60.0,
+        )
+
+        buffer.submit(1)
+        await buffer.flush()
+
+        assert len(buffer) == 0